@@ -0,0 +1,153 @@
+"""
+Detekcja załamków R (algorytm typu Pan-Tompkins) i wyznaczanie tętna.
+
+Wszystkie etapy są wektorowe (bez pętli po próbkach i uderzeniach):
+1. filtr pasmowy 5-15 Hz (filtracja.filtruj_zerofazowo, SOS),
+2. pochodna pięciopunktowa,
+3. podniesienie do kwadratu,
+4. całkowanie w ruchomym oknie (150 ms) przez sumę skumulowaną,
+5. kandydaci: maksima lokalne w oknie refrakcji (maximum_filter1d) powyżej
+   progu adaptacyjnego (ułamek poziomu szczytów w blokach kilku sekund),
+6. doprecyzowanie położenia R: maksimum |sygnał pasmowy| w oknie wokół kandydata
+   (macierz indeksów okien i jedno argmax).
+
+Uruchomienie modułu: pomiar przepustowości na signals/ekg1.txt i signals/ekg_noise.txt.
+"""
+
+import os
+import time
+
+import numpy as np
+from scipy.ndimage import maximum_filter1d
+
+from filtracja import kaskada, filtruj_zerofazowo
+
+PASMO_HZ = (5.0, 15.0)
+OKNO_CALKOWANIA_S = 0.15
+REFRAKCJA_S = 0.2
+BLOK_PROGU_S = 2.0
+PROG_WZGLEDNY = 0.3
+OKNO_R_S = 0.1
+
+
+def calkowanie_ruchome(x, szerokosc: int):
+    """Średnia w oknie szerokosc próbek, wyśrodkowanym na próbce (przez np.cumsum)."""
+    szerokosc = max(int(szerokosc), 1)
+    suma = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    n = len(x)
+    idx = np.arange(n)
+    od = np.clip(idx - szerokosc // 2, 0, n)
+    do = np.clip(idx - szerokosc // 2 + szerokosc, 0, n)
+    return (suma[do] - suma[od]) / szerokosc
+
+
+def pochodna(x, fs: float):
+    """Pochodna pięciopunktowa Pan-Tompkinsa, wyśrodkowana (bez opóźnienia)."""
+    y = np.zeros_like(x, dtype=np.float64)
+    y[2:-2] = (2 * x[4:] + x[3:-1] - x[1:-3] - 2 * x[:-4]) * (fs / 8)
+    return y
+
+
+def prog_adaptacyjny(mwi, fs: float, blok_s: float = BLOK_PROGU_S, prog: float = PROG_WZGLEDNY):
+    """
+    Próg dla każdej próbki: prog * poziom szczytów, gdzie poziom to mediana z maksimów
+    trzech sąsiednich bloków blok_s (odporna na pojedyncze artefakty, także w skrajnych
+    blokach – sąsiedzi dopełniani odbiciem, np. stanu nieustalonego filtru na początku zapisu).
+    """
+    n = len(mwi)
+    dlugosc_bloku = max(int(blok_s * fs), 1)
+    liczba_blokow = -(-n // dlugosc_bloku)
+    dopelnione = np.zeros(liczba_blokow * dlugosc_bloku)
+    dopelnione[:n] = mwi
+    maksima = dopelnione.reshape(liczba_blokow, dlugosc_bloku).max(axis=1)
+    sasiedzi = np.pad(maksima, 1, mode='reflect' if liczba_blokow > 1 else 'edge')
+    poziom = np.median(np.stack((sasiedzi[:-2], sasiedzi[1:-1], sasiedzi[2:])), axis=0)
+    return np.repeat(prog * poziom, dlugosc_bloku)[:n]
+
+
+def _usun_bliskie(indeksy, wartosci, min_odstep: int):
+    """Z par bliższych niż min_odstep usuwa słabszy szczyt (powtarzane, aż brak takich par)."""
+    while len(indeksy) > 1:
+        bliskie = np.flatnonzero(np.diff(indeksy) < min_odstep)
+        if not len(bliskie):
+            break
+        # Słabszy z każdej pary; przy łańcuchach wystarczy kilka przebiegów
+        slabszy = np.where(wartosci[bliskie] < wartosci[bliskie + 1], bliskie, bliskie + 1)
+        zachowaj = np.ones(len(indeksy), dtype=bool)
+        zachowaj[slabszy] = False
+        indeksy, wartosci = indeksy[zachowaj], wartosci[zachowaj]
+    return indeksy
+
+
+def wykryj_r(sygnal, fs: float):
+    """
+    Indeksy załamków R sygnału 1D. Zwraca (indeksy, sygnal_pasmowy, mwi).
+    """
+    sygnal = np.asarray(sygnal, dtype=np.float64)
+    if len(sygnal) < 5:
+        return np.empty(0, dtype=np.int64), sygnal.copy(), np.zeros(len(sygnal))
+
+    pasmowy = filtruj_zerofazowo(sygnal, kaskada(fs, lpf=PASMO_HZ[1], hpf=PASMO_HZ[0], rzad=2))
+    mwi = calkowanie_ruchome(pochodna(pasmowy, fs) ** 2, OKNO_CALKOWANIA_S * fs)
+
+    refrakcja = max(int(REFRAKCJA_S * fs), 1)
+    lokalne_max = maximum_filter1d(mwi, size=2 * refrakcja + 1, mode='nearest')
+    kandydaci = np.flatnonzero((mwi == lokalne_max) & (mwi > prog_adaptacyjny(mwi, fs)))
+    # Płaskie maksima dają kilka sąsiednich próbek – zostaje pierwsza
+    if len(kandydaci):
+        kandydaci = kandydaci[np.concatenate(([True], np.diff(kandydaci) > 1))]
+    if not len(kandydaci):
+        return kandydaci.astype(np.int64), pasmowy, mwi
+
+    # Położenie R: maksimum |pasmowy| w oknie +-OKNO_R_S wokół kandydata
+    polowa = max(int(OKNO_R_S * fs), 1)
+    okna = np.clip(kandydaci[:, None] + np.arange(-polowa, polowa + 1), 0, len(sygnal) - 1)
+    wartosci = np.abs(pasmowy[okna])
+    najlepsze = np.argmax(wartosci, axis=1)
+    indeksy = okna[np.arange(len(okna)), najlepsze]
+    indeksy, unikalne = np.unique(indeksy, return_index=True)
+    indeksy = _usun_bliskie(indeksy, wartosci[unikalne, najlepsze[unikalne]], refrakcja)
+    return indeksy.astype(np.int64), pasmowy, mwi
+
+
+def tetno(sygnal, fs: float, t0: float = 0.0):
+    """
+    Pełny potok: załamki R, odstępy RR i seria tętna.
+    Zwraca słownik: indeksy, czasy [s], rr [s], czasy_rr [s] (czas drugiego uderzenia pary),
+    tetno [ud./min] (60 / rr), tetno_srednie.
+    """
+    indeksy, _, _ = wykryj_r(sygnal, fs)
+    czasy = t0 + indeksy / fs
+    rr = np.diff(czasy)
+    hr = 60.0 / rr if len(rr) else np.empty(0)
+    return {
+        'indeksy': indeksy,
+        'czasy': czasy,
+        'rr': rr,
+        'czasy_rr': czasy[1:],
+        'tetno': hr,
+        'tetno_srednie': float(60.0 / rr.mean()) if len(rr) else float('nan'),
+    }
+
+
+if __name__ == "__main__":
+    # Przepustowość: sygnał powielony do 1 godziny nagrania
+    from platforma import PlatformaEKG
+
+    katalog = os.path.join(os.path.dirname(os.path.abspath(__file__)), "signals")
+    for nazwa in ("ekg1.txt", "ekg_noise.txt"):
+        platforma = PlatformaEKG()
+        platforma.wczytaj_plik(os.path.join(katalog, nazwa))
+        fs = platforma.fs
+        kanal = np.asarray(platforma.sygnaly[:, 0], dtype=np.float64)
+
+        wynik = tetno(kanal, fs)
+        print(f"{nazwa}: {len(wynik['indeksy'])} uderzeń w {len(kanal) / fs:.1f} s, "
+              f"średnie tętno {wynik['tetno_srednie']:.1f} ud./min")
+
+        godzina = np.tile(kanal, int(np.ceil(3600 * fs / len(kanal))))[:int(3600 * fs)]
+        start = time.perf_counter()
+        wynik = tetno(godzina, fs)
+        czas = time.perf_counter() - start
+        print(f"  1 h przy {fs} Hz ({len(godzina)} próbek): {czas:.2f} s, "
+              f"{len(godzina) / czas / 1e6:.1f} mln próbek/s, {len(wynik['indeksy'])} uderzeń")
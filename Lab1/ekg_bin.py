@@ -0,0 +1,130 @@
+"""
+Binarny kontener sygnałów EKG (*.ekgb) otwierany przez np.memmap.
+
+Układ pliku (little-endian):
+  nagłówek (64 bajty):
+    magic 'EKGB', wersja, kod typu próbek, fs, liczba kanałów,
+    liczba próbek, polityka osi czasu, t0
+  próbki: tablica (liczba_probek, liczba_kanalow) zapisana wierszami
+  wektor czasu float64 – tylko dla polityki CZAS_JAWNY
+"""
+
+import os
+import struct
+import numpy as np
+
+MAGIC = b'EKGB'
+WERSJA = 1
+ROZMIAR_NAGLOWKA = 64
+ROZSZERZENIE = '.ekgb'
+
+# Polityka osi czasu
+CZAS_ROWNOMIERNY = 0   # t = t0 + i / fs (wektor czasu nie jest zapisywany)
+CZAS_JAWNY = 1         # wektor czasu zapisany za próbkami
+
+# Kody typów próbek zapisywane w nagłówku
+TYPY = {1: np.dtype('<i2'), 2: np.dtype('<f4')}
+KODY_TYPOW = {v: k for k, v in TYPY.items()}
+
+_FORMAT_NAGLOWKA = '<4sHHdIQBd'
+
+
+def czy_plik_bin(sciezka_pliku: str) -> bool:
+    """Sprawdza po sygnaturze, czy plik jest kontenerem EKGB."""
+    try:
+        with open(sciezka_pliku, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def dobierz_typ(sygnaly):
+    """Wybiera int16, jeśli wszystkie próbki są całkowite i mieszczą się w zakresie, w przeciwnym razie float32."""
+    sygnaly = np.asarray(sygnaly)
+    if sygnaly.size and np.all(np.isfinite(sygnaly)):
+        info = np.iinfo(np.int16)
+        if (sygnaly.min() >= info.min and sygnaly.max() <= info.max
+                and np.array_equal(sygnaly, np.round(sygnaly))):
+            return TYPY[1]
+    return TYPY[2]
+
+
+def zapisz(sciezka_wyj: str, sygnaly, fs: float, t=None, t0: float = 0.0, typ=None):
+    """
+    Zapisuje sygnały do kontenera EKGB.
+    Jeśli podano wektor czasu t, zapisywany jest jawnie (CZAS_JAWNY).
+    """
+    sygnaly = np.asarray(sygnaly)
+    if sygnaly.ndim == 1:
+        sygnaly = sygnaly.reshape(-1, 1)
+    typ = np.dtype(typ) if typ is not None else dobierz_typ(sygnaly)
+    if typ not in KODY_TYPOW:
+        raise ValueError(f"Nieobsługiwany typ próbek: {typ}")
+
+    liczba_probek, liczba_kanalow = sygnaly.shape
+    polityka = CZAS_ROWNOMIERNY if t is None else CZAS_JAWNY
+
+    naglowek = struct.pack(_FORMAT_NAGLOWKA, MAGIC, WERSJA, KODY_TYPOW[typ], float(fs),
+                           liczba_kanalow, liczba_probek, polityka, float(t0))
+    naglowek = naglowek.ljust(ROZMIAR_NAGLOWKA, b'\0')
+
+    with open(sciezka_wyj, 'wb') as f:
+        f.write(naglowek)
+        f.write(np.ascontiguousarray(sygnaly, dtype=typ).tobytes())
+        if t is not None:
+            f.write(np.ascontiguousarray(t, dtype='<f8').tobytes())
+
+
+def otworz(sciezka_pliku: str):
+    """
+    Otwiera kontener EKGB bez wczytywania danych do pamięci.
+    Zwraca słownik: sygnaly (memmap), t (memmap lub None), fs, t0, polityka.
+    """
+    with open(sciezka_pliku, 'rb') as f:
+        naglowek = f.read(ROZMIAR_NAGLOWKA)
+
+    if len(naglowek) < ROZMIAR_NAGLOWKA or naglowek[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Plik {sciezka_pliku} nie jest kontenerem EKGB.")
+
+    (_, wersja, kod_typu, fs, liczba_kanalow, liczba_probek,
+     polityka, t0) = struct.unpack_from(_FORMAT_NAGLOWKA, naglowek)
+    if wersja != WERSJA:
+        raise ValueError(f"Nieobsługiwana wersja kontenera: {wersja}")
+    typ = TYPY[kod_typu]
+    if fs.is_integer():
+        fs = int(fs)
+
+    sygnaly = np.memmap(sciezka_pliku, dtype=typ, mode='r', offset=ROZMIAR_NAGLOWKA,
+                        shape=(liczba_probek, liczba_kanalow))
+    t = None
+    if polityka == CZAS_JAWNY:
+        offset_t = ROZMIAR_NAGLOWKA + liczba_probek * liczba_kanalow * typ.itemsize
+        t = np.memmap(sciezka_pliku, dtype='<f8', mode='r', offset=offset_t,
+                      shape=(liczba_probek,))
+
+    return {'sygnaly': sygnaly, 't': t, 'fs': fs, 't0': t0, 'polityka': polityka}
+
+
+def konwertuj(sciezka_txt: str, sciezka_bin: str = None) -> str:
+    """
+    Jednorazowa konwersja pliku tekstowego (np. ekg1.txt, ekg_noise.txt) do kontenera EKGB.
+    Format pliku rozpoznaje PlatformaEKG.wczytaj_plik.
+    """
+    from platforma import PlatformaEKG
+
+    if sciezka_bin is None:
+        sciezka_bin = os.path.splitext(sciezka_txt)[0] + ROZSZERZENIE
+
+    platforma = PlatformaEKG()
+    platforma.wczytaj_plik(sciezka_txt)
+    platforma.zapisz_binarnie(sciezka_bin)
+    return sciezka_bin
+
+
+if __name__ == "__main__":
+    import sys
+
+    pliki = sys.argv[1:] or [os.path.join("signals", "ekg1.txt"),
+                             os.path.join("signals", "ekg_noise.txt")]
+    for sciezka in pliki:
+        print(f"{sciezka} -> {konwertuj(sciezka)}")
@@ -0,0 +1,197 @@
+"""
+Wsadowe przetwarzanie plików EKG z linii poleceń (bez tkinter i matplotlib).
+
+Przykłady (z katalogu Lab1):
+  python ekg_cli.py info signals/*.txt
+  python ekg_cli.py konwertuj signals/ekg1.txt signals/ekg_noise.txt
+  python ekg_cli.py wytnij signals/ekg1.txt --od 1.0 --do 2.5 --format npy
+  python ekg_cli.py eksportuj signals/ekg1.ekgb --format txt
+  python ekg_cli.py filtruj signals/ekg_noise.txt --lpf 60 --hpf 5
+  python ekg_cli.py filtruj signals/ekg1.txt --fir 501 --notch 50
+  python ekg_cli.py fft signals/ekg_noise.txt --fmax 100
+  python ekg_cli.py tetno signals/ekg1.txt signals/ekg_noise.txt --kanal 0
+  python ekg_cli.py wsadowo nagrania/*.txt --zadanie fft --procesy 8 --katalog-wyj wyniki
+
+Opcja --czas wypisuje czas zimnego startu (importy) i całkowity czas zadania.
+"""
+
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from platforma import PlatformaEKG
+import ekg_bin
+import ekg_eksport
+
+_CZAS_IMPORTU = time.perf_counter() - _START
+
+
+def _sciezka_wyjsciowa(sciezka_wej: str, katalog_wyj, przyrostek: str, rozszerzenie: str) -> str:
+    katalog = katalog_wyj or os.path.dirname(sciezka_wej)
+    nazwa = os.path.splitext(os.path.basename(sciezka_wej))[0]
+    return os.path.join(katalog, f"{nazwa}{przyrostek}{rozszerzenie}")
+
+
+def _wczytaj(sciezka: str) -> PlatformaEKG:
+    platforma = PlatformaEKG()
+    platforma.wczytaj_plik(sciezka)
+    return platforma
+
+
+def polecenie_info(args):
+    for sciezka in args.pliki:
+        platforma = _wczytaj(sciezka)
+        liczba_probek, liczba_kanalow = platforma.sygnaly.shape
+        print(f"{sciezka}: {liczba_probek} próbek, {liczba_kanalow} kanałów, fs={platforma.fs} Hz, "
+              f"czas={liczba_probek / platforma.fs:.2f} s, oś czasu: {type(platforma.t).__name__}")
+
+
+def polecenie_konwertuj(args):
+    for sciezka in args.pliki:
+        platforma = _wczytaj(sciezka)
+        platforma.zapisz_binarnie(_sciezka_wyjsciowa(sciezka, args.katalog_wyj, '', ekg_bin.ROZSZERZENIE))
+
+
+def polecenie_wytnij(args):
+    for sciezka in args.pliki:
+        platforma = _wczytaj(sciezka)
+        wyj = _sciezka_wyjsciowa(sciezka, args.katalog_wyj, f"_{args.od:g}-{args.do:g}s", '.' + args.format)
+        platforma.zapisz_fragment_do_pliku(args.od, args.do, wyj, format=args.format)
+
+
+def polecenie_eksportuj(args):
+    for sciezka in args.pliki:
+        platforma = _wczytaj(sciezka)
+        wyj = _sciezka_wyjsciowa(sciezka, args.katalog_wyj, '_eksport', '.' + args.format)
+        ekg_eksport.zapisz_fragment(platforma.t, platforma.sygnaly, 0, platforma.sygnaly.shape[0], wyj,
+                                    args.format, fs=platforma.fs)
+        print(f"Zapisano: {wyj}")
+
+
+def polecenie_filtruj(args):
+    for sciezka in args.pliki:
+        platforma = _wczytaj(sciezka)
+        if args.fir:
+            # FIR przez szybki splot FFT (overlap-save), zerofazowo
+            import filtracja_fir
+            h = filtracja_fir.projekt_pasmowy(platforma.fs, args.lpf, args.hpf, args.fir)
+            sygnaly = np.asarray(platforma.sygnaly, dtype=np.float64)
+            if h is not None:
+                sygnaly = filtracja_fir.filtruj_fir(sygnaly, h)
+        else:
+            sygnaly = platforma.filtruj(args.lpf, args.hpf, args.rzad)
+        if args.notch:
+            import filtracja_fir
+            sygnaly = filtracja_fir.filtruj_fir(sygnaly, filtracja_fir.projekt_notch(platforma.fs, args.notch))
+
+        wyj = _sciezka_wyjsciowa(sciezka, args.katalog_wyj, '_filtr', '.' + args.format)
+        ekg_eksport.zapisz_fragment(platforma.t, sygnaly, 0, sygnaly.shape[0], wyj, args.format, fs=platforma.fs)
+        print(f"Zapisano: {wyj}")
+
+
+def polecenie_fft(args):
+    for sciezka in args.pliki:
+        platforma = _wczytaj(sciezka)
+        sygnaly = np.asarray(platforma.sygnaly, dtype=np.float64)
+        amplituda = np.abs(np.fft.rfft(sygnaly, axis=0))
+        freqs = np.fft.rfftfreq(sygnaly.shape[0], d=1 / platforma.fs)
+        if args.fmax:
+            zakres = freqs <= args.fmax
+            freqs, amplituda = freqs[zakres], amplituda[zakres]
+
+        wyj = _sciezka_wyjsciowa(sciezka, args.katalog_wyj, '_widmo', '.txt')
+        np.savetxt(wyj, np.column_stack((freqs, amplituda)), fmt='%.6f')
+        szczyty = freqs[1:][np.argmax(amplituda[1:], axis=0)] if len(freqs) > 1 else []
+        print(f"Zapisano: {wyj}; dominujące częstotliwości [Hz]: {np.round(szczyty, 2)}")
+
+
+def polecenie_tetno(args):
+    for sciezka in args.pliki:
+        platforma = _wczytaj(sciezka)
+        wynik = platforma.wykryj_uderzenia(args.kanal)
+        wyj = _sciezka_wyjsciowa(sciezka, args.katalog_wyj, '_uderzenia', '.txt')
+        # Kolumny: czas uderzenia [s], RR do poprzedniego [s], tętno [ud./min] (pierwszy wiersz: NaN)
+        rr = np.concatenate(([np.nan], wynik['rr']))
+        tetno = np.concatenate(([np.nan], wynik['tetno']))
+        np.savetxt(wyj, np.column_stack((wynik['czasy'], rr, tetno)), fmt='%.6f')
+        zakres = (f", min {wynik['tetno'].min():.1f}, maks {wynik['tetno'].max():.1f}"
+                  if len(wynik['tetno']) else "")
+        print(f"Zapisano: {wyj}; uderzenia: {len(wynik['czasy'])}, "
+              f"średnie tętno: {wynik['tetno_srednie']:.1f} ud./min{zakres}")
+
+
+def polecenie_wsadowo(args):
+    # Pula procesów importowana tylko dla tego polecenia
+    import ekg_wsadowo
+
+    parametry = {'lpf': args.lpf, 'hpf': args.hpf, 'rzad': args.rzad}
+    zbiorcze = ekg_wsadowo.przetworz_wsadowo(args.pliki, args.zadanie, args.katalog_wyj or 'wyniki',
+                                             parametry, procesy=args.procesy, wznow=not args.od_nowa)
+    print(f"Przetworzono: {zbiorcze['przetworzone']}, pominięto (aktualne): {zbiorcze['pominiete']}, "
+          f"błędy: {len(zbiorcze['bledy'])}, czas: {zbiorcze['czas_calkowity_s']:.2f} s")
+
+
+def zbuduj_parser():
+    parser = argparse.ArgumentParser(description="Wsadowe przetwarzanie plików EKG.")
+    parser.add_argument('--czas', action='store_true', help="wypisz czas zimnego startu i wykonania")
+    podparsery = parser.add_subparsers(dest='polecenie', required=True)
+
+    def dodaj(nazwa, funkcja, opis):
+        p = podparsery.add_parser(nazwa, help=opis)
+        p.add_argument('pliki', nargs='+', help="pliki EKG (.txt lub .ekgb)")
+        p.add_argument('--katalog-wyj', default=None, help="katalog wyjściowy (domyślnie katalog pliku)")
+        p.set_defaults(funkcja=funkcja)
+        return p
+
+    dodaj('info', polecenie_info, "podsumowanie plików")
+    dodaj('konwertuj', polecenie_konwertuj, "konwersja do kontenera .ekgb")
+
+    p = dodaj('wytnij', polecenie_wytnij, "zapis fragmentu [od, do] w sekundach")
+    p.add_argument('--od', type=float, required=True)
+    p.add_argument('--do', type=float, required=True)
+    p.add_argument('--format', choices=ekg_eksport.FORMATY, default='txt')
+
+    p = dodaj('eksportuj', polecenie_eksportuj, "zapis całego sygnału w innym formacie")
+    p.add_argument('--format', choices=ekg_eksport.FORMATY, default='npy')
+
+    p = dodaj('filtruj', polecenie_filtruj, "filtracja Butterworth LPF/HPF (zerofazowa)")
+    p.add_argument('--lpf', type=float, default=60.0, help="częstotliwość odcięcia LPF [Hz] (0 = brak)")
+    p.add_argument('--hpf', type=float, default=5.0, help="częstotliwość odcięcia HPF [Hz] (0 = brak)")
+    p.add_argument('--rzad', type=int, default=4)
+    p.add_argument('--fir', type=int, default=0, help="liczba współczynników FIR (FFT) zamiast IIR (0 = IIR)")
+    p.add_argument('--notch', type=float, default=0, help="filtr zaporowy FIR sieci 50/60 Hz (0 = brak)")
+    p.add_argument('--format', choices=ekg_eksport.FORMATY, default='txt')
+
+    p = dodaj('fft', polecenie_fft, "widmo amplitudowe (rfft) wszystkich kanałów")
+    p.add_argument('--fmax', type=float, default=None, help="górna częstotliwość zapisywanego widma [Hz]")
+
+    p = dodaj('tetno', polecenie_tetno, "detekcja załamków R, odstępy RR i tętno")
+    p.add_argument('--kanal', type=int, default=0, help="numer kanału (domyślnie 0)")
+
+    p = dodaj('wsadowo', polecenie_wsadowo, "równoległe przetwarzanie wielu plików w puli procesów")
+    p.add_argument('--zadanie', choices=('statystyki', 'konwertuj', 'filtruj', 'fft'), default='statystyki')
+    p.add_argument('--procesy', type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    p.add_argument('--od-nowa', action='store_true', help="nie pomijaj plików z aktualnym wynikiem")
+    p.add_argument('--lpf', type=float, default=60.0)
+    p.add_argument('--hpf', type=float, default=5.0)
+    p.add_argument('--rzad', type=int, default=4)
+
+    return parser
+
+
+def main(argv=None):
+    args = zbuduj_parser().parse_args(argv)
+    args.funkcja(args)
+    if args.czas:
+        print(f"Zimny start (importy): {_CZAS_IMPORTU * 1000:.0f} ms, "
+              f"całość: {(time.perf_counter() - _START) * 1000:.0f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
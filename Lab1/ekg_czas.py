@@ -0,0 +1,101 @@
+"""
+Oś czasu sygnału EKG.
+
+OsCzasuRownomierna – leniwa oś t = t0 + i / fs; nie przechowuje wektora czasu,
+    indeks dla danego czasu liczony jest w O(1).
+OsCzasuJawna – oś z jawnym wektorem czasu (pliki z kolumną czasu o nierównych
+    odstępach); indeksy przez np.searchsorted z pamięcią podręczną zapytań.
+
+Obie klasy zachowują się jak tablica tylko do odczytu: len(), t[i], t[a:b],
+t[tablica_indeksow] i np.asarray(t) (materializacja wektora).
+"""
+
+import numpy as np
+
+# Dopuszczalne odchylenie kolumny czasu od siatki t0 + i / fs (ułamek okresu próbkowania)
+TOLERANCJA_ROWNOMIERNOSCI = 1e-3
+
+
+class OsCzasuRownomierna:
+    """Oś czasu t = t0 + i / fs dla i = 0..n-1 bez przechowywania wektora."""
+
+    def __init__(self, t0: float, fs: float, n: int):
+        self.t0 = float(t0)
+        self.fs = fs
+        self.n = int(n)
+
+    def __len__(self):
+        return self.n
+
+    def _wartosci(self, idx):
+        return self.t0 + idx / self.fs
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self._wartosci(np.arange(*idx.indices(self.n)))
+        idx = np.asarray(idx)
+        if idx.dtype == bool:
+            idx = np.flatnonzero(idx)
+        idx = np.where(idx < 0, idx + self.n, idx)
+        if np.any((idx < 0) | (idx >= self.n)):
+            raise IndexError("Indeks poza osią czasu.")
+        wynik = self._wartosci(idx)
+        return float(wynik) if wynik.ndim == 0 else wynik
+
+    def __array__(self, dtype=None, copy=None):
+        return self._wartosci(np.arange(self.n)).astype(dtype or np.float64, copy=False)
+
+    def indeks(self, czas):
+        """
+        Indeks pierwszej próbki o czasie >= czas (jak np.searchsorted(t, czas)), w O(1).
+        Przybliżenie z arytmetyki korygowane o ±1, aby zgadzało się z wartościami t[i].
+        """
+        czas = np.asarray(czas, dtype=np.float64)
+        idx = np.clip(np.ceil((czas - self.t0) * self.fs), 0, self.n).astype(np.int64)
+        idx = np.where((idx > 0) & (self._wartosci(idx - 1) >= czas), idx - 1, idx)
+        idx = np.where((idx < self.n) & (self._wartosci(idx) < czas), idx + 1, idx)
+        return int(idx) if idx.ndim == 0 else idx
+
+
+class OsCzasuJawna:
+    """Oś czasu z jawnym wektorem (np. pliki [czas, sygnał] o nierównych odstępach)."""
+
+    ROZMIAR_PAMIECI = 256
+
+    def __init__(self, t):
+        self.t = t
+        self._pamiec = {}   # czas -> indeks dla zapytań skalarnych
+
+    def __len__(self):
+        return len(self.t)
+
+    def __getitem__(self, idx):
+        return self.t[idx]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.t, dtype=dtype)
+
+    def indeks(self, czas):
+        """Indeks pierwszej próbki o czasie >= czas (np.searchsorted), zapytania skalarne z pamięci podręcznej."""
+        if np.ndim(czas) != 0:
+            return np.searchsorted(self.t, czas)
+        czas = float(czas)
+        idx = self._pamiec.get(czas)
+        if idx is None:
+            if len(self._pamiec) >= self.ROZMIAR_PAMIECI:
+                self._pamiec.clear()
+            idx = self._pamiec[czas] = int(np.searchsorted(self.t, czas))
+        return idx
+
+
+def os_z_wektora(t, fs: float):
+    """
+    Zwraca OsCzasuRownomierna, jeśli wektor t leży na siatce t0 + i / fs
+    (z tolerancją TOLERANCJA_ROWNOMIERNOSCI okresu), w przeciwnym razie OsCzasuJawna.
+    """
+    t = np.asarray(t)
+    if len(t) and fs:
+        siatka = OsCzasuRownomierna(t[0], fs, len(t))
+        if np.max(np.abs(t - np.asarray(siatka))) <= TOLERANCJA_ROWNOMIERNOSCI / fs:
+            return siatka
+    return OsCzasuJawna(t)
@@ -0,0 +1,135 @@
+"""
+Eksport fragmentów sygnału EKG bez kopiowania całych wycinków.
+
+Fragment to zakres indeksów [idx_start, idx_koniec) – sygnały przekazywane są
+jako widoki (również z np.memmap), czas jako oś z ekg_czas lub tablica. Formaty:
+  txt  – kolumny [czas, kanały...] formatowane blokami: jedna operacja % na blok
+         (wartości nadal formatowane przez Pythona, ale bez pętli po wierszach
+         z np.savetxt – pomiar: uruchomienie modułu)
+  npy  – tablica .npy; bez czasu zapisywany jest bezpośrednio widok sygnałów
+  raw  – surowe próbki w typie źródłowym (bez nagłówka)
+  ekgb – kontener ekg_bin (fs, polityka czasu, próbki)
+"""
+
+import os
+import numpy as np
+
+import ekg_bin
+from ekg_czas import OsCzasuRownomierna
+
+FORMATY = ('txt', 'npy', 'raw', 'ekgb')
+WIERSZE_BLOKU = 65536
+
+_ROZSZERZENIA = {'.txt': 'txt', '.npy': 'npy', '.raw': 'raw', '.bin': 'raw',
+                 ekg_bin.ROZSZERZENIE: 'ekgb'}
+
+
+def format_z_rozszerzenia(sciezka: str) -> str:
+    """Format eksportu na podstawie rozszerzenia (domyślnie txt)."""
+    return _ROZSZERZENIA.get(os.path.splitext(sciezka)[1].lower(), 'txt')
+
+
+def _bloki_z_czasem(t, sygnaly, idx_start, idx_koniec, wiersze_bloku):
+    """Bloki [czas, kanały...] w jednym, ponownie używanym buforze float64."""
+    bufor = np.empty((min(wiersze_bloku, idx_koniec - idx_start), sygnaly.shape[1] + 1))
+    for poczatek in range(idx_start, idx_koniec, wiersze_bloku):
+        koniec = min(poczatek + wiersze_bloku, idx_koniec)
+        blok = bufor[:koniec - poczatek]
+        blok[:, 0] = t[poczatek:koniec]
+        blok[:, 1:] = sygnaly[poczatek:koniec]
+        yield blok
+
+
+def _zapisz_txt(f, t, sygnaly, idx_start, idx_koniec, fmt, wiersze_bloku):
+    # Ten sam wynik co np.savetxt(fmt=fmt). To nie jest formatowanie wektorowe: każda wartość
+    # i tak przechodzi przez % Pythona (krotka wartości bloku), ale jednym wywołaniem na blok
+    # zamiast pętli po wierszach i zapisu każdego wiersza osobno jak w np.savetxt
+    fmt_wiersza = ' '.join([fmt] * (sygnaly.shape[1] + 1)) + '\n'
+    for blok in _bloki_z_czasem(t, sygnaly, idx_start, idx_koniec, wiersze_bloku):
+        f.write((fmt_wiersza * blok.shape[0]) % tuple(blok.ravel()))
+
+
+def _zapisz_npy(f, t, sygnaly, idx_start, idx_koniec, z_czasem, wiersze_bloku):
+    liczba = idx_koniec - idx_start
+    if not z_czasem:
+        np.lib.format.write_array(f, np.ascontiguousarray(sygnaly[idx_start:idx_koniec]))
+        return
+    naglowek = {'descr': np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                'fortran_order': False, 'shape': (liczba, sygnaly.shape[1] + 1)}
+    np.lib.format.write_array_header_1_0(f, naglowek)
+    for blok in _bloki_z_czasem(t, sygnaly, idx_start, idx_koniec, wiersze_bloku):
+        f.write(blok.tobytes())
+
+
+def zapisz_fragment(t, sygnaly, idx_start: int, idx_koniec: int, sciezka_wyj: str, format: str = 'txt',
+                    fs=None, z_czasem=None, fmt='%.6f', wiersze_bloku: int = WIERSZE_BLOKU):
+    """
+    Zapisuje próbki [idx_start, idx_koniec) do pliku w zadanym formacie.
+    z_czasem – czy dołączyć kolumnę czasu (domyślnie tylko dla txt).
+    """
+    if format not in FORMATY:
+        raise ValueError(f"Nieznany format eksportu: {format}")
+    if z_czasem is None:
+        z_czasem = format == 'txt'
+
+    if format == 'ekgb':
+        if isinstance(t, OsCzasuRownomierna):
+            ekg_bin.zapisz(sciezka_wyj, sygnaly[idx_start:idx_koniec], t.fs, t0=t[idx_start])
+        else:
+            ekg_bin.zapisz(sciezka_wyj, sygnaly[idx_start:idx_koniec], fs or 0.0,
+                           t=np.asarray(t[idx_start:idx_koniec]))
+        return
+
+    if format == 'txt':
+        with open(sciezka_wyj, 'w') as f:
+            _zapisz_txt(f, t, sygnaly, idx_start, idx_koniec, fmt, wiersze_bloku)
+        return
+
+    with open(sciezka_wyj, 'wb') as f:
+        if format == 'npy':
+            _zapisz_npy(f, t, sygnaly, idx_start, idx_koniec, z_czasem, wiersze_bloku)
+        elif z_czasem:
+            for blok in _bloki_z_czasem(t, sygnaly, idx_start, idx_koniec, wiersze_bloku):
+                f.write(blok.tobytes())
+        else:
+            # Wycinek wierszy jest ciągłym widokiem – zapis bez kopii
+            f.write(memoryview(np.ascontiguousarray(sygnaly[idx_start:idx_koniec])))
+
+
+def zapisz_fragmenty(t, sygnaly, idx_starty, idx_konce, sciezki, format: str = 'txt', **kwargs):
+    """
+    Eksport wielu zakresów naraz (sciezki[i] dla zakresu i). Zakresy przetwarzane są
+    rosnąco po początku, więc dane (także memmap) czytane są jednym przebiegiem.
+    """
+    idx_starty = np.asarray(idx_starty)
+    idx_konce = np.asarray(idx_konce)
+    for i in np.argsort(idx_starty, kind='stable'):
+        zapisz_fragment(t, sygnaly, int(idx_starty[i]), int(idx_konce[i]), sciezki[i], format, **kwargs)
+
+
+if __name__ == "__main__":
+    import io
+    import time
+
+    def najlepszy_czas(funkcja, powtorzenia=3):
+        najlepszy = np.inf
+        for _ in range(powtorzenia):
+            start = time.perf_counter()
+            funkcja()
+            najlepszy = min(najlepszy, time.perf_counter() - start)
+        return najlepszy
+
+    # Porównanie z dawną drogą: np.savetxt na np.column_stack((t, sygnaly))
+    for liczba, kanaly in ((500000, 1), (200000, 12)):
+        sygnaly = np.random.randn(liczba, kanaly)
+        t = OsCzasuRownomierna(0.0, 1000.0, liczba)
+        bloki = io.StringIO()
+        t_bloki = najlepszy_czas(lambda: _zapisz_txt(io.StringIO(), t, sygnaly, 0, liczba, '%.6f', WIERSZE_BLOKU))
+        t_savetxt = najlepszy_czas(lambda: np.savetxt(io.BytesIO(), np.column_stack((np.asarray(t), sygnaly)),
+                                                      fmt='%.6f'))
+        _zapisz_txt(bloki, t, sygnaly, 0, liczba, '%.6f', WIERSZE_BLOKU)
+        wzorzec = io.BytesIO()
+        np.savetxt(wzorzec, np.column_stack((np.asarray(t), sygnaly)), fmt='%.6f')
+        assert bloki.getvalue() == wzorzec.getvalue().decode()
+        print(f"{liczba} x {kanaly + 1} kolumn: np.savetxt {t_savetxt:.3f} s, bloki % {t_bloki:.3f} s "
+              f"(x{t_savetxt / t_bloki:.1f}), wynik identyczny")
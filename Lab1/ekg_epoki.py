@@ -0,0 +1,88 @@
+"""
+Wycinanie epok (okien wokół zdarzeń, np. ±0.5 s wokół uderzeń serca).
+
+Wszystkie indeksy liczone są wektorowo: macierz indeksów (N_zdarzen, dlugosc)
+powstaje z sumy zewnętrznej początków okien i np.arange(dlugosc), a brzegi
+obsługiwane są maskami – bez pętli po zdarzeniach.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+BRZEGI = ('nan', 'pomin')
+
+
+def _widok_regularny(sygnaly, starty, dlugosc):
+    """Widok (N, dlugosc, kanaly) bez kopii – możliwy, gdy początki okien są równo rozłożone."""
+    sygnaly = np.asarray(sygnaly)
+    if len(starty) > 1:
+        kroki = np.diff(starty)
+        if not np.all(kroki == kroki[0]) or kroki[0] <= 0:
+            return None
+        krok = int(kroki[0])
+    else:
+        krok = 0
+    wiersz, kanal = sygnaly.strides
+    baza = sygnaly[int(starty[0]):]
+    return as_strided(baza, shape=(len(starty), dlugosc, sygnaly.shape[1]),
+                      strides=(krok * wiersz, wiersz, kanal), writeable=False)
+
+
+def wytnij_epoki(sygnaly, idx_zdarzen, przed: int, po: int, brzegi: str = 'nan',
+                 korekta_bazowa=None, widok: bool = False):
+    """
+    Wycina okna [idx - przed, idx + po) wokół każdego zdarzenia.
+
+    sygnaly       – tablica (liczba_probek, liczba_kanalow),
+    idx_zdarzen   – indeksy próbek zdarzeń,
+    brzegi        – 'nan': okna wystające poza dane dopełniane NaN,
+                    'pomin': takie zdarzenia są pomijane,
+    korekta_bazowa – (od, do) w próbkach względem początku okna; od każdej epoki
+                    odejmowana jest średnia z tego przedziału (osobno dla kanałów);
+                    przedział musi być niepusty i leżeć w oknie: 0 <= od < do <= przed + po,
+    widok         – jeśli True i zdarzenia są równo rozłożone (a okna mieszczą się
+                    w danych), zwracany jest widok bez kopii (tylko do odczytu).
+
+    Zwraca (epoki, maska): epoki (N, przed + po, liczba_kanalow), maska – które
+    zdarzenia wejściowe trafiły do wyniku.
+    """
+    if brzegi not in BRZEGI:
+        raise ValueError(f"Nieznany tryb brzegów: {brzegi}")
+    if korekta_bazowa is not None:
+        od, do = korekta_bazowa
+        if not 0 <= od < do <= przed + po:
+            raise ValueError(f"Przedział korekty bazowej [{od}, {do}) poza oknem epoki [0, {przed + po})")
+
+    idx_zdarzen = np.asarray(idx_zdarzen, dtype=np.int64)
+    liczba_probek = sygnaly.shape[0]
+    dlugosc = przed + po
+    starty = idx_zdarzen - przed
+    w_danych = (starty >= 0) & (starty + dlugosc <= liczba_probek)
+
+    if brzegi == 'pomin':
+        maska = w_danych
+        starty = starty[maska]
+    else:
+        maska = np.ones(len(starty), dtype=bool)
+
+    if widok and korekta_bazowa is None and len(starty) and np.all(w_danych[maska]):
+        epoki = _widok_regularny(sygnaly, starty, dlugosc)
+        if epoki is not None:
+            return epoki, maska
+
+    # Macierz indeksów (N, dlugosc) i jedno zbiorcze pobranie
+    indeksy = starty[:, None] + np.arange(dlugosc)
+    if brzegi == 'nan' and not np.all(w_danych):
+        poza = (indeksy < 0) | (indeksy >= liczba_probek)
+        epoki = np.asarray(sygnaly[np.clip(indeksy, 0, liczba_probek - 1)], dtype=np.float64)
+        epoki[poza] = np.nan
+    else:
+        epoki = np.asarray(sygnaly[indeksy])
+
+    if korekta_bazowa is not None:
+        od, do = korekta_bazowa
+        if not np.issubdtype(epoki.dtype, np.floating):
+            epoki = epoki.astype(np.float64)
+        epoki -= np.nanmean(epoki[:, od:do, :], axis=1, keepdims=True)
+
+    return epoki, maska
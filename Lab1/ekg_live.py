@@ -0,0 +1,296 @@
+"""
+Akwizycja sygnału EKG w czasie rzeczywistym.
+
+Źródło próbek (gniazdo, potok, odtwarzanie pliku w tempie fs) działa w osobnym
+wątku i zapisuje bloki do prealokowanego bufora pierścieniowego. Bufor ma
+jednego pisarza i dowolną liczbę czytelników: pisarz zgłasza nadpisywany zakres
+(`zapisywane`), kopiuje dane i dopiero potem publikuje licznik `zapisane`;
+czytelnik po skopiowaniu sprawdza, czy jego fragment nie został nadpisany
+(bez blokad). Dla każdej próbki zapamiętywany jest czas
+przybycia (time.perf_counter), co pozwala zmierzyć opóźnienie do ekranu.
+Blok większy niż pojemność bufora nie mieści się w nim w całości – jego początkowe
+próbki są liczone w `pominiete` i raportowane razem z opóźnieniem.
+"""
+
+import os
+import queue
+import socket
+import threading
+import time
+import numpy as np
+
+
+class BuforPierscieniowy:
+    """Prealokowany bufor pierścieniowy (pojemnosc, liczba_kanalow) – jeden pisarz, wielu czytelników."""
+
+    def __init__(self, pojemnosc: int, liczba_kanalow: int, dtype=np.float32):
+        self.pojemnosc = pojemnosc
+        self.liczba_kanalow = liczba_kanalow
+        self.dane = np.zeros((pojemnosc, liczba_kanalow), dtype=dtype)
+        self.czasy_przybycia = np.zeros(pojemnosc, dtype=np.float64)
+        self.zapisane = 0     # łączna liczba opublikowanych próbek (licznik monotoniczny)
+        self.zapisywane = 0   # koniec bloku, który pisarz właśnie kopiuje
+        self.pominiete = 0    # próbki z bloków większych niż pojemność, których nie zapisano
+
+    def zapisz(self, blok, czas_przybycia: float):
+        """Dopisuje blok (n, liczba_kanalow). Wywoływane wyłącznie z wątku akwizycji."""
+        blok = np.asarray(blok).reshape(-1, self.liczba_kanalow)
+        n = blok.shape[0]
+        if n == 0:
+            return
+        pominiete = max(n - self.pojemnosc, 0)
+        if pominiete:
+            blok = blok[pominiete:]
+            self.pominiete += pominiete
+
+        # Najpierw zgłoszenie zakresu, który zostanie nadpisany
+        self.zapisywane = self.zapisane + n
+        poz = (self.zapisane + pominiete) % self.pojemnosc
+        pierwsza = min(blok.shape[0], self.pojemnosc - poz)
+        self.dane[poz:poz + pierwsza] = blok[:pierwsza]
+        self.dane[:blok.shape[0] - pierwsza] = blok[pierwsza:]
+        self.czasy_przybycia[poz:poz + pierwsza] = czas_przybycia
+        self.czasy_przybycia[:blok.shape[0] - pierwsza] = czas_przybycia
+
+        # Publikacja dopiero po skopiowaniu danych
+        self.zapisane += n
+
+    def _kopiuj(self, start: int, koniec: int):
+        """Kopia próbek o numerach [start, koniec) z uwzględnieniem zawinięcia."""
+        idx = np.arange(start, koniec) % self.pojemnosc
+        return self.dane[idx], self.czasy_przybycia[idx]
+
+    def ostatnie(self, n: int):
+        """
+        Zwraca (dane, numer_konca, czasy_przybycia) dla n ostatnich próbek.
+        Powtarza odczyt, jeśli pisarz nadpisał czytany fragment w trakcie kopiowania.
+        """
+        while True:
+            koniec = self.zapisane
+            start = max(koniec - min(n, self.pojemnosc), 0)
+            dane, czasy = self._kopiuj(start, koniec)
+            if self.zapisywane - start <= self.pojemnosc:
+                return dane, koniec, czasy
+
+    def odczytaj_od(self, pozycja: int):
+        """
+        Wszystkie próbki od numeru `pozycja` (dla odbiorców potrzebujących każdej próbki).
+        Zwraca (dane, nowa_pozycja, utracone) – utracone > 0, gdy czytelnik nie nadążył.
+        """
+        while True:
+            koniec = self.zapisane
+            start = max(pozycja, koniec - self.pojemnosc)
+            dane, _ = self._kopiuj(start, koniec)
+            if self.zapisywane - start <= self.pojemnosc:
+                return dane, koniec, start - pozycja
+
+
+class ZrodloProbek:
+    """Interfejs źródła: metoda bloki() zwraca kolejne bloki (n, liczba_kanalow)."""
+
+    liczba_kanalow = 1
+    fs = None
+
+    def bloki(self, stop: threading.Event):
+        raise NotImplementedError
+
+    def zamknij(self):
+        pass
+
+
+class ZrodloOdtwarzanie(ZrodloProbek):
+    """Odtwarza gotowy sygnał (np. ekg1.txt) w rzeczywistym tempie fs."""
+
+    def __init__(self, sygnaly, fs: float, blok_s: float = 0.01, w_petli: bool = True):
+        self.sygnaly = np.asarray(sygnaly).reshape(len(sygnaly), -1)
+        self.liczba_kanalow = self.sygnaly.shape[1]
+        self.fs = fs
+        self.rozmiar_bloku = max(int(round(blok_s * fs)), 1)
+        self.w_petli = w_petli
+
+    @classmethod
+    def z_pliku(cls, sciezka_pliku: str, **kwargs):
+        """Źródło z pliku EKG – format i fs rozpoznaje PlatformaEKG."""
+        from platforma import PlatformaEKG
+
+        platforma = PlatformaEKG()
+        platforma.wczytaj_plik(sciezka_pliku)
+        return cls(platforma.sygnaly, platforma.fs, **kwargs)
+
+    def bloki(self, stop):
+        start = time.perf_counter()
+        wyslane = 0
+        n = self.sygnaly.shape[0]
+        while not stop.is_set():
+            poz = wyslane % n
+            if not self.w_petli and wyslane >= n:
+                return
+            koniec = min(poz + self.rozmiar_bloku, n)
+            # Harmonogram absolutny – brak dryfu przy opóźnieniach wątku
+            termin = start + (wyslane + koniec - poz) / self.fs
+            opoznienie = termin - time.perf_counter()
+            if opoznienie > 0:
+                time.sleep(opoznienie)
+            yield self.sygnaly[poz:koniec]
+            wyslane += koniec - poz
+
+
+class ZrodloGniazdo(ZrodloProbek):
+    """
+    Odbiór z lokalnego gniazda TCP: strumień ramek float32 little-endian,
+    każda ramka to liczba_kanalow wartości.
+    """
+
+    def __init__(self, host: str, port: int, liczba_kanalow: int, fs: float, rozmiar_odczytu: int = 65536):
+        self.liczba_kanalow = liczba_kanalow
+        self.fs = fs
+        self.rozmiar_odczytu = rozmiar_odczytu
+        self.gniazdo = socket.create_connection((host, port))
+        self.gniazdo.settimeout(0.1)
+
+    def bloki(self, stop):
+        rozmiar_ramki = 4 * self.liczba_kanalow
+        reszta = b''
+        while not stop.is_set():
+            try:
+                dane = self.gniazdo.recv(self.rozmiar_odczytu)
+            except socket.timeout:
+                continue
+            if not dane:
+                return
+            dane = reszta + dane
+            pelne = len(dane) // rozmiar_ramki * rozmiar_ramki
+            reszta = dane[pelne:]
+            if pelne:
+                yield np.frombuffer(dane[:pelne], dtype='<f4').reshape(-1, self.liczba_kanalow)
+
+    def zamknij(self):
+        self.gniazdo.close()
+
+
+class ZrodloPotok(ZrodloProbek):
+    """
+    Odbiór z potoku (np. stdin lub FIFO): linie tekstu z liczba_kanalow wartościami.
+    Blokujący os.read działa w osobnym wątku czytającym (select na potokach nie działa
+    w Windows), a bloki() czeka na dane z limitem czasu, więc zatrzymaj() nie czeka
+    na kolejne dane. Deskryptor przekazany przez wywołującego nie jest zamykany –
+    zamykany jest tylko deskryptor otwarty przez samo źródło (ZrodloPotok.otworz).
+    """
+
+    def __init__(self, deskryptor: int, liczba_kanalow: int, fs: float, rozmiar_odczytu: int = 65536,
+                 limit_czasu_s: float = 0.1):
+        self.deskryptor = deskryptor
+        self.liczba_kanalow = liczba_kanalow
+        self.fs = fs
+        self.rozmiar_odczytu = rozmiar_odczytu
+        self.limit_czasu_s = limit_czasu_s
+        self.wlasny_deskryptor = False
+        self._blokada = threading.Lock()
+        self._czytanie = False    # wątek czytający jest w trakcie os.read
+        self._zamkniete = False
+
+    @classmethod
+    def otworz(cls, sciezka: str, liczba_kanalow: int, fs: float, **kwargs):
+        """Źródło z pliku lub FIFO otwieranego (i zamykanego) przez samo źródło."""
+        zrodlo = cls(os.open(sciezka, os.O_RDONLY), liczba_kanalow, fs, **kwargs)
+        zrodlo.wlasny_deskryptor = True
+        return zrodlo
+
+    def _czytaj(self, kolejka):
+        """Wątek czytający: kolejne odczyty do kolejki, b'' oznacza koniec danych."""
+        dane = b''
+        try:
+            while True:
+                with self._blokada:
+                    if self._zamkniete:
+                        return
+                    self._czytanie = True
+                try:
+                    dane = os.read(self.deskryptor, self.rozmiar_odczytu)
+                finally:
+                    with self._blokada:
+                        self._czytanie = False
+                        # zamknij() wywołane w trakcie odczytu – deskryptor zamykany dopiero teraz,
+                        # żeby jego numer nie został użyty ponownie, gdy os.read jeszcze trwa
+                        if self._zamkniete:
+                            self._zamknij_deskryptor()
+                            return
+                kolejka.put(dane)
+                if not dane:
+                    return
+        except OSError:
+            kolejka.put(b'')
+
+    def bloki(self, stop):
+        kolejka = queue.Queue()
+        threading.Thread(target=self._czytaj, args=(kolejka,), daemon=True).start()
+        reszta = b''
+        while not stop.is_set():
+            try:
+                dane = kolejka.get(timeout=self.limit_czasu_s)
+            except queue.Empty:
+                continue
+            if not dane:
+                return
+            dane = reszta + dane
+            koniec = dane.rfind(b'\n') + 1
+            reszta = dane[koniec:]
+            if koniec:
+                wartosci = np.fromstring(dane[:koniec], dtype=np.float64, sep=' ')
+                yield wartosci.reshape(-1, self.liczba_kanalow)
+
+    def _zamknij_deskryptor(self):
+        if self.wlasny_deskryptor:
+            os.close(self.deskryptor)
+            self.wlasny_deskryptor = False
+
+    def zamknij(self):
+        with self._blokada:
+            self._zamkniete = True
+            if not self._czytanie:
+                self._zamknij_deskryptor()
+
+
+class Akwizycja:
+    """Wątek przepisujący bloki ze źródła do bufora pierścieniowego (poza wątkiem Tk)."""
+
+    def __init__(self, zrodlo: ZrodloProbek, bufor: BuforPierscieniowy):
+        self.zrodlo = zrodlo
+        self.bufor = bufor
+        self.stop = threading.Event()
+        self.watek = threading.Thread(target=self._petla, daemon=True)
+
+    def _petla(self):
+        try:
+            for blok in self.zrodlo.bloki(self.stop):
+                self.bufor.zapisz(blok, time.perf_counter())
+        finally:
+            self.zrodlo.zamknij()
+
+    def uruchom(self):
+        self.watek.start()
+
+    def zatrzymaj(self):
+        self.stop.set()
+        self.watek.join(timeout=1.0)
+
+
+class MiernikOpoznien:
+    """Statystyki opóźnienia: przybycie próbki -> narysowanie klatki (w sekundach)."""
+
+    def __init__(self, rozmiar: int = 1000):
+        self.probki = np.zeros(rozmiar)
+        self.liczba = 0
+        self.utracone = 0   # próbki pominięte przez bufor (BuforPierscieniowy.pominiete)
+
+    def dodaj(self, opoznienie: float):
+        self.probki[self.liczba % len(self.probki)] = opoznienie
+        self.liczba += 1
+
+    def podsumowanie(self):
+        """(ostatnie, mediana, maksimum) z ostatnich pomiarów."""
+        if self.liczba == 0:
+            return 0.0, 0.0, 0.0
+        okno = self.probki[:min(self.liczba, len(self.probki))]
+        ostatnie = self.probki[(self.liczba - 1) % len(self.probki)]
+        return ostatnie, float(np.median(okno)), float(okno.max())
@@ -0,0 +1,99 @@
+"""
+Poziomy szczegółowości (LOD) dla wykresów długich sygnałów EKG.
+
+Piramida min/max: poziom k grupuje próbki w kubełki o rozmiarze WSPOLCZYNNIK**k
+i przechowuje minimum i maksimum każdego kubełka dla każdego kanału.
+Zapytanie o zakres próbek zwraca co najwyżej ~max_punktow punktów
+(para min/max na kubełek), więc koszt rysowania nie zależy od długości nagrania.
+"""
+
+import numpy as np
+
+WSPOLCZYNNIK = 4
+
+
+class PiramidaMinMax:
+    """Prekomputowana piramida min/max dla tablicy sygnałów (liczba_probek, liczba_kanalow)."""
+
+    def __init__(self, sygnaly, wspolczynnik: int = WSPOLCZYNNIK, min_kubelkow: int = 256):
+        self.sygnaly = sygnaly
+        self.wspolczynnik = wspolczynnik
+        self.liczba_probek = sygnaly.shape[0]
+
+        # poziomy[k-1] = (rozmiar_kubelka, minima, maksima)
+        self.poziomy = []
+        minima = maksima = sygnaly
+        rozmiar = 1
+        while minima.shape[0] > min_kubelkow:
+            minima = self._redukuj(minima, np.minimum)
+            maksima = self._redukuj(maksima, np.maximum)
+            rozmiar *= wspolczynnik
+            self.poziomy.append((rozmiar, minima, maksima))
+
+    def _redukuj(self, dane, funkcja):
+        """Łączy kolejne grupy `wspolczynnik` wierszy w jeden (ostatnia niepełna grupa osobno)."""
+        w = self.wspolczynnik
+        pelne = dane.shape[0] // w
+        wynik = funkcja.reduce(np.asarray(dane[:pelne * w]).reshape(pelne, w, -1), axis=1)
+        if dane.shape[0] % w:
+            ogon = funkcja.reduce(np.asarray(dane[pelne * w:]), axis=0, keepdims=True)
+            wynik = np.concatenate((wynik, ogon))
+        return wynik
+
+    def zapytanie(self, idx_start: int, idx_koniec: int, max_punktow: int):
+        """
+        Zwraca (indeksy, wartosci) do narysowania zakresu próbek [idx_start, idx_koniec).
+        indeksy – numery próbek (do przeliczenia na czas), wartosci – (len(indeksy), liczba_kanalow).
+        """
+        idx_start = max(0, int(idx_start))
+        idx_koniec = min(self.liczba_probek, int(idx_koniec))
+        if idx_koniec <= idx_start:
+            return np.empty(0, dtype=np.int64), self.sygnaly[0:0]
+
+        liczba = idx_koniec - idx_start
+        if liczba <= max_punktow or not self.poziomy:
+            return np.arange(idx_start, idx_koniec), self.sygnaly[idx_start:idx_koniec]
+
+        # Najdrobniejszy poziom, na którym para min/max na kubełek mieści się w limicie
+        for rozmiar, minima, maksima in self.poziomy:
+            if 2 * (liczba // rozmiar + 2) <= max_punktow:
+                break
+
+        k_start = idx_start // rozmiar
+        k_koniec = -(-idx_koniec // rozmiar)
+        n_kub = k_koniec - k_start
+
+        # Przeplatanie: min i max każdego kubełka na dwóch pozycjach wewnątrz kubełka
+        wartosci = np.empty((2 * n_kub, self.sygnaly.shape[1]), dtype=minima.dtype)
+        wartosci[0::2] = minima[k_start:k_koniec]
+        wartosci[1::2] = maksima[k_start:k_koniec]
+
+        poczatki = np.arange(k_start, k_koniec) * rozmiar
+        indeksy = np.empty(2 * n_kub, dtype=np.int64)
+        indeksy[0::2] = poczatki
+        indeksy[1::2] = poczatki + rozmiar // 2
+        np.clip(indeksy, idx_start, idx_koniec - 1, out=indeksy)
+        return indeksy, wartosci
+
+
+def decymuj(sygnaly, max_punktow: int):
+    """
+    Jednopoziomowa decymacja min/max (bez piramidy) – dla krótkich, zmieniających się
+    okien, np. przewijanego podglądu na żywo. Zwraca (indeksy, wartosci) jak zapytanie().
+    """
+    liczba = sygnaly.shape[0]
+    if liczba <= max_punktow:
+        return np.arange(liczba), sygnaly
+
+    rozmiar = -(-2 * liczba // max_punktow)
+    pelne = liczba // rozmiar
+    kubelki = sygnaly[liczba - pelne * rozmiar:].reshape(pelne, rozmiar, -1)
+    wartosci = np.empty((2 * pelne, sygnaly.shape[1]), dtype=sygnaly.dtype)
+    wartosci[0::2] = kubelki.min(axis=1)
+    wartosci[1::2] = kubelki.max(axis=1)
+
+    poczatki = liczba - pelne * rozmiar + np.arange(pelne) * rozmiar
+    indeksy = np.empty(2 * pelne, dtype=np.int64)
+    indeksy[0::2] = poczatki
+    indeksy[1::2] = poczatki + rozmiar - 1
+    return indeksy, wartosci
@@ -0,0 +1,145 @@
+"""
+Strumieniowy parser dużych plików tekstowych z sygnałami EKG.
+
+Plik czytany jest blokami o stałym rozmiarze; każdy blok (ucięty na ostatnim
+znaku nowej linii) parsowany jest w C przez np.fromstring(sep=' ') wprost do
+prealokowanej tablicy wynikowej. Szczytowe zużycie pamięci to rozmiar wyniku
+plus jeden blok. Liczba wartości w każdej linii sprawdzana jest wektorowo na
+bajtach bloku – pliki z niespójną liczbą kolumn zgłaszają ValueError.
+"""
+
+import os
+import numpy as np
+
+ROZMIAR_BLOKU = 16 * 2**20  # 16 MiB
+
+
+class WczytywanieAnulowane(Exception):
+    """Zgłaszany, gdy wczytywanie przerwano przez obiekt anuluj."""
+
+
+def _czy_anulowano(anuluj):
+    return anuluj is not None and anuluj.is_set()
+
+
+def _bloki(f, rozmiar_bloku):
+    """Generator bloków kończących się pełną linią (reszta przechodzi do kolejnego bloku)."""
+    reszta = b''
+    while True:
+        dane = f.read(rozmiar_bloku)
+        if not dane:
+            if reszta.strip():
+                yield reszta
+            return
+        dane = reszta + dane
+        koniec = dane.rfind(b'\n') + 1
+        if koniec == 0:
+            reszta = dane
+            continue
+        reszta = dane[koniec:]
+        yield dane[:koniec]
+
+
+def policz_kolumny(blok: bytes) -> int:
+    """Liczba kolumn na podstawie pierwszej niepustej linii bloku."""
+    for linia in blok.splitlines():
+        if linia.strip():
+            return len(linia.split())
+    return 0
+
+
+def wartosci_w_liniach(blok: bytes):
+    """
+    Liczba wartości (ciągów znaków bez białych znaków) w każdej linii bloku –
+    wektorowo na bajtach bloku, bez dzielenia na linie w Pythonie.
+    """
+    b = np.frombuffer(blok, dtype=np.uint8)
+    bialy = b <= 32
+    poczatki = ~bialy
+    poczatki[1:] &= bialy[:-1]
+    poz_wartosci = np.flatnonzero(poczatki)
+    konce_linii = np.flatnonzero(b == 10)
+    # Liczba wartości przed końcem każdej linii (ostatnia linia może nie mieć '\n')
+    narastajaco = np.searchsorted(poz_wartosci, konce_linii)
+    return np.diff(np.concatenate(([0], narastajaco, [poz_wartosci.size])))
+
+
+def policz_linie(sciezka_pliku: str, rozmiar_bloku: int = ROZMIAR_BLOKU, anuluj=None) -> int:
+    """Górne ograniczenie liczby wierszy (liczba znaków nowej linii) – szybki przebieg bez parsowania."""
+    linie = 0
+    ostatni = b'\n'
+    with open(sciezka_pliku, 'rb') as f:
+        while True:
+            if _czy_anulowano(anuluj):
+                raise WczytywanieAnulowane(sciezka_pliku)
+            dane = f.read(rozmiar_bloku)
+            if not dane:
+                break
+            linie += dane.count(b'\n')
+            ostatni = dane[-1:]
+    # ostatnia linia bez znaku nowej linii
+    if ostatni != b'\n':
+        linie += 1
+    return linie
+
+
+def wczytaj_txt(sciezka_pliku: str, rozmiar_bloku: int = ROZMIAR_BLOKU, postep=None, anuluj=None):
+    """
+    Wczytuje plik tekstowy z kolumnami liczb rozdzielonymi białymi znakami.
+
+    postep – opcjonalna funkcja postep(ulamek) wywoływana po każdym bloku,
+    anuluj – opcjonalny obiekt z metodą is_set() (np. threading.Event);
+             ustawienie go przerywa wczytywanie wyjątkiem WczytywanieAnulowane.
+
+    Zwraca tablicę 2D (liczba_wierszy, liczba_kolumn) typu float64.
+    Liczba kolumn wyznaczana jest tylko na podstawie pierwszego bloku.
+    """
+    rozmiar_pliku = os.path.getsize(sciezka_pliku)
+    max_wierszy = policz_linie(sciezka_pliku, rozmiar_bloku, anuluj)
+
+    wynik = None
+    kolumny = 0
+    zapisane = 0      # liczba wartości zapisanych do wynik
+    przeczytane = 0   # liczba bajtów przetworzonych
+
+    with open(sciezka_pliku, 'rb') as f:
+        for blok in _bloki(f, rozmiar_bloku):
+            if _czy_anulowano(anuluj):
+                raise WczytywanieAnulowane(sciezka_pliku)
+
+            if wynik is None:
+                kolumny = policz_kolumny(blok)
+                if kolumny == 0:
+                    continue
+                wynik = np.empty(max_wierszy * kolumny, dtype=np.float64)
+
+            wartosci = np.fromstring(blok, dtype=np.float64, sep=' ')
+            # Każda niepusta linia musi mieć dokładnie kolumny wartości, a wszystkie
+            # muszą być liczbami (fromstring kończy na pierwszej błędnej)
+            w_liniach = wartosci_w_liniach(blok)
+            if wartosci.size != w_liniach.sum() or np.any((w_liniach != 0) & (w_liniach != kolumny)):
+                raise ValueError(f"Niespójna liczba kolumn w pliku {sciezka_pliku} "
+                                 f"(oczekiwano {kolumny}).")
+            wynik[zapisane:zapisane + wartosci.size] = wartosci
+            zapisane += wartosci.size
+
+            przeczytane += len(blok)
+            if postep is not None:
+                postep(min(przeczytane / max(rozmiar_pliku, 1), 1.0))
+
+    if wynik is None:
+        raise ValueError(f"Plik {sciezka_pliku} nie zawiera danych.")
+
+    return wynik[:zapisane].reshape(-1, kolumny)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    sciezka = sys.argv[1] if len(sys.argv) > 1 else os.path.join("signals", "ekg1.txt")
+    start = time.perf_counter()
+    dane = wczytaj_txt(sciezka)
+    czas = time.perf_counter() - start
+    rozmiar_mb = os.path.getsize(sciezka) / 2**20
+    print(f"{sciezka}: {dane.shape}, {czas:.3f} s, {rozmiar_mb / czas:.1f} MiB/s")
@@ -0,0 +1,237 @@
+"""
+Równoległe przetwarzanie wielu plików EKG w puli procesów.
+
+- Każdy proces sam wczytuje swój plik (do procesu przekazywana jest tylko ścieżka).
+- Liczba zadań w locie jest ograniczona (max_w_locie), więc pamięć nie rośnie
+  z liczbą plików.
+- Duże tablice wynikowe wracają do procesu głównego przez
+  multiprocessing.shared_memory (bez pickle) i są zwalniane zaraz po odbiorze.
+- Wznawianie: plik, którego wynik jest nowszy od wejścia i policzony z tymi samymi
+  parametrami zadania (zapisanymi w pliku .json obok wyniku), jest pomijany, a jego
+  podsumowanie odczytywane z tego pliku.
+- Nazwa wyniku zawiera skrót katalogu wejściowego, więc pliki o tej samej nazwie
+  z różnych katalogów nie nadpisują sobie wyników.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from platforma import PlatformaEKG
+import ekg_bin
+import ekg_eksport
+
+ZADANIA = ('statystyki', 'konwertuj', 'filtruj', 'fft')
+
+
+# --- Pamięć współdzielona ---------------------------------------------------------
+
+def do_pamieci_wspoldzielonej(tablica):
+    """Kopiuje tablicę do nowego bloku SharedMemory; zwraca opis (nazwa, kształt, typ)."""
+    tablica = np.ascontiguousarray(tablica)
+    # Właścicielem bloku zostaje proces główny (zwalnia go po odczycie) – proces roboczy
+    # nie może go usunąć przy zakończeniu
+    if sys.version_info >= (3, 13):
+        blok = shared_memory.SharedMemory(create=True, size=max(tablica.nbytes, 1), track=False)
+    else:
+        blok = shared_memory.SharedMemory(create=True, size=max(tablica.nbytes, 1))
+        if os.name == 'posix':
+            # Tylko na POSIX blok jest rejestrowany w resource_tracker (pod nazwą z '/')
+            resource_tracker.unregister('/' + blok.name, 'shared_memory')
+    np.ndarray(tablica.shape, dtype=tablica.dtype, buffer=blok.buf)[...] = tablica
+    opis = (blok.name, tablica.shape, tablica.dtype.str)
+    blok.close()
+    return opis
+
+
+def z_pamieci_wspoldzielonej(opis):
+    """Odczytuje tablicę z bloku SharedMemory (kopia), po czym blok jest zwalniany."""
+    nazwa, ksztalt, typ = opis
+    blok = shared_memory.SharedMemory(name=nazwa)
+    try:
+        return np.ndarray(ksztalt, dtype=typ, buffer=blok.buf).copy()
+    finally:
+        blok.close()
+        blok.unlink()
+
+
+# --- Zadania wykonywane w procesach roboczych -------------------------------------
+
+def sciezka_wyniku(sciezka_wej: str, katalog_wyj: str, zadanie: str) -> str:
+    """<katalog_wyj>/<nazwa>_<skrót katalogu wejścia>[_<zadanie>].<rozszerzenie>"""
+    katalog_wej = os.path.dirname(os.path.abspath(sciezka_wej))
+    skrot = hashlib.sha1(katalog_wej.encode()).hexdigest()[:8]
+    nazwa = os.path.splitext(os.path.basename(sciezka_wej))[0] + '_' + skrot
+    rozszerzenie = {'konwertuj': ekg_bin.ROZSZERZENIE, 'filtruj': '.npy',
+                    'fft': '.npy', 'statystyki': '.json'}[zadanie]
+    przyrostek = '' if zadanie == 'konwertuj' else f'_{zadanie}'
+    return os.path.join(katalog_wyj, nazwa + przyrostek + rozszerzenie)
+
+
+def parametry_zadania(zadanie: str, parametry: dict) -> dict:
+    """Parametry, od których zależy wynik zadania (z wartościami domyślnymi)."""
+    if zadanie == 'filtruj':
+        return {'lpf': parametry.get('lpf', 60.0), 'hpf': parametry.get('hpf', 5.0),
+                'rzad': parametry.get('rzad', 4)}
+    return {}
+
+
+def przetworz_plik(sciezka: str, zadanie: str, katalog_wyj: str, parametry: dict, zwroc_tablice: bool):
+    """
+    Wykonuje zadanie dla jednego pliku (w procesie roboczym).
+    Zwraca (podsumowanie, opis_tablicy_w_pamieci_wspoldzielonej lub None).
+    """
+    start = time.perf_counter()
+    platforma = PlatformaEKG()
+    platforma.wczytaj_plik(sciezka)
+    sygnaly = np.asarray(platforma.sygnaly, dtype=np.float64)
+    fs = platforma.fs
+    wyj = sciezka_wyniku(sciezka, katalog_wyj, zadanie)
+
+    podsumowanie = {
+        'plik': sciezka,
+        'wynik': wyj,
+        'parametry': parametry_zadania(zadanie, parametry),
+        'probki': int(sygnaly.shape[0]),
+        'kanaly': int(sygnaly.shape[1]),
+        'fs': fs,
+        'czas_s': sygnaly.shape[0] / fs,
+        'srednia': sygnaly.mean(axis=0).tolist(),
+        'odchylenie': sygnaly.std(axis=0).tolist(),
+    }
+
+    tablica = None
+    if zadanie == 'konwertuj':
+        platforma.zapisz_binarnie(wyj)
+    elif zadanie == 'filtruj':
+        import filtracja
+        p = podsumowanie['parametry']
+        tablica = filtracja.filtruj(sygnaly, fs, p['lpf'], p['hpf'], p['rzad'])
+        ekg_eksport.zapisz_fragment(platforma.t, tablica, 0, tablica.shape[0], wyj, 'npy')
+    elif zadanie == 'fft':
+        tablica = np.abs(np.fft.rfft(sygnaly, axis=0))
+        freqs = np.fft.rfftfreq(sygnaly.shape[0], d=1 / fs)
+        np.save(wyj, np.column_stack((freqs, tablica)))
+        podsumowanie['dominujaca_hz'] = freqs[1:][np.argmax(tablica[1:], axis=0)].tolist()
+
+    podsumowanie['czas_przetwarzania_s'] = time.perf_counter() - start
+    with open(_sciezka_podsumowania(wyj), 'w') as f:
+        json.dump(podsumowanie, f)
+
+    opis = do_pamieci_wspoldzielonej(tablica) if zwroc_tablice and tablica is not None else None
+    return podsumowanie, opis
+
+
+def _sciezka_podsumowania(wyj: str) -> str:
+    return wyj if wyj.endswith('.json') else wyj + '.json'
+
+
+def aktualny(sciezka: str, katalog_wyj: str, zadanie: str, parametry: dict = None) -> bool:
+    """
+    Czy wynik (i jego podsumowanie) istnieje, jest nowszy niż plik wejściowy
+    i został policzony z tymi samymi parametrami zadania.
+    """
+    wyj = sciezka_wyniku(sciezka, katalog_wyj, zadanie)
+    podsumowanie = _sciezka_podsumowania(wyj)
+    if not (os.path.exists(wyj) and os.path.exists(podsumowanie)):
+        return False
+    if min(os.path.getmtime(wyj), os.path.getmtime(podsumowanie)) < os.path.getmtime(sciezka):
+        return False
+    try:
+        with open(podsumowanie) as f:
+            zapisane = json.load(f).get('parametry')
+    except (OSError, ValueError):
+        return False
+    # Porównanie po serializacji JSON (krotki -> listy, jak w zapisanym pliku)
+    oczekiwane = json.loads(json.dumps(parametry_zadania(zadanie, parametry or {})))
+    return zapisane == oczekiwane
+
+
+# --- Proces główny ----------------------------------------------------------------
+
+def _wypisz_postep(zrobione, wszystkie, sciezka, status):
+    print(f"[{zrobione}/{wszystkie}] {status}: {sciezka}")
+
+
+def przetworz_wsadowo(pliki, zadanie: str, katalog_wyj: str, parametry: dict = None, procesy: int = None,
+                      max_w_locie: int = None, wznow: bool = True, postep=_wypisz_postep, na_wynik=None):
+    """
+    Przetwarza pliki równolegle. Zwraca zbiorcze podsumowanie (słownik), zapisywane
+    także do <katalog_wyj>/podsumowanie_<zadanie>.json.
+
+    na_wynik – opcjonalna funkcja na_wynik(podsumowanie, tablica) wywoływana w procesie
+               głównym; tablica (np. przefiltrowany sygnał, widmo) przychodzi przez
+               pamięć współdzieloną.
+    """
+    if zadanie not in ZADANIA:
+        raise ValueError(f"Nieznane zadanie: {zadanie}")
+    parametry = parametry or {}
+    procesy = procesy or os.cpu_count() or 1
+    max_w_locie = max_w_locie or 2 * procesy
+    os.makedirs(katalog_wyj, exist_ok=True)
+
+    start = time.perf_counter()
+    wyniki, bledy, pominiete = [], [], 0
+    wszystkie = len(pliki)
+    zrobione = 0
+
+    do_zrobienia = []
+    for sciezka in pliki:
+        if wznow and aktualny(sciezka, katalog_wyj, zadanie, parametry):
+            with open(_sciezka_podsumowania(sciezka_wyniku(sciezka, katalog_wyj, zadanie))) as f:
+                wyniki.append(json.load(f))
+            pominiete += 1
+            zrobione += 1
+            postep(zrobione, wszystkie, sciezka, "aktualny")
+        else:
+            do_zrobienia.append(sciezka)
+
+    with ProcessPoolExecutor(max_workers=procesy) as pula:
+        w_locie = {}
+        kolejka = iter(do_zrobienia)
+        while True:
+            # Dokładamy zadania tylko do limitu – ograniczona pamięć w locie
+            while len(w_locie) < max_w_locie:
+                sciezka = next(kolejka, None)
+                if sciezka is None:
+                    break
+                przyszlosc = pula.submit(przetworz_plik, sciezka, zadanie, katalog_wyj, parametry,
+                                         na_wynik is not None)
+                w_locie[przyszlosc] = sciezka
+            if not w_locie:
+                break
+
+            gotowe, _ = wait(w_locie, return_when=FIRST_COMPLETED)
+            for przyszlosc in gotowe:
+                sciezka = w_locie.pop(przyszlosc)
+                zrobione += 1
+                try:
+                    podsumowanie, opis = przyszlosc.result()
+                except Exception as e:
+                    bledy.append({'plik': sciezka, 'blad': repr(e)})
+                    postep(zrobione, wszystkie, sciezka, "błąd")
+                    continue
+                if opis is not None:
+                    na_wynik(podsumowanie, z_pamieci_wspoldzielonej(opis))
+                wyniki.append(podsumowanie)
+                postep(zrobione, wszystkie, sciezka, "gotowy")
+
+    zbiorcze = {
+        'zadanie': zadanie,
+        'pliki': wszystkie,
+        'przetworzone': len(wyniki) - pominiete,
+        'pominiete': pominiete,
+        'bledy': bledy,
+        'laczny_czas_sygnalow_s': sum(w['czas_s'] for w in wyniki),
+        'czas_calkowity_s': time.perf_counter() - start,
+        'wyniki': wyniki,
+    }
+    with open(os.path.join(katalog_wyj, f"podsumowanie_{zadanie}.json"), 'w') as f:
+        json.dump(zbiorcze, f, indent=2)
+    return zbiorcze
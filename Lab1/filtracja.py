@@ -0,0 +1,199 @@
+"""
+Filtracja sygnałów EKG filtrami Butterwortha w postaci sekcji drugiego rzędu (SOS).
+
+- SOS zamiast (b, a): stabilne numerycznie także przy wyższych rzędach.
+- Kaskada LPF + HPF jako jedna macierz sekcji – jedno przejście przez sygnał.
+- FiltrStrumieniowy: filtracja blokami z przenoszonym stanem (zi) – sygnały
+  dowolnie długie lub napływające na żywo (przyczynowa, z opóźnieniem fazowym).
+- filtruj_zerofazowo: filtracja w przód i wstecz blokami (jak sosfiltfilt, z tym
+  samym dopełnieniem nieparzystym brzegów), pamięć: tablica wyjściowa + jeden blok.
+  Tablicą wyjściową może być np.memmap, więc długość nagrania nie jest ograniczona RAM.
+
+Sygnały: 1D (N,) lub 2D (N, kanaly); filtracja zawsze wzdłuż osi 0 – wszystkie
+kanały w jednym wywołaniu sosfilt. Projekty filtrów są zapamiętywane (lru_cache po
+typie, rzędzie, odcięciu i fs), a wiele kanałów można rozdzielić na grupy liczone
+w wątkach (sosfilt zwalnia GIL).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+ROZMIAR_BLOKU = 65536
+TYPY = ('low', 'high', 'bandpass', 'bandstop')
+
+
+def projekt_sos(typ: str, rzad: int, odciecie, fs: float):
+    """
+    Filtr Butterwortha w postaci SOS; odciecie w Hz (para dla 'bandpass'/'bandstop').
+    Projekt z pamięci podręcznej; zwracana jest kopia (scipy wymaga tablic zapisywalnych).
+    """
+    if typ not in TYPY:
+        raise ValueError(f"Nieznany typ filtru: {typ}")
+    odciecie = tuple(float(f) for f in odciecie) if np.ndim(odciecie) else float(odciecie)
+    return _projekt_sos(typ, int(rzad), odciecie, float(fs)).copy()
+
+
+@lru_cache(maxsize=128)
+def _projekt_sos(typ, rzad, odciecie, fs):
+    sos = butter(rzad, odciecie, btype=typ, fs=fs, output='sos')
+    sos.flags.writeable = False
+    return sos
+
+
+def kaskada(fs: float, lpf: float = None, hpf: float = None, rzad: int = 4):
+    """
+    Sekcje kaskady LPF + HPF (pominięte, gdy odcięcie to None lub 0).
+    Zwraca None, gdy nie ma żadnego filtru. Projekt z pamięci podręcznej (kopia).
+    """
+    sos = _kaskada(float(fs), float(lpf or 0), float(hpf or 0), int(rzad))
+    return None if sos is None else sos.copy()
+
+
+@lru_cache(maxsize=128)
+def _kaskada(fs, lpf, hpf, rzad):
+    sekcje = []
+    if lpf:
+        sekcje.append(_projekt_sos('low', rzad, lpf, fs))
+    if hpf:
+        sekcje.append(_projekt_sos('high', rzad, hpf, fs))
+    if not sekcje:
+        return None
+    sos = np.vstack(sekcje)
+    sos.flags.writeable = False
+    return sos
+
+
+def _stan_poczatkowy(sos, probka):
+    """Stan ustalony filtru dla stałego sygnału równego probka (skalar lub wektor kanałów)."""
+    zi = sosfilt_zi(sos)
+    probka = np.asarray(probka, dtype=np.float64)
+    return zi.reshape(zi.shape + (1,) * probka.ndim) * probka
+
+
+class FiltrStrumieniowy:
+    """
+    Filtr przyczynowy przetwarzający kolejne bloki (N_bloku,) lub (N_bloku, kanaly)
+    z zachowaniem stanu między blokami – wynik identyczny jak sosfilt na całości
+    (przy tym samym stanie początkowym).
+    """
+
+    def __init__(self, sos, stan_ustalony: bool = True):
+        self.sos = np.asarray(sos, dtype=np.float64)
+        self.stan_ustalony = stan_ustalony
+        self.zi = None
+
+    def reset(self):
+        self.zi = None
+
+    def przetworz(self, blok):
+        blok = np.asarray(blok, dtype=np.float64)
+        if len(blok) == 0:
+            return blok.copy()
+        if self.zi is None:
+            if self.stan_ustalony:
+                self.zi = _stan_poczatkowy(self.sos, blok[0])
+            else:
+                self.zi = np.zeros((self.sos.shape[0], 2) + blok.shape[1:])
+        wynik, self.zi = sosfilt(self.sos, blok, axis=0, zi=self.zi)
+        return wynik
+
+
+def filtruj_blokami(sygnal, sos, rozmiar_bloku: int = ROZMIAR_BLOKU, wyjscie=None):
+    """Filtracja przyczynowa całego sygnału blokami (stała pamięć robocza). Zwraca wyjscie."""
+    if wyjscie is None:
+        wyjscie = np.empty(np.shape(sygnal), dtype=np.float64)
+    filtr = FiltrStrumieniowy(sos)
+    for start in range(0, len(sygnal), rozmiar_bloku):
+        koniec = min(start + rozmiar_bloku, len(sygnal))
+        wyjscie[start:koniec] = filtr.przetworz(sygnal[start:koniec])
+    return wyjscie
+
+
+def dlugosc_dopelnienia(sos) -> int:
+    """Domyślna długość dopełnienia brzegów – jak w scipy.signal.sosfiltfilt."""
+    sos = np.asarray(sos)
+    zera = min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum())
+    return 3 * (2 * len(sos) + 1 - zera)
+
+
+def filtruj_zerofazowo(sygnal, sos, rozmiar_bloku: int = ROZMIAR_BLOKU, wyjscie=None):
+    """
+    Filtracja zerofazowa (w przód i wstecz) blokami; wynik jak sosfiltfilt(sos, sygnal, axis=0).
+
+    Przebieg w przód zapisuje do wyjscie, przebieg wstecz nadpisuje je blokami od końca.
+    Brzegi dopełniane nieparzyście (2*x[0] - x[k:0:-1] itd.), stan początkowy – ustalony.
+    """
+    sos = np.asarray(sos, dtype=np.float64)
+    n = len(sygnal)
+    dopelnienie = min(dlugosc_dopelnienia(sos), max(n - 1, 0))
+    if wyjscie is None:
+        wyjscie = np.empty(np.shape(sygnal), dtype=np.float64)
+    if n == 0:
+        return wyjscie
+
+    x0 = np.asarray(sygnal[0], dtype=np.float64)
+    xn = np.asarray(sygnal[n - 1], dtype=np.float64)
+    przed = 2 * x0 - np.asarray(sygnal[dopelnienie:0:-1], dtype=np.float64)
+    po = 2 * xn - np.asarray(sygnal[n - 1 - dopelnienie:n - 1], dtype=np.float64)[::-1]
+
+    # W przód: dopełnienie początkowe, sygnał blokami, dopełnienie końcowe
+    filtr = FiltrStrumieniowy(sos)
+    filtr.zi = _stan_poczatkowy(sos, przed[0] if dopelnienie else x0)
+    filtr.przetworz(przed)
+    for start in range(0, n, rozmiar_bloku):
+        koniec = min(start + rozmiar_bloku, n)
+        wyjscie[start:koniec] = filtr.przetworz(sygnal[start:koniec])
+    po_przod = filtr.przetworz(po)
+
+    # Wstecz: od końca dopełnienia końcowego, potem bloki wyjścia w odwrotnej kolejności
+    ogon = po_przod[::-1] if dopelnienie else np.asarray(wyjscie[n - 1:n])
+    filtr.zi = _stan_poczatkowy(sos, ogon[0])
+    if dopelnienie:
+        filtr.przetworz(ogon)
+    for koniec in range(n, 0, -rozmiar_bloku):
+        start = max(koniec - rozmiar_bloku, 0)
+        wyjscie[start:koniec] = filtr.przetworz(wyjscie[start:koniec][::-1])[::-1]
+    return wyjscie
+
+
+def filtruj_wielokanalowo(sygnaly, sos, zerofazowo: bool = True, rozmiar_bloku: int = ROZMIAR_BLOKU,
+                          wyjscie=None, watki: int = None):
+    """
+    Filtracja sygnału (N, kanaly) wzdłuż osi 0. Kanały dzielone są na co najwyżej
+    watki grup (domyślnie liczba rdzeni), każda grupa to jedno wywołanie filtru
+    na wycinku kolumn, liczone w osobnym wątku i zapisywane wprost do wyjscie.
+    """
+    funkcja = filtruj_zerofazowo if zerofazowo else filtruj_blokami
+    if wyjscie is None:
+        wyjscie = np.empty(np.shape(sygnaly), dtype=np.float64)
+    kanaly = 1 if np.ndim(sygnaly) == 1 else np.shape(sygnaly)[1]
+    watki = min(watki or os.cpu_count() or 1, kanaly)
+    if watki <= 1:
+        return funkcja(sygnaly, sos, rozmiar_bloku, wyjscie)
+
+    granice = np.linspace(0, kanaly, watki + 1).astype(int)
+    with ThreadPoolExecutor(max_workers=watki) as pula:
+        zadania = [pula.submit(funkcja, sygnaly[:, od:do], sos, rozmiar_bloku, wyjscie[:, od:do])
+                   for od, do in zip(granice[:-1], granice[1:])]
+        for zadanie in zadania:
+            zadanie.result()
+    return wyjscie
+
+
+def filtruj(sygnal, fs: float, lpf: float = None, hpf: float = None, rzad: int = 4,
+            zerofazowo: bool = True, rozmiar_bloku: int = ROZMIAR_BLOKU, wyjscie=None, watki: int = None):
+    """
+    Kaskada LPF + HPF w jednym przejściu (zerofazowo lub przyczynowo), wszystkie kanały
+    naraz (patrz filtruj_wielokanalowo). Bez filtrów – kopia sygnału.
+    """
+    sos = kaskada(fs, lpf, hpf, rzad)
+    if sos is None:
+        if wyjscie is None:
+            return np.array(sygnal, dtype=np.float64)
+        wyjscie[...] = sygnal
+        return wyjscie
+    return filtruj_wielokanalowo(sygnal, sos, zerofazowo, rozmiar_bloku, wyjscie, watki)
@@ -0,0 +1,199 @@
+"""
+Filtracja FIR w dziedzinie częstotliwości (szybki splot FFT).
+
+- Splot blokami metodą overlap-save (domyślnie) lub overlap-add; wszystkie bloki
+  (w grupach ograniczających pamięć) w jednym wywołaniu rfft/irfft.
+- Rozmiar FFT dobierany automatycznie do długości filtru (minimalny koszt na próbkę).
+- Filtry o liniowej fazie (symetryczne) z kompensacją opóźnienia (M - 1) / 2 –
+  wynik zerofazowy, wyrównany w czasie z wejściem.
+- Filtr zaporowy (notch) dla sieci 50/60 Hz i jej harmonicznych.
+
+Sygnały: 1D (N,) lub 2D (N, kanaly); filtracja wzdłuż osi 0.
+Uruchomienie modułu: porównanie czasu z filtracją IIR (filtracja.filtruj_zerofazowo).
+"""
+
+import time
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin
+
+# Maksymalna liczba próbek widm bloków przetwarzanych naraz (ogranicza pamięć roboczą)
+MAX_PROBEK_GRUPY = 1 << 22
+METODY = ('ols', 'ola')
+
+
+def projekt_fir(typ: str, liczba_wspolczynnikow: int, odciecie, fs: float, okno: str = 'hamming'):
+    """
+    Filtr FIR metodą okien (scipy.signal.firwin); typ: 'low', 'high', 'bandpass', 'bandstop'.
+    Filtry górno- i pasmowozaporowe wymagają nieparzystej liczby współczynników.
+    Projekt z pamięci podręcznej (zwracana kopia).
+    """
+    odciecie = tuple(float(f) for f in np.atleast_1d(odciecie))
+    return _projekt_fir(typ, int(liczba_wspolczynnikow), odciecie, float(fs), okno).copy()
+
+
+@lru_cache(maxsize=64)
+def _projekt_fir(typ, liczba_wspolczynnikow, odciecie, fs, okno):
+    przepust_zera = {'low': True, 'bandstop': True, 'high': False, 'bandpass': False}
+    if typ not in przepust_zera:
+        raise ValueError(f"Nieznany typ filtru: {typ}")
+    h = firwin(liczba_wspolczynnikow, list(odciecie), window=okno, pass_zero=przepust_zera[typ], fs=fs)
+    h.flags.writeable = False
+    return h
+
+
+def projekt_pasmowy(fs: float, lpf: float = None, hpf: float = None, liczba_wspolczynnikow: int = 255):
+    """
+    Odpowiednik filtracja.kaskada dla FIR: pasmowoprzepustowy (hpf, lpf), dolno- lub
+    górnoprzepustowy, gdy podano jedno odcięcie. None, gdy nie podano żadnego.
+    """
+    liczba_wspolczynnikow = int(liczba_wspolczynnikow) | 1
+    if lpf and hpf:
+        return projekt_fir('bandpass', liczba_wspolczynnikow, (hpf, lpf), fs)
+    if lpf:
+        return projekt_fir('low', liczba_wspolczynnikow, lpf, fs)
+    if hpf:
+        return projekt_fir('high', liczba_wspolczynnikow, hpf, fs)
+    return None
+
+
+def projekt_notch(fs: float, f_sieci: float = 50.0, szerokosc: float = 2.0, harmoniczne: int = 1,
+                  liczba_wspolczynnikow: int = None):
+    """
+    FIR zaporowy dla f_sieci (50 lub 60 Hz) i harmoniczne - 1 kolejnych harmonicznych
+    poniżej Nyquista; szerokosc – szerokość pasma zaporowego [Hz].
+    Domyślna długość: ok. 4 * fs / szerokosc (nieparzysta).
+    """
+    pasma = []
+    for k in range(1, harmoniczne + 1):
+        f = k * f_sieci
+        if f + szerokosc / 2 >= fs / 2:
+            break
+        pasma += [f - szerokosc / 2, f + szerokosc / 2]
+    if not pasma:
+        raise ValueError("Częstotliwość sieci powyżej częstotliwości Nyquista.")
+    if liczba_wspolczynnikow is None:
+        liczba_wspolczynnikow = int(4 * fs / szerokosc)
+    liczba_wspolczynnikow |= 1
+    return projekt_fir('bandstop', liczba_wspolczynnikow, pasma, fs, okno='hamming')
+
+
+@lru_cache(maxsize=256)
+def dobierz_blok(dlugosc_filtru: int, dlugosc_sygnalu: int = None) -> int:
+    """
+    Rozmiar FFT (potęga 2) o najmniejszym koszcie nfft * log2(nfft) na próbkę wyjścia
+    (nfft - M + 1 próbek na blok); nie większy niż potrzeba dla całego sygnału.
+    """
+    M = dlugosc_filtru
+    najmniejszy = 1 << max(int(np.ceil(np.log2(2 * M - 1))), 4)
+    najwiekszy = najmniejszy << 10
+    if dlugosc_sygnalu is not None:
+        najwiekszy = max(najmniejszy, min(najwiekszy, 1 << int(np.ceil(np.log2(dlugosc_sygnalu + M - 1)))))
+    najlepszy, koszt_min = najmniejszy, np.inf
+    nfft = najmniejszy
+    while nfft <= najwiekszy:
+        koszt = nfft * np.log2(nfft) / (nfft - M + 1)
+        if koszt < koszt_min:
+            najlepszy, koszt_min = nfft, koszt
+        nfft <<= 1
+    return najlepszy
+
+
+def _grupy_blokow(liczba_blokow: int, nfft: int, kanaly: int):
+    na_grupe = max(1, MAX_PROBEK_GRUPY // (nfft * kanaly))
+    for start in range(0, liczba_blokow, na_grupe):
+        yield start, min(start + na_grupe, liczba_blokow)
+
+
+def splot_fft(x, h, nfft: int = None, metoda: str = 'ols'):
+    """
+    Pełny splot (N + M - 1 próbek) sygnału x (N,) / (N, kanaly) z filtrem h (M,),
+    liczony blokowo przez FFT. Wynik jak np.convolve(x, h) dla każdego kanału.
+    """
+    if metoda not in METODY:
+        raise ValueError(f"Nieznana metoda: {metoda}")
+    x = np.asarray(x, dtype=np.float64)
+    h = np.asarray(h, dtype=np.float64)
+    jednowymiarowy = x.ndim == 1
+    if jednowymiarowy:
+        x = x[:, None]
+    N, kanaly = x.shape
+    M = len(h)
+    nfft = nfft or dobierz_blok(M, N)
+    L = nfft - M + 1
+    if L <= 0 or (metoda == 'ola' and L < M - 1):
+        raise ValueError("Rozmiar FFT za mały dla tej długości filtru.")
+    H = np.fft.rfft(h, n=nfft)[None, :, None]
+    dlugosc = N + M - 1
+    liczba_blokow = -(-dlugosc // L)
+    wynik = np.empty((liczba_blokow * L, kanaly))
+
+    if metoda == 'ols':
+        # Wejście z M - 1 zerami na początku; blok b to x_ext[b*L : b*L + nfft],
+        # poprawne są ostatnie L próbek splotu kołowego
+        x_ext = np.zeros((M - 1 + liczba_blokow * L + (nfft - L), kanaly))
+        x_ext[M - 1:M - 1 + N] = x
+        bloki = sliding_window_view(x_ext, nfft, axis=0)[::L]    # (B, kanaly, nfft)
+        for od, do in _grupy_blokow(liczba_blokow, nfft, kanaly):
+            Y = np.fft.irfft(np.fft.rfft(bloki[od:do], axis=2) * H.transpose(0, 2, 1), n=nfft, axis=2)
+            wynik[od * L:do * L] = Y[:, :, M - 1:].transpose(0, 2, 1).reshape(-1, kanaly)
+    else:
+        # Overlap-add: bloki L próbek dopełnione do nfft, ogon M - 1 dodawany do następnego bloku
+        x_ext = np.zeros((liczba_blokow * L, kanaly))
+        x_ext[:N] = x
+        bloki = x_ext.reshape(liczba_blokow, L, kanaly)
+        wynik[:] = 0.0
+        ogon = None
+        for od, do in _grupy_blokow(liczba_blokow, nfft, kanaly):
+            Y = np.fft.irfft(np.fft.rfft(bloki[od:do], n=nfft, axis=1) * H, n=nfft, axis=1)
+            czesc = Y[:, :L].copy()
+            czesc[1:, :M - 1] += Y[:-1, L:L + M - 1]
+            if ogon is not None:
+                czesc[0, :M - 1] += ogon
+            ogon = Y[-1, L:L + M - 1]
+            wynik[od * L:do * L] = czesc.reshape(-1, kanaly)
+
+    wynik = wynik[:dlugosc]
+    return wynik[:, 0] if jednowymiarowy else wynik
+
+
+def filtruj_fir(x, h, zerofazowo: bool = True, nfft: int = None, metoda: str = 'ols'):
+    """
+    Filtracja FIR sygnału (długość wyniku = długość wejścia).
+    zerofazowo – dla filtru symetrycznego (liniowa faza) wynik przesunięty o (M - 1) / 2,
+                 czyli bez opóźnienia względem wejścia; w przeciwnym razie filtr przyczynowy.
+    """
+    N = len(x)
+    y = splot_fft(x, h, nfft, metoda)
+    przesuniecie = (len(h) - 1) // 2 if zerofazowo else 0
+    return y[przesuniecie:przesuniecie + N]
+
+
+def _zmierz(funkcja, powtorzenia: int = 3):
+    najlepszy = np.inf
+    for _ in range(powtorzenia):
+        start = time.perf_counter()
+        funkcja()
+        najlepszy = min(najlepszy, time.perf_counter() - start)
+    return najlepszy
+
+
+if __name__ == "__main__":
+    # Porównanie: FIR przez FFT (overlap-save), FIR splotem bezpośrednim i IIR (SOS, w przód i wstecz)
+    from filtracja import kaskada, filtruj_zerofazowo
+
+    fs = 360
+    rng = np.random.default_rng(0)
+    sos = kaskada(fs, lpf=60, hpf=5, rzad=4)
+    print(f"{'N':>9} {'M':>6} {'nfft':>7} {'FIR-FFT [ms]':>13} {'FIR-splot [ms]':>15} {'IIR [ms]':>9}")
+    for N in (10_000, 100_000, 1_000_000):
+        x = rng.standard_normal(N)
+        t_iir = _zmierz(lambda: filtruj_zerofazowo(x, sos))
+        for M in (31, 255, 1441):
+            h = projekt_fir('bandpass', M, (5, 60), fs)
+            t_fft = _zmierz(lambda: filtruj_fir(x, h))
+            t_bezp = _zmierz(lambda: np.convolve(x, h), 1) if N * M <= 2e8 else np.nan
+            print(f"{N:9d} {M:6d} {dobierz_blok(M, N):7d} {t_fft * 1000:13.2f} {t_bezp * 1000:15.2f} "
+                  f"{t_iir * 1000:9.2f}")
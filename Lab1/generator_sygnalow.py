@@ -0,0 +1,146 @@
+"""
+Wektorowy generator pakietów sygnałów syntetycznych.
+
+Pakiet to jedna tablica (B, N): wiersz b jest sumą składowych opisanych w
+opisy[b] – tonów, chirpów (liniowa zmiana częstotliwości), szumu gaussowskiego
+i szablonu EKG. Składowe liczone są naraz dla wszystkich sygnałów:
+- tony: iloczyn zewnętrzny częstotliwości (B,) i osi czasu (N,),
+- chirpy i EKG: akumulator fazy (np.cumsum częstotliwości chwilowej po osi czasu),
+a pętle biegną co najwyżej po składowych, nigdy po sygnałach.
+
+Obliczenia prowadzone są w float64 blokami wierszy (WIERSZE_BLOKU), a wynik
+zapisywany wprost do tablicy docelowej – z dtype=np.float32 pakiet zajmuje
+połowę pamięci, a faza nie traci dokładności.
+
+Przykład opisu jednego sygnału:
+    {'tony': [(50, 1.0), (60, 0.5, np.pi / 4)],   # (f [Hz], amplituda[, faza])
+     'chirpy': [(10, 200, 0.3)],                   # (f_start, f_koniec, amplituda)
+     'szum': 0.1,                                  # odchylenie standardowe
+     'ekg': (72, 1.0)}                             # (tętno [ud./min], amplituda)
+"""
+
+import time
+import numpy as np
+
+WIERSZE_BLOKU = 64
+
+# Załamki P, Q, R, S, T: położenie na cyklu [rad], amplituda, szerokość [rad]
+# (model sumy funkcji Gaussa, jak w generatorze ECGSYN)
+FALE_EKG = np.array([
+    [-np.pi / 3, 0.12, 0.25],
+    [-np.pi / 12, -0.15, 0.1],
+    [0.0, 1.0, 0.1],
+    [np.pi / 12, -0.25, 0.1],
+    [np.pi / 2, 0.3, 0.4],
+])
+
+
+def _wyrownaj(listy, szerokosc):
+    """Lista list krotek o różnej długości -> tablica (B, K, szerokosc) dopełniona zerami."""
+    B = len(listy)
+    K = max((len(l) for l in listy), default=0)
+    wynik = np.zeros((B, K, szerokosc))
+    for b, skladowe in enumerate(listy):
+        for k, s in enumerate(skladowe):
+            wynik[b, k, :len(s)] = s
+    return wynik
+
+
+def dodaj_tony(wyjscie, czestotliwosci, amplitudy, fazy, t):
+    """wyjscie (B, N) += sum_k a[:, k] * sin(2 pi f[:, k] t + faza[:, k]); f, a, faza: (B, K)."""
+    for k in range(czestotliwosci.shape[1]):
+        if not np.any(amplitudy[:, k]):
+            continue
+        faza = np.multiply.outer(2 * np.pi * czestotliwosci[:, k], t)
+        faza += fazy[:, k, None]
+        wyjscie += amplitudy[:, k, None] * np.sin(faza)
+
+
+def dodaj_chirpy(wyjscie, f_start, f_koniec, amplitudy, fs):
+    """
+    Chirpy liniowe f_start -> f_koniec na całej długości sygnału.
+    Faza z akumulatora: 2 pi / fs * skumulowana (trapezami) f_chwilowa.
+    """
+    N = wyjscie.shape[1]
+    postep = np.arange(N) / max(N - 1, 1)
+    for k in range(f_start.shape[1]):
+        if not np.any(amplitudy[:, k]):
+            continue
+        f_chwilowa = f_start[:, k, None] + np.multiply.outer(f_koniec[:, k] - f_start[:, k], postep)
+        # Całkowanie metodą trapezów: faza zerowa w pierwszej próbce
+        faza = np.cumsum(f_chwilowa, axis=1)
+        faza -= 0.5 * (f_chwilowa + f_chwilowa[:, :1])
+        faza *= 2 * np.pi / fs
+        wyjscie += amplitudy[:, k, None] * np.sin(faza)
+
+
+def dodaj_ekg(wyjscie, tetno, amplitudy, fs):
+    """
+    Szablon EKG: faza cyklu serca z akumulatora (tętno/60 Hz), na której
+    rozmieszczone są załamki FALE_EKG jako funkcje Gaussa.
+    """
+    N = wyjscie.shape[1]
+    faza = np.multiply.outer(2 * np.pi * tetno / 60 / fs, np.arange(N))
+    # Cykl zaczyna się w połowie odstępu T-P, a nie na załamku R
+    faza += np.pi
+    faza = np.mod(faza, 2 * np.pi) - np.pi
+    ekg = np.zeros_like(faza)
+    for theta, a, szer in FALE_EKG:
+        d = faza - theta
+        ekg += a * np.exp(-d * d / (2 * szer * szer))
+    wyjscie += amplitudy[:, None] * ekg
+
+
+def generuj_pakiet(opisy, N: int, fs: float, dtype=np.float64, ziarno=None):
+    """
+    Generuje pakiet (len(opisy), N) sygnałów o częstotliwości próbkowania fs.
+    opisy – lista słowników (klucze 'tony', 'chirpy', 'szum', 'ekg'; patrz opis modułu),
+    dtype – np.float64 lub np.float32,
+    ziarno – ziarno generatora szumu (powtarzalne pakiety).
+    """
+    B = len(opisy)
+    wynik = np.empty((B, N), dtype=dtype)
+    t = np.arange(N) / fs
+    rng = np.random.default_rng(ziarno)
+
+    tony = _wyrownaj([o.get('tony', ()) for o in opisy], 3)
+    chirpy = _wyrownaj([o.get('chirpy', ()) for o in opisy], 3)
+    szum = np.array([o.get('szum', 0.0) for o in opisy], dtype=np.float64)
+    ekg = np.array([o.get('ekg', (0.0, 0.0)) for o in opisy], dtype=np.float64).reshape(B, 2)
+
+    for start in range(0, B, WIERSZE_BLOKU):
+        w = slice(start, min(start + WIERSZE_BLOKU, B))
+        blok = np.zeros((w.stop - w.start, N))
+        dodaj_tony(blok, tony[w, :, 0], tony[w, :, 1], tony[w, :, 2], t)
+        dodaj_chirpy(blok, chirpy[w, :, 0], chirpy[w, :, 1], chirpy[w, :, 2], fs)
+        if np.any(ekg[w, 1]):
+            dodaj_ekg(blok, ekg[w, 0], ekg[w, 1], fs)
+        if np.any(szum[w]):
+            blok += szum[w, None] * rng.standard_normal(blok.shape)
+        wynik[w] = blok
+    return wynik
+
+
+def pakiet_tonow(czestotliwosci, liczba_sygnalow: int, krok_hz: float = 0.0, szum: float = 0.0):
+    """
+    Opisy pakietu, w którym sygnał i to suma tonów czestotliwosci przesuniętych
+    o i * krok_hz (amplituda 1), z szumem o odchyleniu szum.
+    """
+    return [{'tony': [(f + i * krok_hz, 1.0) for f in czestotliwosci], 'szum': szum}
+            for i in range(liczba_sygnalow)]
+
+
+if __name__ == "__main__":
+    # Pomiar: generacja pakietu i widma wszystkich sygnałów jednym rfft
+    fs, N = 1000, 65536
+    for B in (16, 128):
+        opisy = pakiet_tonow((50, 60), B, krok_hz=1.0, szum=0.1)
+        for dtype in (np.float64, np.float32):
+            start = time.perf_counter()
+            pakiet = generuj_pakiet(opisy, N, fs, dtype=dtype, ziarno=0)
+            czas_gen = time.perf_counter() - start
+            start = time.perf_counter()
+            np.abs(np.fft.rfft(pakiet, axis=1))
+            czas_fft = time.perf_counter() - start
+            print(f"B={B:4d} {np.dtype(dtype).name:8s} {pakiet.nbytes / 2**20:7.1f} MiB  "
+                  f"generacja {czas_gen * 1000:7.1f} ms  rfft {czas_fft * 1000:7.1f} ms")
@@ -3,6 +3,9 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 import numpy as np
 import matplotlib.pyplot as plt
 
+from spektrogram import Spektrogram
+from widmo import SerwisWidma, BuforyRekonstrukcji
+
 class ECGFFTApp(tk.Tk):
     def __init__(self, filename, fs):
         super().__init__()
@@ -15,15 +18,25 @@ class ECGFFTApp(tk.Tk):
         self.signal = np.loadtxt(self.filename)
         self.N = len(self.signal)
         self.t = np.arange(self.N) / self.fs
-        self.freqs = np.fft.fftfreq(self.N, d=1/self.fs)
-        self.half = self.N // 2
 
         self.plot_frame = tk.Frame(self)
         self.plot_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
-        self.fig, self.axs = plt.subplots(2, 2, figsize=(10, 8))
+        # Siatka 2x2 (sygnał, widmo, iFFT, różnica) + spektrogram na całą szerokość
+        self.fig = plt.figure(figsize=(10, 10))
+        siatka = self.fig.add_gridspec(3, 2)
+        self.axs = [[self.fig.add_subplot(siatka[i, j]) for j in range(2)] for i in range(2)]
+        self.ax_spektrogram = self.fig.add_subplot(siatka[2, :])
         self.fig.tight_layout(pad=4.0)
 
+        # Ramki STFT liczone przyrostowo – tworzony ponownie tylko przy zmianie okna/kroku
+        self.spektrogram = None
+        # Widma fragmentów zapamiętywane po (plik, zakres, parametry)
+        self.serwis_widma = SerwisWidma(pojemnosc=64)
+        # Rekonstrukcja iFFT liczona tylko na żądanie, w buforach używanych ponownie
+        self.bufory_rekonstrukcji = BuforyRekonstrukcji()
+        self.zakres = None
+
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -50,6 +63,27 @@ class ECGFFTApp(tk.Tk):
         self.range_btn = tk.Button(self.bottom_controls, text="Zastosuj zakres", command=self.run_analysis)
         self.range_btn.pack(side=tk.LEFT, padx=5)
 
+        tk.Label(self.bottom_controls, text="STFT: okno").pack(side=tk.LEFT)
+        self.window_entry = tk.Entry(self.bottom_controls, width=6)
+        self.window_entry.insert(0, "256")
+        self.window_entry.pack(side=tk.LEFT)
+
+        tk.Label(self.bottom_controls, text="krok").pack(side=tk.LEFT)
+        self.hop_entry = tk.Entry(self.bottom_controls, width=6)
+        self.hop_entry.insert(0, "64")
+        self.hop_entry.pack(side=tk.LEFT)
+
+        self.welch_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(self.bottom_controls, text="Welch, segment [s]:",
+                       variable=self.welch_var).pack(side=tk.LEFT, padx=(10, 0))
+        self.segment_entry = tk.Entry(self.bottom_controls, width=6)
+        self.segment_entry.insert(0, "2.0")
+        self.segment_entry.pack(side=tk.LEFT)
+
+        self.reconstruction_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.bottom_controls, text="Rekonstrukcja iFFT", variable=self.reconstruction_var,
+                       command=self.on_toggle_reconstruction).pack(side=tk.LEFT, padx=(10, 0))
+
     def run_analysis(self):
         try:
             time_start = float(self.start_entry.get())
@@ -67,12 +101,7 @@ class ECGFFTApp(tk.Tk):
 
         signal = self.signal[idx_start:idx_end]
         t = np.arange(idx_start, idx_end) / self.fs
-        fft_vals = np.fft.fft(signal)
-        amplitude = np.abs(fft_vals)
-        freqs = np.fft.fftfreq(len(signal), d=1/self.fs)
-        half = len(signal) // 2
-        reconstructed = np.fft.ifft(fft_vals).real
-        difference = signal - reconstructed
+        self.zakres = (idx_start, idx_end)
 
         # 1. Oryginalny sygnał
         self.axs[0][0].clear()
@@ -82,31 +111,114 @@ class ECGFFTApp(tk.Tk):
         self.axs[0][0].set_ylabel("Amplituda")
         self.axs[0][0].grid(True)
 
-        # 2. Widmo amplitudowe
-        self.axs[0][1].clear()
-        self.axs[0][1].plot(freqs[:half], amplitude[:half])
-        self.axs[0][1].set_title("Widmo amplitudowe")
-        self.axs[0][1].set_xlabel("Częstotliwość [Hz]")
-        self.axs[0][1].set_ylabel("Amplituda")
-        self.axs[0][1].grid(True)
+        # 2. Widmo: gęstość mocy (Welch) lub widmo amplitudowe całego zakresu
+        self.plot_spectrum(idx_start, idx_end)
+
+        # 3-4. Rekonstrukcja i różnica – tylko gdy włączone
+        self.plot_reconstruction(idx_start, idx_end)
+
+        # 5. Spektrogram
+        self.plot_spectrogram(idx_start, idx_end)
+
+        self.canvas.draw()
+
+    def on_toggle_reconstruction(self):
+        if self.zakres is None:
+            return
+        self.plot_reconstruction(*self.zakres)
+        self.canvas.draw()
+
+    def plot_reconstruction(self, idx_start, idx_end):
+        """Panele 'po odwrotnej FFT' i 'różnica' (rfft/irfft) – liczone tylko po zaznaczeniu opcji."""
+        ax_rek, ax_roz = self.axs[1][0], self.axs[1][1]
+        ax_rek.clear()
+        ax_roz.clear()
+        if not self.reconstruction_var.get():
+            for ax in (ax_rek, ax_roz):
+                ax.text(0.5, 0.5, "Zaznacz \"Rekonstrukcja iFFT\"", ha='center', va='center',
+                        transform=ax.transAxes)
+                ax.set_xticks([])
+                ax.set_yticks([])
+            return
+
+        t = np.arange(idx_start, idx_end) / self.fs
+        reconstructed, difference = self.bufory_rekonstrukcji.rekonstruuj(self.signal[idx_start:idx_end])
 
         # 3. Sygnał po iFFT
-        self.axs[1][0].clear()
-        self.axs[1][0].plot(t, reconstructed)
-        self.axs[1][0].set_title("Sygnał po odwrotnej FFT")
-        self.axs[1][0].set_xlabel("Czas [s]")
-        self.axs[1][0].set_ylabel("Amplituda")
-        self.axs[1][0].grid(True)
+        ax_rek.plot(t, reconstructed)
+        ax_rek.set_title("Sygnał po odwrotnej FFT")
+        ax_rek.set_xlabel("Czas [s]")
+        ax_rek.set_ylabel("Amplituda")
+        ax_rek.grid(True)
 
         # 4. Różnica
-        self.axs[1][1].clear()
-        self.axs[1][1].plot(t, difference)
-        self.axs[1][1].set_title("Różnica (oryginalny - ifft)")
-        self.axs[1][1].set_xlabel("Czas [s]")
-        self.axs[1][1].set_ylabel("Amplituda")
-        self.axs[1][1].grid(True)
+        ax_roz.plot(t, difference)
+        ax_roz.set_title("Różnica (oryginalny - ifft)")
+        ax_roz.set_xlabel("Czas [s]")
+        ax_roz.set_ylabel("Amplituda")
+        ax_roz.grid(True)
+
+    def plot_spectrum(self, idx_start, idx_end):
+        """
+        Widmo zakresu [idx_start, idx_end) z pamięci podręcznej serwisu widma.
+        Welch: segmenty z nakładaniem 50%, okno Hanninga, usunięty trend liniowy.
+        Bez Welcha: |rfft| z dopełnieniem zerami do szybkiej długości FFT.
+        """
+        ax = self.axs[0][1]
+        ax.clear()
+        ax.set_xlabel("Częstotliwość [Hz]")
+        ax.grid(True)
+
+        if self.welch_var.get():
+            try:
+                dlugosc_segmentu = int(float(self.segment_entry.get()) * self.fs)
+            except ValueError:
+                print("Długość segmentu musi być liczbą.")
+                return
+            if dlugosc_segmentu < 2:
+                print("Segment Welcha jest za krótki.")
+                return
+            freqs, psd = self.serwis_widma.widmo_fragmentu(
+                self.filename, self.signal, idx_start, idx_end, self.fs, metoda='welch',
+                dlugosc_segmentu=dlugosc_segmentu, trend='liniowy')
+            ax.semilogy(freqs, psd)
+            ax.set_title("Widmowa gęstość mocy (Welch)")
+            ax.set_ylabel("PSD [j.²/Hz]")
+        else:
+            freqs, amplitude = self.serwis_widma.widmo_fragmentu(
+                self.filename, self.signal, idx_start, idx_end, self.fs, metoda='amplituda')
+            ax.plot(freqs, amplitude)
+            ax.set_title("Widmo amplitudowe")
+            ax.set_ylabel("Amplituda")
+
+    def plot_spectrogram(self, idx_start, idx_end):
+        """Spektrogram zakresu [idx_start, idx_end); liczone są tylko ramki jeszcze nieobliczone."""
+        try:
+            dlugosc_okna = int(self.window_entry.get())
+            krok = int(self.hop_entry.get())
+        except ValueError:
+            print("Okno i krok STFT muszą być liczbami całkowitymi.")
+            return
+        if dlugosc_okna <= 0 or krok <= 0:
+            print("Okno i krok STFT muszą być dodatnie.")
+            return
 
-        self.canvas.draw()
+        if self.spektrogram is None or self.spektrogram.parametry()[:2] != (dlugosc_okna, krok):
+            self.spektrogram = Spektrogram(self.signal, self.fs, dlugosc_okna, krok)
+        czasy, freqs, S = self.spektrogram.zakres(idx_start, idx_end)
+
+        ax = self.ax_spektrogram
+        ax.clear()
+        ax.set_title("Spektrogram (STFT, okno Hanninga)")
+        ax.set_xlabel("Czas [s]")
+        ax.set_ylabel("Częstotliwość [Hz]")
+        if len(czasy) == 0:
+            ax.text(0.5, 0.5, "Zakres krótszy niż okno STFT", ha='center', va='center',
+                    transform=ax.transAxes)
+            return
+        polowa_kroku = krok / self.fs / 2
+        ax.imshow(20 * np.log10(S.T + 1e-12), origin='lower', aspect='auto', cmap='viridis',
+                  extent=(czasy[0] - polowa_kroku, czasy[-1] + polowa_kroku, freqs[0], freqs[-1]))
 
 
 def main():
@@ -2,111 +2,20 @@ import tkinter as tk
 from tkinter import filedialog
 import numpy as np
 import os
+import time
+
+from platforma import PlatformaEKG
+from ekg_lod import PiramidaMinMax, decymuj
+from ekg_live import BuforPierscieniowy, Akwizycja, ZrodloOdtwarzanie, MiernikOpoznien
 
 # Matplotlib – kluczowe elementy do osadzenia wykresu i toolbaru w tkinter
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 
-class PlatformaEKG:
-    """
-    Klasa umożliwiająca wczytywanie i obsługę sygnałów EKG z plików tekstowych.
-    """
-
-    def __init__(self):
-        self.sygnaly = None   # Tablica 2D: (liczba_prob, liczba_kanalow)
-        self.t = None         # Wektor czasu (jeśli występuje lub sztucznie generowany)
-        self.fs = None        # Częstotliwość próbkowania
-        self.nazwa_pliku = None
-
-    def wczytaj_plik(self, sciezka_pliku: str):
-        self.nazwa_pliku = os.path.basename(sciezka_pliku)
-        dane = np.loadtxt(sciezka_pliku)
-
-        # Reset stanu
-        self.sygnaly = None
-        self.t = None
-        self.fs = None
-
-        # Rozpoznawanie formatu
-        if self.nazwa_pliku == 'ekg1.txt':
-            # 12 kanałów, fs=1000
-            self.fs = 1000
-            self.sygnaly = dane
-            liczba_probek = self.sygnaly.shape[0]
-            self.t = np.arange(liczba_probek) / self.fs
-
-        elif self.nazwa_pliku == 'ekg100.txt':
-            # 1 kolumna, fs=360
-            self.fs = 360
-            self.sygnaly = dane.reshape(-1, 1)
-            liczba_probek = self.sygnaly.shape[0]
-            self.t = np.arange(liczba_probek) / self.fs
-
-        elif self.nazwa_pliku == 'ekg_noise.txt':
-            # 2 kolumny: [czas, amplituda], fs=360
-            self.fs = 360
-            self.t = dane[:, 0]
-            self.sygnaly = dane[:, 1].reshape(-1, 1)
-
-        else:
-            # Automatyczne rozpoznawanie
-            kolumny = dane.shape[1]
-            if kolumny == 1:
-                # fs=360
-                self.fs = 360
-                self.sygnaly = dane.reshape(-1, 1)
-                liczba_probek = self.sygnaly.shape[0]
-                self.t = np.arange(liczba_probek) / self.fs
-            elif kolumny == 2:
-                # [czas, sygnał]
-                self.fs = 360
-                self.t = dane[:, 0]
-                self.sygnaly = dane[:, 1].reshape(-1, 1)
-            else:
-                # Wiele kanałów -> fs=1000
-                self.fs = 1000
-                self.sygnaly = dane
-                liczba_probek = self.sygnaly.shape[0]
-                self.t = np.arange(liczba_probek) / self.fs
-
-        print(f"Wczytano plik: {self.nazwa_pliku}")
-        if self.sygnaly is not None:
-            print(f"Kształt sygnału: {self.sygnaly.shape}, fs={self.fs} Hz")
-
-    def pobierz_calosc(self):
-        """Zwraca (t, sygnaly) – całość danych."""
-        return self.t, self.sygnaly
-
-    def zapisz_fragment_do_pliku(self, czas_start: float, czas_koniec: float, sciezka_wyj: str):
-        """
-        Zapisuje wycinek sygnału w [czas_start, czas_koniec] do pliku.
-        """
-        if self.sygnaly is None or self.t is None:
-            print("Brak wczytanego sygnału!")
-            return
-
-        if czas_start < 0:
-            czas_start = 0.0
-        if czas_koniec <= czas_start:
-            print("Błędny zakres czasu do zapisu!")
-            return
-
-        idx_start = np.searchsorted(self.t, czas_start)
-        idx_koniec = np.searchsorted(self.t, czas_koniec)
-        idx_start = max(idx_start, 0)
-        idx_koniec = min(idx_koniec, len(self.t))
-
-        if idx_start >= idx_koniec:
-            print("Przedział czasu wykracza poza dane.")
-            return
-
-        t_fragment = self.t[idx_start:idx_koniec]
-        sygnal_fragment = self.sygnaly[idx_start:idx_koniec, :]
-
-        # Montujemy do jednej macierzy: [czas, amplitudy...]
-        dane_do_zapisu = np.column_stack((t_fragment, sygnal_fragment))
-        np.savetxt(sciezka_wyj, dane_do_zapisu, fmt='%.6f')
-        print(f"Zapisano fragment do pliku: {sciezka_wyj}")
+# Tryb na żywo
+OKNO_NA_ZYWO_S = 10.0   # szerokość przewijanego okna
+BUFOR_NA_ZYWO_S = 60.0  # pojemność bufora pierścieniowego (zapas na serie próbek)
+KLATKI_NA_S = 30
 
 class EKGApp(tk.Tk):
     """
@@ -118,6 +27,16 @@ class EKGApp(tk.Tk):
         self.geometry("1000x700")
 
         self.platforma = PlatformaEKG()
+        self.piramida = None   # PiramidaMinMax dla wczytanego sygnału
+        self.linie = []        # Trwałe linie wykresu (po jednej na kanał)
+        self.tlo = None        # Buforowane statyczne tło (osie, siatka, opisy) do blitowania
+        self._bez_callbacku = False
+
+        # Tryb na żywo
+        self.akwizycja = None
+        self.bufor = None
+        self.miernik = None
+        self._id_klatki = None
 
         # Ramka na górne przyciski
         self.top_frame = tk.Frame(self)
@@ -143,6 +62,10 @@ class EKGApp(tk.Tk):
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.plot_frame)
         self.toolbar.update()
 
+        # Pan/zoom -> ponowne zapytanie LOD; pełne rysowanie -> odświeżenie bufora tła
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
         # Pola wejściowe do zapisu fragmentu
         tk.Label(self.top_frame, text="Plik wyjściowy:").pack(side=tk.LEFT, padx=5)
         self.entry_outfile = tk.Entry(self.top_frame, width=20)
@@ -166,35 +89,37 @@ class EKGApp(tk.Tk):
         btn_show = tk.Button(self.top_frame, text="Pokaż fragment", command=self._on_show_fragment)
         btn_show.pack(side=tk.LEFT, padx=5)
 
+        btn_live = tk.Button(self.top_frame, text="Na żywo", command=self._on_start_live)
+        btn_live.pack(side=tk.LEFT, padx=5)
+
+        btn_stop = tk.Button(self.top_frame, text="Stop", command=self._zatrzymaj_na_zywo)
+        btn_stop.pack(side=tk.LEFT, padx=5)
+
+        self.label_opoznienie = tk.Label(self.top_frame, text="")
+        self.label_opoznienie.pack(side=tk.LEFT, padx=5)
+
     def _on_load_file(self):
         """Wczytanie pliku i narysowanie przebiegu na wykresie."""
         file_path = filedialog.askopenfilename(
             title="Wybierz plik EKG",
-            filetypes=[("Pliki tekstowe", "*.txt"), ("Wszystkie pliki", "*.*")]
+            filetypes=[("Pliki tekstowe", "*.txt"), ("Kontener EKG", "*.ekgb"), ("Wszystkie pliki", "*.*")]
         )
         if file_path:
-            self.platforma.wczytaj_plik(file_path)
+            self._zatrzymaj_na_zywo()
+            self.platforma.wczytaj_plik(file_path, postep=self._pokaz_postep_wczytywania)
+            self.title("Platforma EKG - interaktywny pan & zoom")
             self._narysuj_caly_sygnal()
 
+    def _pokaz_postep_wczytywania(self, ulamek):
+        """Postęp wczytywania dużego pliku w pasku tytułu."""
+        self.title(f"Platforma EKG - wczytywanie {ulamek * 100:.0f}%")
+        self.update_idletasks()
+
     def _narysuj_caly_sygnal(self):
         """Rysuje całą dostępną długość sygnału (lub sygnałów) w osi czasu."""
         t, sygnaly = self.platforma.pobierz_calosc()
-        self.ax.clear()
-
         if t is not None and sygnaly is not None:
-            if sygnaly.shape[1] == 1:
-                # Pojedynczy kanał
-                self.ax.plot(t, sygnaly[:, 0], label="EKG")
-            else:
-                # Wiele kanałów
-                for i in range(sygnaly.shape[1]):
-                    self.ax.plot(t, sygnaly[:, i], label=f"Ch {i+1}")
-                self.ax.legend()
-
-        self.ax.set_title("Wykres EKG")
-        self.ax.set_xlabel("Czas [s]")
-        self.ax.set_ylabel("Amplituda")
-        self.canvas.draw()
+            self._narysuj_lod(t[0], t[-1], "Wykres EKG", etykieta_1kanal="EKG")
 
     def _narysuj_fragment_sygnalu(self, czas_start, czas_end):
         """Rysuje wycinek sygnału między czas_start a czas_end."""
@@ -202,27 +127,187 @@ class EKGApp(tk.Tk):
         if t is None or sygnaly is None:
             return
 
-        idx_start = np.searchsorted(t, czas_start)
-        idx_end = np.searchsorted(t, czas_end)
-        idx_start = max(0, idx_start)
-        idx_end = min(len(t), idx_end)
+        self._narysuj_lod(czas_start, czas_end, f"Fragment EKG: {czas_start:.2f}s – {czas_end:.2f}s",
+                          etykieta_1kanal="Fragment EKG")
 
-        t_fragment = t[idx_start:idx_end]
-        s_fragment = sygnaly[idx_start:idx_end, :]
+    def _narysuj_lod(self, czas_start, czas_end, tytul, etykieta_1kanal):
+        """
+        Rysuje zakres [czas_start, czas_end] z piramidy min/max – co najwyżej
+        ~2 punkty na piksel szerokości osi, niezależnie od długości nagrania.
+        Linie są trwałe (set_data); pełne przerysowanie tylko przy zmianie osi/tytułu.
+        """
+        sygnaly = self.platforma.sygnaly
+        if self.piramida is None or self.piramida.sygnaly is not sygnaly:
+            self.piramida = PiramidaMinMax(sygnaly)
 
-        self.ax.clear()
-        if s_fragment.shape[1] == 1:
-            self.ax.plot(t_fragment, s_fragment[:, 0], label="Fragment EKG")
+        if sygnaly.shape[1] == 1:
+            etykiety = [etykieta_1kanal]
         else:
-            for i in range(s_fragment.shape[1]):
-                self.ax.plot(t_fragment, s_fragment[:, i], label=f"Ch {i+1}")
+            etykiety = [f"Ch {i+1}" for i in range(sygnaly.shape[1])]
+        self._przygotuj_linie(etykiety)
+
+        self._aktualizuj_lod(czas_start, czas_end)
+        y_min, y_max = self._zakres_y()
+
+        statyczne_przed = (self.ax.get_title(), self.ax.get_xlim(), self.ax.get_ylim())
+        self._bez_callbacku = True
+        try:
+            self.ax.set_title(tytul)
+            self.ax.set_xlim(czas_start, czas_end)
+            self.ax.set_ylim(y_min, y_max)
+        finally:
+            self._bez_callbacku = False
+
+        if statyczne_przed == (self.ax.get_title(), self.ax.get_xlim(), self.ax.get_ylim()) \
+                and self.tlo is not None:
+            self._blit()
+        else:
+            # Zmiana tła (osie, tytuł) – pełne rysowanie, linie dorysuje _on_draw
+            self.canvas.draw()
+
+    def _przygotuj_linie(self, etykiety):
+        """Tworzy linie (po jednej na kanał) i legendę tylko przy zmianie zestawu kanałów."""
+        if [linia.get_label() for linia in self.linie] == etykiety:
+            return
+
+        for linia in self.linie:
+            linia.remove()
+        self.linie = []
+        for i, etykieta in enumerate(etykiety):
+            # animated=True – linie nie trafiają do buforowanego tła, rysujemy je blitem
+            linia, = self.ax.plot([], [], label=etykieta, color=f"C{i % 10}", animated=True)
+            self.linie.append(linia)
+
+        legenda = self.ax.get_legend()
+        if legenda is not None:
+            legenda.remove()
+        if len(etykiety) > 1:
             self.ax.legend()
+        self.tlo = None
+
+    def _zakres_y(self):
+        """Zakres osi Y z 5% marginesem na podstawie danych linii."""
+        dane = [linia.get_ydata() for linia in self.linie if len(linia.get_ydata())]
+        if not dane:
+            return self.ax.get_ylim()
+        y_min = min(np.min(y) for y in dane)
+        y_max = max(np.max(y) for y in dane)
+        margines = 0.05 * (y_max - y_min) or 1.0
+        return y_min - margines, y_max + margines
+
+    def _on_draw(self, event):
+        """Po pełnym rysowaniu: zapamiętanie statycznego tła i dorysowanie linii."""
+        if not self.canvas.supports_blit:
+            return
+        self.tlo = self.canvas.copy_from_bbox(self.fig.bbox)
+        for linia in self.linie:
+            self.ax.draw_artist(linia)
+
+    def _blit(self):
+        """Odtworzenie tła z bufora i narysowanie samych linii."""
+        self.canvas.restore_region(self.tlo)
+        for linia in self.linie:
+            self.ax.draw_artist(linia)
+        self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
+
+    def _aktualizuj_lod(self, czas_start, czas_end):
+        """Pobiera z piramidy punkty dla widocznego zakresu i podmienia dane linii."""
+        t = self.platforma.t
+        idx_start = max(self.platforma.indeks_czasu(czas_start) - 1, 0)
+        idx_end = self.platforma.indeks_czasu(czas_end) + 1
+
+        max_punktow = 2 * max(int(self.ax.bbox.width), 100)
+        indeksy, wartosci = self.piramida.zapytanie(idx_start, idx_end, max_punktow)
+        t_lod = t[indeksy]
+        for i, linia in enumerate(self.linie):
+            linia.set_data(t_lod, wartosci[:, i])
+
+    def _on_xlim_changed(self, ax):
+        """Pan/zoom z paska narzędzi – ponowne zapytanie piramidy dla nowego zakresu osi X."""
+        if self._bez_callbacku or self.piramida is None or not self.linie:
+            return
+        czas_start, czas_end = ax.get_xlim()
+        self._aktualizuj_lod(czas_start, czas_end)
+        self.canvas.draw_idle()
 
-        self.ax.set_title(f"Fragment EKG: {czas_start:.2f}s – {czas_end:.2f}s")
-        self.ax.set_xlabel("Czas [s]")
-        self.ax.set_ylabel("Amplituda")
+    def _on_start_live(self):
+        """Tryb na żywo: odtwarzanie wybranego pliku w rzeczywistym tempie fs."""
+        file_path = filedialog.askopenfilename(
+            title="Plik EKG do odtworzenia na żywo",
+            filetypes=[("Pliki tekstowe", "*.txt"), ("Kontener EKG", "*.ekgb"), ("Wszystkie pliki", "*.*")]
+        )
+        if file_path:
+            self._uruchom_na_zywo(ZrodloOdtwarzanie.z_pliku(file_path))
+
+    def _uruchom_na_zywo(self, zrodlo):
+        """Uruchamia akwizycję z dowolnego źródła (ekg_live.ZrodloProbek) i przewijany podgląd."""
+        self._zatrzymaj_na_zywo()
+
+        self.bufor = BuforPierscieniowy(int(BUFOR_NA_ZYWO_S * zrodlo.fs), zrodlo.liczba_kanalow)
+        self.akwizycja = Akwizycja(zrodlo, self.bufor)
+        self.miernik = MiernikOpoznien()
+        self.fs_na_zywo = zrodlo.fs
+        self.piramida = None
+
+        if zrodlo.liczba_kanalow == 1:
+            etykiety = ["EKG"]
+        else:
+            etykiety = [f"Ch {i+1}" for i in range(zrodlo.liczba_kanalow)]
+        self._przygotuj_linie(etykiety)
+        for linia in self.linie:
+            linia.set_data([], [])
+
+        # Oś X w sekundach względem najnowszej próbki – tło się nie zmienia, klatki to sam blit
+        self._bez_callbacku = True
+        try:
+            self.ax.set_title("EKG na żywo")
+            self.ax.set_xlim(-OKNO_NA_ZYWO_S, 0)
+        finally:
+            self._bez_callbacku = False
         self.canvas.draw()
 
+        self.akwizycja.uruchom()
+        self._klatka()
+
+    def _klatka(self):
+        """Jedna klatka przewijanego wykresu (wywoływana co 1/KLATKI_NA_S s w wątku Tk)."""
+        dane, koniec, czasy = self.bufor.ostatnie(int(OKNO_NA_ZYWO_S * self.fs_na_zywo))
+        if len(dane):
+            max_punktow = 2 * max(int(self.ax.bbox.width), 100)
+            indeksy, wartosci = decymuj(dane, max_punktow)
+            t = (indeksy - len(dane) + 1) / self.fs_na_zywo
+            for i, linia in enumerate(self.linie):
+                linia.set_data(t, wartosci[:, i])
+
+            y_min, y_max = self.ax.get_ylim()
+            if wartosci.min() < y_min or wartosci.max() > y_max:
+                self.ax.set_ylim(*self._zakres_y())
+                self.canvas.draw()
+            elif self.tlo is not None:
+                self._blit()
+
+            # Opóźnienie: przybycie najnowszej próbki -> narysowanie klatki
+            self.miernik.dodaj(time.perf_counter() - czasy[-1])
+            self.miernik.utracone = self.bufor.pominiete
+            if self.miernik.liczba % KLATKI_NA_S == 0:
+                ostatnie, mediana, maks = self.miernik.podsumowanie()
+                tekst = f"Opóźnienie: {ostatnie * 1000:.1f} ms (mediana {mediana * 1000:.1f}, maks {maks * 1000:.1f})"
+                if self.miernik.utracone:
+                    tekst += f", utracone próbki: {self.miernik.utracone}"
+                self.label_opoznienie.config(text=tekst)
+
+        self._id_klatki = self.after(int(1000 / KLATKI_NA_S), self._klatka)
+
+    def _zatrzymaj_na_zywo(self):
+        """Zatrzymuje akwizycję i przewijanie."""
+        if self._id_klatki is not None:
+            self.after_cancel(self._id_klatki)
+            self._id_klatki = None
+        if self.akwizycja is not None:
+            self.akwizycja.zatrzymaj()
+            self.akwizycja = None
+
     def _on_show_fragment(self):
         """Wyświetla fragment sygnału (bez zapisywania)."""
         start_txt = self.entry_start.get().strip()
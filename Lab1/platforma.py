@@ -0,0 +1,237 @@
+import numpy as np
+import os
+
+import ekg_bin
+import ekg_eksport
+import ekg_epoki
+from ekg_czas import OsCzasuRownomierna, OsCzasuJawna, os_z_wektora
+from ekg_txt import wczytaj_txt
+
+# Warstwa danych platformy EKG – bez zależności od tkinter/matplotlib,
+# importowana zarówno przez GUI (main.py), jak i wsadowe CLI (ekg_cli.py).
+
+class PlatformaEKG:
+    """
+    Klasa umożliwiająca wczytywanie i obsługę sygnałów EKG z plików tekstowych.
+    """
+
+    def __init__(self):
+        self.sygnaly = None   # Tablica 2D: (liczba_prob, liczba_kanalow)
+        self.t = None         # Oś czasu: leniwa t0 + i/fs lub jawny wektor (ekg_czas)
+        self.fs = None        # Częstotliwość próbkowania
+        self.nazwa_pliku = None
+
+    def wczytaj_plik(self, sciezka_pliku: str, postep=None, anuluj=None):
+        """
+        Wczytuje plik EKG (tekstowy lub kontener EKGB).
+        postep/anuluj – patrz ekg_txt.wczytaj_txt (tylko pliki tekstowe).
+        """
+        self.nazwa_pliku = os.path.basename(sciezka_pliku)
+
+        # Kontener binarny – dane mapowane z dysku, bez parsowania tekstu
+        if ekg_bin.czy_plik_bin(sciezka_pliku):
+            self._wczytaj_bin(sciezka_pliku)
+            return
+
+        # Strumieniowy parser blokowy – liczba kolumn ustalana na pierwszym bloku
+        dane = wczytaj_txt(sciezka_pliku, postep=postep, anuluj=anuluj)
+
+        # Reset stanu
+        self.sygnaly = None
+        self.t = None
+        self.fs = None
+
+        # Rozpoznawanie formatu
+        if self.nazwa_pliku == 'ekg1.txt':
+            # 12 kanałów, fs=1000
+            self.fs = 1000
+            self.sygnaly = dane
+            self.t = OsCzasuRownomierna(0.0, self.fs, self.sygnaly.shape[0])
+
+        elif self.nazwa_pliku == 'ekg100.txt':
+            # 1 kolumna, fs=360
+            self.fs = 360
+            self.sygnaly = dane.reshape(-1, 1)
+            self.t = OsCzasuRownomierna(0.0, self.fs, self.sygnaly.shape[0])
+
+        elif self.nazwa_pliku == 'ekg_noise.txt':
+            # 2 kolumny: [czas, amplituda], fs=360
+            self.fs = 360
+            self._ustaw_czas_i_sygnal(dane)
+
+        else:
+            # Automatyczne rozpoznawanie
+            kolumny = dane.shape[1]
+            if kolumny == 1:
+                # fs=360
+                self.fs = 360
+                self.sygnaly = dane.reshape(-1, 1)
+                self.t = OsCzasuRownomierna(0.0, self.fs, self.sygnaly.shape[0])
+            elif kolumny == 2:
+                # [czas, sygnał]
+                self.fs = 360
+                self._ustaw_czas_i_sygnal(dane)
+            else:
+                # Wiele kanałów -> fs=1000
+                self.fs = 1000
+                self.sygnaly = dane
+                self.t = OsCzasuRownomierna(0.0, self.fs, self.sygnaly.shape[0])
+
+        self._wypisz_podsumowanie()
+
+    def _ustaw_czas_i_sygnal(self, dane):
+        """
+        Pliki [czas, sygnał]. Jeśli kolumna czasu leży na siatce t0 + i/fs, oś jest leniwa,
+        a kolumna czasu zwalniana; wektor czasu zostaje tylko dla nierównych odstępów.
+        """
+        self.t = os_z_wektora(dane[:, 0], self.fs)
+        if isinstance(self.t, OsCzasuRownomierna):
+            self.sygnaly = np.ascontiguousarray(dane[:, 1:2])
+        else:
+            self.sygnaly = dane[:, 1].reshape(-1, 1)
+
+    def _wczytaj_bin(self, sciezka_pliku: str):
+        """Otwiera kontener EKGB przez np.memmap – ładowane są tylko odczytywane strony."""
+        kontener = ekg_bin.otworz(sciezka_pliku)
+        self.fs = kontener['fs']
+        self.sygnaly = kontener['sygnaly']
+        if kontener['polityka'] == ekg_bin.CZAS_JAWNY:
+            self.t = OsCzasuJawna(kontener['t'])
+        else:
+            self.t = OsCzasuRownomierna(kontener['t0'], self.fs, self.sygnaly.shape[0])
+        self._wypisz_podsumowanie()
+
+    def _wypisz_podsumowanie(self):
+        print(f"Wczytano plik: {self.nazwa_pliku}")
+        if self.sygnaly is not None:
+            print(f"Kształt sygnału: {self.sygnaly.shape}, fs={self.fs} Hz")
+
+    def zapisz_binarnie(self, sciezka_wyj: str):
+        """
+        Zapisuje wczytany sygnał do kontenera EKGB (jednorazowa konwersja z formatu tekstowego).
+        Czas generowany z fs nie jest zapisywany – tylko jawna kolumna czasu z pliku.
+        """
+        if self.sygnaly is None:
+            print("Brak wczytanego sygnału!")
+            return
+
+        if isinstance(self.t, OsCzasuRownomierna):
+            ekg_bin.zapisz(sciezka_wyj, self.sygnaly, self.fs, t0=self.t.t0)
+        else:
+            ekg_bin.zapisz(sciezka_wyj, self.sygnaly, self.fs, t=np.asarray(self.t))
+        print(f"Zapisano kontener binarny: {sciezka_wyj}")
+
+    def pobierz_calosc(self):
+        """Zwraca (t, sygnaly) – całość danych."""
+        return self.t, self.sygnaly
+
+    def indeks_czasu(self, czas):
+        """Indeks pierwszej próbki o czasie >= czas (skalar lub tablica) – O(1) dla osi równomiernej."""
+        return self.t.indeks(czas)
+
+    def _indeksy_zakresu(self, czas_start, czas_koniec):
+        """Indeksy próbek [idx_start, idx_koniec) dla czasów (skalary lub tablice)."""
+        idx_start = self.indeks_czasu(czas_start)
+        idx_koniec = self.indeks_czasu(czas_koniec)
+        return np.maximum(idx_start, 0), np.minimum(idx_koniec, len(self.t))
+
+    def zapisz_fragment_do_pliku(self, czas_start: float, czas_koniec: float, sciezka_wyj: str, format: str = None):
+        """
+        Zapisuje wycinek sygnału w [czas_start, czas_koniec] do pliku.
+        Format (txt/npy/raw/ekgb) domyślnie wynika z rozszerzenia pliku.
+        """
+        if self.sygnaly is None or self.t is None:
+            print("Brak wczytanego sygnału!")
+            return
+
+        if czas_start < 0:
+            czas_start = 0.0
+        if czas_koniec <= czas_start:
+            print("Błędny zakres czasu do zapisu!")
+            return
+
+        idx_start, idx_koniec = self._indeksy_zakresu(czas_start, czas_koniec)
+
+        if idx_start >= idx_koniec:
+            print("Przedział czasu wykracza poza dane.")
+            return
+
+        format = format or ekg_eksport.format_z_rozszerzenia(sciezka_wyj)
+        ekg_eksport.zapisz_fragment(self.t, self.sygnaly, int(idx_start), int(idx_koniec), sciezka_wyj,
+                                    format, fs=self.fs)
+        print(f"Zapisano fragment do pliku: {sciezka_wyj}")
+
+    def zapisz_fragmenty(self, czasy_start, czasy_koniec, wzorzec_sciezki: str, format: str = None):
+        """
+        Zapisuje wiele wycinków jednym przebiegiem po danych.
+        wzorzec_sciezki – np. "fragment_{i}.txt" (i – numer zakresu). Puste zakresy są pomijane.
+        """
+        if self.sygnaly is None or self.t is None:
+            print("Brak wczytanego sygnału!")
+            return []
+
+        czasy_start = np.maximum(np.asarray(czasy_start, dtype=float), 0.0)
+        czasy_koniec = np.asarray(czasy_koniec, dtype=float)
+        idx_start, idx_koniec = self._indeksy_zakresu(czasy_start, czasy_koniec)
+
+        niepuste = idx_start < idx_koniec
+        if not np.all(niepuste):
+            print(f"Pominięto {np.count_nonzero(~niepuste)} pustych zakresów.")
+
+        format = format or ekg_eksport.format_z_rozszerzenia(wzorzec_sciezki)
+        sciezki = [wzorzec_sciezki.format(i=i) for i in np.flatnonzero(niepuste)]
+        ekg_eksport.zapisz_fragmenty(self.t, self.sygnaly, idx_start[niepuste], idx_koniec[niepuste],
+                                     sciezki, format, fs=self.fs)
+        print(f"Zapisano {len(sciezki)} fragmentów.")
+        return sciezki
+
+    def wytnij_epoki(self, czasy_zdarzen, przed_s: float, po_s: float, korekta_bazowa=None,
+                     brzegi: str = 'nan', widok: bool = False):
+        """
+        Wycina okna [zdarzenie - przed_s, zdarzenie + po_s) wokół wielu zdarzeń naraz.
+        korekta_bazowa – (od_s, do_s) względem zdarzenia, np. (-0.5, -0.3); musi leżeć
+                         w oknie [-przed_s, po_s) (sprawdza ekg_epoki.wytnij_epoki – ValueError).
+        Zwraca (epoki, t_okna, maska) – epoki (N, okno, kanaly), t_okna – czas względem
+        zdarzenia, maska – które zdarzenia zachowano (patrz ekg_epoki.wytnij_epoki).
+        """
+        if self.sygnaly is None or self.t is None:
+            print("Brak wczytanego sygnału!")
+            return None
+
+        przed = int(round(przed_s * self.fs))
+        po = int(round(po_s * self.fs))
+        idx_zdarzen = self.indeks_czasu(np.asarray(czasy_zdarzen, dtype=float))
+
+        baza = None
+        if korekta_bazowa is not None:
+            od_s, do_s = korekta_bazowa
+            baza = (przed + int(round(od_s * self.fs)), przed + int(round(do_s * self.fs)))
+
+        epoki, maska = ekg_epoki.wytnij_epoki(self.sygnaly, idx_zdarzen, przed, po, brzegi=brzegi,
+                                              korekta_bazowa=baza, widok=widok)
+        t_okna = (np.arange(przed + po) - przed) / self.fs
+        return epoki, t_okna, maska
+
+    def filtruj(self, lpf: float = None, hpf: float = None, rzad: int = 4, zerofazowo: bool = True,
+                watki: int = None):
+        """
+        Kaskada Butterworth LPF + HPF dla wszystkich kanałów naraz (wzdłuż osi 0),
+        kanały rozdzielane na wątki. Zwraca przefiltrowaną tablicę (liczba_probek, kanaly).
+        """
+        if self.sygnaly is None:
+            print("Brak wczytanego sygnału!")
+            return None
+        # scipy importowane dopiero przy pierwszej filtracji
+        import filtracja
+        return filtracja.filtruj(self.sygnaly, self.fs, lpf, hpf, rzad, zerofazowo=zerofazowo, watki=watki)
+
+    def wykryj_uderzenia(self, kanal: int = 0):
+        """
+        Załamki R i tętno dla wybranego kanału (detekcja_qrs.tetno).
+        Zwraca słownik: indeksy, czasy, rr, czasy_rr, tetno, tetno_srednie.
+        """
+        if self.sygnaly is None or self.t is None:
+            print("Brak wczytanego sygnału!")
+            return None
+        import detekcja_qrs
+        return detekcja_qrs.tetno(self.sygnaly[:, kanal], self.fs, t0=float(self.t[0]))
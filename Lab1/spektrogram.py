@@ -0,0 +1,92 @@
+"""
+Krótkoczasowa transformata Fouriera (STFT) / spektrogram.
+
+- Ramki to widok sliding_window_view(sygnal, dlugosc_okna)[::krok] – bez kopii
+  sygnału; kopiowane są tylko ramki faktycznie liczone (mnożenie przez okno).
+- Wszystkie ramki liczone jednym wywołaniem rfft (axis=1).
+- Wynik (moduł widma) w float32.
+- Klasa Spektrogram pamięta już policzone ramki: rozszerzenie zakresu czasu
+  liczy tylko ramki, których jeszcze nie było.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from widmo import okno_czasowe
+
+
+def widok_ramek(sygnal, dlugosc_okna: int, krok: int):
+    """Widok (liczba_ramek, dlugosc_okna) na sygnał 1D, ramka k zaczyna się w próbce k * krok."""
+    sygnal = np.asarray(sygnal)
+    if len(sygnal) < dlugosc_okna:
+        return np.empty((0, dlugosc_okna), dtype=sygnal.dtype)
+    return sliding_window_view(sygnal, dlugosc_okna)[::krok]
+
+
+def stft(sygnal, fs: float, dlugosc_okna: int = 256, krok: int = 64, okno: str = 'hann', dtype=np.float32):
+    """
+    Spektrogram całego sygnału. Zwraca (czasy, freqs, S):
+    czasy – środki ramek [s], freqs – oś rfft [Hz], S – |rfft| (liczba_ramek, dlugosc_okna // 2 + 1).
+    """
+    ramki = widok_ramek(np.asarray(sygnal, dtype=dtype), dlugosc_okna, krok)
+    S = np.abs(np.fft.rfft(ramki * okno_czasowe(dlugosc_okna, okno).astype(dtype), axis=1))
+    czasy = (np.arange(len(ramki)) * krok + dlugosc_okna / 2) / fs
+    return czasy, np.fft.rfftfreq(dlugosc_okna, d=1 / fs), S.astype(dtype, copy=False)
+
+
+class Spektrogram:
+    """
+    Spektrogram długiego sygnału liczony przyrostowo.
+    Ramki liczone są na żądanie (metoda zakres) i zapamiętywane w jednej tablicy
+    (liczba_wszystkich_ramek, liczba_czestotliwosci) typu float32.
+    """
+
+    def __init__(self, sygnal, fs: float, dlugosc_okna: int = 256, krok: int = 64,
+                 okno: str = 'hann', dtype=np.float32):
+        if dlugosc_okna <= 0 or krok <= 0:
+            raise ValueError("Długość okna i krok muszą być dodatnie.")
+        self.fs = fs
+        self.dlugosc_okna = int(dlugosc_okna)
+        self.krok = int(krok)
+        self.okno = okno
+        self.dtype = np.dtype(dtype)
+        self.sygnal = np.asarray(sygnal, dtype=self.dtype)
+        self.ramki = widok_ramek(self.sygnal, self.dlugosc_okna, self.krok)
+        self.freqs = np.fft.rfftfreq(self.dlugosc_okna, d=1 / fs)
+        self._okno = okno_czasowe(self.dlugosc_okna, okno).astype(self.dtype)
+        self._S = None          # alokowane przy pierwszym zapytaniu
+        self._policzone = np.zeros(len(self.ramki), dtype=bool)
+        self.policzone_ramki = 0
+
+    def parametry(self):
+        return (self.dlugosc_okna, self.krok, self.okno, self.dtype.str)
+
+    def indeksy_ramek(self, idx_start: int, idx_koniec: int):
+        """Zakres ramek [k0, k1) mieszczących się całkowicie w próbkach [idx_start, idx_koniec)."""
+        k0 = -(-max(idx_start, 0) // self.krok)
+        k1 = (min(idx_koniec, len(self.sygnal)) - self.dlugosc_okna) // self.krok + 1
+        k1 = min(max(k1, k0), len(self.ramki))
+        return k0, k1
+
+    def zakres(self, idx_start: int, idx_koniec: int):
+        """
+        Spektrogram dla próbek [idx_start, idx_koniec). Zwraca (czasy, freqs, S);
+        S to widok na pamięć obiektu (nie modyfikować).
+        """
+        k0, k1 = self.indeksy_ramek(idx_start, idx_koniec)
+        if self._S is None:
+            self._S = np.empty((len(self.ramki), len(self.freqs)), dtype=self.dtype)
+
+        brakujace = np.flatnonzero(~self._policzone[k0:k1]) + k0
+        if len(brakujace):
+            # Kopiowane są tylko nowe ramki; jedno rfft dla wszystkich
+            if brakujace[-1] - brakujace[0] + 1 == len(brakujace):
+                nowe = self.ramki[brakujace[0]:brakujace[-1] + 1]
+            else:
+                nowe = self.ramki[brakujace]
+            self._S[brakujace] = np.abs(np.fft.rfft(nowe * self._okno, axis=1))
+            self._policzone[brakujace] = True
+            self.policzone_ramki += len(brakujace)
+
+        czasy = (np.arange(k0, k1) * self.krok + self.dlugosc_okna / 2) / self.fs
+        return czasy, self.freqs, self._S[k0:k1]
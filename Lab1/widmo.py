@@ -0,0 +1,215 @@
+"""
+Serwis widm amplitudowych z pamięcią podręczną.
+
+- FFT dla sygnałów rzeczywistych (rfft) – bez nadmiarowej ujemnej połowy widma.
+- Osie częstotliwości (rfftfreq) i okna czasowe buforowane po (N, fs, okno).
+- Widma zapamiętywane po parametrach sygnału z wypieraniem LRU, więc ponowna
+  analiza z tymi samymi parametrami (lub sama zmiana zakresu osi) nie liczy FFT.
+- Estymacja widmowej gęstości mocy metodą Welcha (segmenty z nakładaniem,
+  usuwanie trendu, długość FFT dopełniana do "szybkiej" – iloczynu 2, 3 i 5).
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@lru_cache(maxsize=32)
+def os_czestotliwosci(N: int, fs: float):
+    """Oś częstotliwości rfft (tylko do odczytu – współdzielona między wywołaniami)."""
+    freqs = np.fft.rfftfreq(N, d=1 / fs)
+    freqs.flags.writeable = False
+    return freqs
+
+
+@lru_cache(maxsize=32)
+def os_czasu(N: int, fs: float):
+    """Wektor czasu np.arange(N) / fs (tylko do odczytu)."""
+    t = np.arange(N) / fs
+    t.flags.writeable = False
+    return t
+
+
+@lru_cache(maxsize=32)
+def okno_czasowe(N: int, okno: str = 'prostokatne'):
+    """Okno czasowe długości N: 'prostokatne', 'hann', 'hamming', 'blackman' (tylko do odczytu)."""
+    if okno == 'prostokatne':
+        w = np.ones(N)
+    elif okno == 'hann':
+        w = np.hanning(N)
+    elif okno == 'hamming':
+        w = np.hamming(N)
+    elif okno == 'blackman':
+        w = np.blackman(N)
+    else:
+        raise ValueError(f"Nieznane okno: {okno}")
+    w.flags.writeable = False
+    return w
+
+
+def widmo_amplitudowe(sygnal, okno: str = 'prostokatne'):
+    """|rfft(sygnal * okno)| wzdłuż ostatniej osi."""
+    sygnal = np.asarray(sygnal)
+    if okno != 'prostokatne':
+        sygnal = sygnal * okno_czasowe(sygnal.shape[-1], okno)
+    return np.abs(np.fft.rfft(sygnal, axis=-1))
+
+
+@lru_cache(maxsize=256)
+def szybka_dlugosc(n: int) -> int:
+    """Najmniejsza długość >= n będąca iloczynem potęg 2, 3 i 5 (szybka ścieżka FFT)."""
+    if n <= 6:
+        return max(n, 1)
+    najlepsza = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < najlepsza:
+        p35 = p5
+        while p35 < najlepsza:
+            # Najmniejsza potęga 2 dopełniająca p35 do >= n
+            iloraz = -(-n // p35)
+            kandydat = p35 * (1 << (iloraz - 1).bit_length())
+            najlepsza = min(najlepsza, kandydat)
+            p35 *= 3
+        p5 *= 5
+    return najlepsza
+
+
+def usun_trend(segmenty, trend: str = 'staly'):
+    """
+    Usuwa trend z każdego wiersza (segmenty: (liczba_segmentow, L)), wektorowo.
+    trend: 'staly' (średnia), 'liniowy' (prosta MNK) lub None.
+    """
+    if trend is None:
+        return segmenty
+    if trend == 'staly':
+        return segmenty - segmenty.mean(axis=-1, keepdims=True)
+    if trend == 'liniowy':
+        L = segmenty.shape[-1]
+        x = np.arange(L) - (L - 1) / 2
+        srednia = segmenty.mean(axis=-1, keepdims=True)
+        nachylenie = (segmenty @ x)[..., None] / (x @ x) if L > 1 else 0.0
+        return segmenty - srednia - nachylenie * x
+    raise ValueError(f"Nieznany trend: {trend}")
+
+
+@lru_cache(maxsize=32)
+def _okno_hann_okresowe(N: int):
+    """Okno Hanninga w wersji okresowej (jak scipy.signal.get_window('hann', N)) – do estymacji widma."""
+    w = np.hanning(N + 1)[:-1]
+    w.flags.writeable = False
+    return w
+
+
+def welch(sygnal, fs: float, dlugosc_segmentu: int = 256, nakladanie: int = None, okno: str = 'hann',
+          trend: str = 'staly', nfft: int = None):
+    """
+    Widmowa gęstość mocy metodą Welcha (jednostronna, skalowanie jak scipy.signal.welch
+    z scaling='density'). Segmenty to widok bez kopii, wszystkie FFT w jednym rfft.
+    nakladanie – domyślnie połowa segmentu; nfft – domyślnie szybka_dlugosc(dlugosc_segmentu).
+    Zwraca (freqs, psd).
+    """
+    sygnal = np.asarray(sygnal, dtype=np.float64)
+    dlugosc_segmentu = min(int(dlugosc_segmentu), len(sygnal))
+    if dlugosc_segmentu <= 0:
+        raise ValueError("Pusty sygnał.")
+    if nakladanie is None:
+        nakladanie = dlugosc_segmentu // 2
+    krok = dlugosc_segmentu - nakladanie
+    if krok <= 0:
+        raise ValueError("Nakładanie musi być mniejsze od długości segmentu.")
+    nfft = nfft or szybka_dlugosc(dlugosc_segmentu)
+
+    segmenty = sliding_window_view(sygnal, dlugosc_segmentu)[::krok]
+    w = okno_czasowe(dlugosc_segmentu, okno) if okno != 'hann' else _okno_hann_okresowe(dlugosc_segmentu)
+    widma = np.fft.rfft(usun_trend(segmenty, trend) * w, n=nfft, axis=1)
+    psd = np.mean(widma.real ** 2 + widma.imag ** 2, axis=0) / (fs * (w @ w))
+    # Widmo jednostronne: podwajamy wszystko poza składową stałą (i Nyquistem dla parzystego nfft)
+    psd[1:nfft // 2 + nfft % 2] *= 2
+    return os_czestotliwosci(nfft, fs), psd
+
+
+class SerwisWidma:
+    """
+    Pamięć podręczna sygnałów i ich widm: klucz to parametry sygnału (np. krotka
+    częstotliwości), N, fs i okno albo – dla fragmentów plików – (plik, zakres,
+    parametry estymacji). Najdawniej używane wpisy są usuwane po przekroczeniu pojemnosc.
+    """
+
+    def __init__(self, pojemnosc: int = 16):
+        self.pojemnosc = pojemnosc
+        self._widma = OrderedDict()
+        self.trafienia = 0
+        self.chybienia = 0
+
+    def widmo(self, parametry_sygnalu, N: int, fs: float, generuj, okno: str = 'prostokatne'):
+        """
+        Zwraca (t, sygnal, freqs, amplituda). generuj(t) tworzy sygnał tylko przy
+        chybieniu; parametry_sygnalu musi być hashowalny i jednoznacznie opisywać sygnał.
+        """
+        def oblicz():
+            sygnal = np.asarray(generuj(os_czasu(N, fs)))
+            return sygnal, widmo_amplitudowe(sygnal, okno)
+
+        sygnal, amplituda = self._z_pamieci((parametry_sygnalu, N, fs, okno), oblicz)
+        return os_czasu(N, fs), sygnal, os_czestotliwosci(N, fs), amplituda
+
+    def widmo_fragmentu(self, zrodlo, sygnal, idx_start: int, idx_koniec: int, fs: float,
+                        metoda: str = 'welch', **parametry):
+        """
+        Widmo fragmentu sygnal[idx_start:idx_koniec]; zrodlo (np. nazwa pliku) identyfikuje sygnał.
+        metoda 'welch' – (freqs, psd) z funkcji welch(**parametry),
+        metoda 'amplituda' – (freqs, |rfft|) z dopełnieniem do szybka_dlugosc.
+        """
+        klucz = (zrodlo, idx_start, idx_koniec, fs, metoda, tuple(sorted(parametry.items())))
+
+        def oblicz():
+            fragment = np.asarray(sygnal[idx_start:idx_koniec], dtype=np.float64)
+            if metoda == 'welch':
+                return welch(fragment, fs, **parametry)
+            if metoda == 'amplituda':
+                n = szybka_dlugosc(len(fragment))
+                return os_czestotliwosci(n, fs), np.abs(np.fft.rfft(fragment, n=n))
+            raise ValueError(f"Nieznana metoda: {metoda}")
+
+        return self._z_pamieci(klucz, oblicz)
+
+    def _z_pamieci(self, klucz, oblicz):
+        wpis = self._widma.get(klucz)
+        if wpis is not None:
+            self._widma.move_to_end(klucz)
+            self.trafienia += 1
+            return wpis
+        self.chybienia += 1
+        wpis = oblicz()
+        for tablica in wpis:
+            tablica.flags.writeable = False
+        self._widma[klucz] = wpis
+        if len(self._widma) > self.pojemnosc:
+            self._widma.popitem(last=False)
+        return wpis
+
+
+class BuforyRekonstrukcji:
+    """
+    Rekonstrukcja irfft(rfft(x)) i różnica x - rekonstrukcja w buforach używanych
+    ponownie między wywołaniami (realokacja tylko, gdy fragment jest dłuższy niż dotąd).
+    Zwracane tablice są widokami na bufory – ważne do następnego wywołania.
+    """
+
+    def __init__(self):
+        self._widmo = np.empty(0, dtype=np.complex128)
+        self._rekonstrukcja = np.empty(0)
+        self._roznica = np.empty(0)
+
+    def rekonstruuj(self, fragment):
+        fragment = np.asarray(fragment, dtype=np.float64)
+        n = len(fragment)
+        if n > len(self._rekonstrukcja):
+            self._widmo = np.empty(n // 2 + 1, dtype=np.complex128)
+            self._rekonstrukcja = np.empty(n)
+            self._roznica = np.empty(n)
+        widmo = np.fft.rfft(fragment, out=self._widmo[:n // 2 + 1])
+        rekonstrukcja = np.fft.irfft(widmo, n=n, out=self._rekonstrukcja[:n])
+        roznica = np.subtract(fragment, rekonstrukcja, out=self._roznica[:n])
+        return rekonstrukcja, roznica
@@ -3,12 +3,18 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 import numpy as np
 import matplotlib.pyplot as plt
 
+from widmo import SerwisWidma
+import generator_sygnalow
+
 class FFTAnalysisApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Analiza FFT (4 wykresy) + Pan/Zoom + wpisywanie zakresów dla sumy i widma")
         self.geometry("1400x800")
 
+        # Sygnały i widma zapamiętywane między kolejnymi analizami
+        self.serwis_widma = SerwisWidma()
+
         # Ramka z lewej (kontrolki) + ramka z prawej (plot)
         self.left_frame = tk.Frame(self)
         self.left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
@@ -101,6 +107,38 @@ class FFTAnalysisApp(tk.Tk):
                                  command=self.update_bottom_right_axes)
         btn_apply_br.pack(pady=5)
 
+        # --- GENERATOR PAKIETU: dowolny sygnał pakietu w dolnym wierszu ---
+        tk.Label(self.left_frame, text="[Pakiet sygnałów -> dolny wiersz]").pack(pady=5)
+
+        tk.Label(self.left_frame, text="Tony [Hz]:").pack()
+        self.entry_gen_tony = tk.Entry(self.left_frame, width=8)
+        self.entry_gen_tony.insert(0, "50,60")
+        self.entry_gen_tony.pack()
+
+        tk.Label(self.left_frame, text="Liczba / krok [Hz]:").pack()
+        self.entry_gen_liczba = tk.Entry(self.left_frame, width=8)
+        self.entry_gen_liczba.insert(0, "16")
+        self.entry_gen_liczba.pack()
+        self.entry_gen_krok = tk.Entry(self.left_frame, width=8)
+        self.entry_gen_krok.insert(0, "5.0")
+        self.entry_gen_krok.pack()
+
+        tk.Label(self.left_frame, text="Szum σ / nr sygnału:").pack()
+        self.entry_gen_szum = tk.Entry(self.left_frame, width=8)
+        self.entry_gen_szum.insert(0, "0.0")
+        self.entry_gen_szum.pack()
+        self.entry_gen_nr = tk.Entry(self.left_frame, width=8)
+        self.entry_gen_nr.insert(0, "0")
+        self.entry_gen_nr.pack()
+
+        btn_batch = tk.Button(self.left_frame, text="Pokaż sygnał z pakietu",
+                              command=self.show_batch_member)
+        btn_batch.pack(pady=5)
+
+        # Ostatnio wygenerowany pakiet (B, N) i jego parametry
+        self.pakiet = None
+        self.pakiet_parametry = None
+
         # Stworzenie figury 2x2 subploty
         self.fig, self.axs = plt.subplots(2, 2, figsize=(8, 6))
         self.fig.tight_layout(pad=4.0)
@@ -127,16 +165,11 @@ class FFTAnalysisApp(tk.Tk):
         """
         fs = 1000
         N = 65536
-        t = np.arange(N) / fs
 
         # --- GÓRNY WIERSZ: sin(50 Hz) ---
         freq1 = 50
-        y_sin = np.sin(2*np.pi*freq1*t)
-
-        fft_sin = np.fft.fft(y_sin)
-        amp_sin = np.abs(fft_sin)
-        freqs = np.fft.fftfreq(N, d=1/fs)
-        half = N // 2
+        t, y_sin, freqs, amp_sin = self.serwis_widma.widmo(
+            ('sin', (freq1,)), N, fs, lambda t: np.sin(2*np.pi*freq1*t))
 
         ax_tl = self.axs[0][0]
         ax_tr = self.axs[0][1]
@@ -150,7 +183,7 @@ class FFTAnalysisApp(tk.Tk):
         ax_tl.grid(True)
 
         ax_tr.clear()
-        ax_tr.plot(freqs[:half], amp_sin[:half], label="Widmo sin(50 Hz)")
+        ax_tr.plot(freqs, amp_sin, label="Widmo sin(50 Hz)")
         ax_tr.set_title("Widmo sin(50 Hz)", fontsize=10)
         ax_tr.set_xlabel("Częstotliwość [Hz]", fontsize=9)
         ax_tr.set_ylabel("Amplituda", fontsize=9)
@@ -159,10 +192,9 @@ class FFTAnalysisApp(tk.Tk):
 
         # --- DOLNY WIERSZ: suma(50 Hz + 60 Hz) ---
         freq2 = 60
-        y_mix = np.sin(2*np.pi*freq1*t) + np.sin(2*np.pi*freq2*t)
-
-        fft_mix = np.fft.fft(y_mix)
-        amp_mix = np.abs(fft_mix)
+        _, y_mix, _, amp_mix = self.serwis_widma.widmo(
+            ('sin', (freq1, freq2)), N, fs,
+            lambda t: np.sin(2*np.pi*freq1*t) + np.sin(2*np.pi*freq2*t))
 
         ax_bl = self.axs[1][0]
         ax_br = self.axs[1][1]
@@ -176,7 +208,7 @@ class FFTAnalysisApp(tk.Tk):
         ax_bl.grid(True)
 
         ax_br.clear()
-        ax_br.plot(freqs[:half], amp_mix[:half], label="Widmo sumy(50+60)")
+        ax_br.plot(freqs, amp_mix, label="Widmo sumy(50+60)")
         ax_br.set_title("Widmo sumy (50 + 60 Hz)", fontsize=10)
         ax_br.set_xlabel("Częstotliwość [Hz]", fontsize=9)
         ax_br.set_ylabel("Amplituda", fontsize=9)
@@ -185,6 +217,58 @@ class FFTAnalysisApp(tk.Tk):
 
         self.canvas.draw()
 
+    def show_batch_member(self):
+        """
+        Generuje (lub bierze z pamięci) pakiet sygnałów z pól generatora i rysuje
+        wybrany sygnał pakietu oraz jego widmo w dolnym wierszu.
+        """
+        fs = 1000
+        N = 65536
+
+        try:
+            tony = tuple(float(f) for f in self.entry_gen_tony.get().split(',') if f.strip())
+            liczba = int(self.entry_gen_liczba.get())
+            krok = float(self.entry_gen_krok.get())
+            szum = float(self.entry_gen_szum.get())
+            nr = int(self.entry_gen_nr.get())
+        except ValueError:
+            print("Błędny format wartości (generator)!")
+            return
+        if not 0 <= nr < liczba:
+            print(f"Numer sygnału poza pakietem (0..{liczba - 1})!")
+            return
+
+        parametry = (tony, liczba, krok, szum)
+        if parametry != self.pakiet_parametry:
+            opisy = generator_sygnalow.pakiet_tonow(tony, liczba, krok, szum)
+            self.pakiet = generator_sygnalow.generuj_pakiet(opisy, N, fs, dtype=np.float32, ziarno=0)
+            self.pakiet_parametry = parametry
+
+        t, y, freqs, amp = self.serwis_widma.widmo(
+            ('pakiet', parametry, nr), N, fs, lambda t: self.pakiet[nr])
+
+        ax_bl = self.axs[1][0]
+        ax_br = self.axs[1][1]
+        opis = "+".join(f"{f + nr * krok:g}" for f in tony)
+
+        ax_bl.clear()
+        ax_bl.plot(t, y, label=f"pakiet[{nr}]")
+        ax_bl.set_title(f"Sygnał {nr} pakietu ({opis} Hz) - czas", fontsize=10)
+        ax_bl.set_xlabel("Czas [s]", fontsize=9)
+        ax_bl.set_ylabel("Amplituda", fontsize=9)
+        ax_bl.legend()
+        ax_bl.grid(True)
+
+        ax_br.clear()
+        ax_br.plot(freqs, amp, label=f"Widmo pakiet[{nr}]")
+        ax_br.set_title(f"Widmo sygnału {nr} pakietu", fontsize=10)
+        ax_br.set_xlabel("Częstotliwość [Hz]", fontsize=9)
+        ax_br.set_ylabel("Amplituda", fontsize=9)
+        ax_br.legend()
+        ax_br.grid(True)
+
+        self.canvas.draw()
+
     def update_top_left_axes(self):
         """
         Odczytujemy pola [X min, X max, Y min, Y max] dla górnego lewego subplotu
@@ -1,66 +1,118 @@
+import os
+import queue
+import threading
 import tkinter as tk
+from collections import OrderedDict
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from scipy.signal import butter, filtfilt, freqz
-from scipy.fft import fft, fftfreq
+
+from filtracja import projekt_sos, filtruj_zerofazowo
+
+# Opóźnienie przeliczenia po ostatnim ruchu suwaka [ms] i okres sprawdzania wyników wątku
+OPOZNIENIE_MS = 150
+SPRAWDZANIE_MS = 30
+# Liczba zapamiętanych wyników każdego etapu (LPF, HPF)
+POJEMNOSC_ETAPU = 8
+
 
 class EKGFilterApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Filtracja sygnału EKG - Butterworth")
-        self.geometry("1200x800")
+        self.geometry("1200x900")
+
+        self.controls = tk.Frame(self)
+        self.controls.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
 
         self.fig, self.axs = plt.subplots(3, 2, figsize=(10, 8))
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Wyniki etapów: (lpf, rzad) -> po LPF, (lpf, hpf, rzad) -> po LPF + HPF
+        self._etap_lpf = OrderedDict()
+        self._etap_hpf = OrderedDict()
+        # Przeliczenia w wątku roboczym: numer zlecenia odrzuca nieaktualne wyniki
+        self._wyniki = queue.Queue()
+        self._numer_zlecenia = 0
+        self._id_opoznienia = None
+        self._id_sprawdzania = None
+        self._blokada_etapow = threading.Lock()
+
         self.load_and_filter_signal()
         self.plot_all()
+        self._zbuduj_suwaki()
 
     def load_and_filter_signal(self):
         # Wczytanie danych
         self.fs = 360
-        data = np.loadtxt("signals\\ekg_noise.txt")
+        data = np.loadtxt(os.path.join(os.path.dirname(os.path.abspath(__file__)), "signals", "ekg_noise.txt"))
         self.t = data[:, 0]
         self.signal = data[:, 1]
         self.N = len(self.signal)
-        self.freqs = fftfreq(self.N, d=1/self.fs)
-
-        # FFT oryginalnego sygnału
-        self.fft_orig = np.abs(fft(self.signal))
-
-        # Filtr LPF (60 Hz)
-        b_low, a_low = butter(4, 60 / (self.fs / 2), btype='low')
-        self.filtered_low = filtfilt(b_low, a_low, self.signal)
-        self.fft_low = np.abs(fft(self.filtered_low))
-        self.diff_low = self.signal - self.filtered_low
-        self.fft_diff_low = np.abs(fft(self.diff_low))
-
-        # Filtr HPF (5 Hz)
-        b_high, a_high = butter(4, 5 / (self.fs / 2), btype='high')
-        self.filtered_final = filtfilt(b_high, a_high, self.filtered_low)
-        self.fft_final = np.abs(fft(self.filtered_final))
+        self.freqs = np.fft.rfftfreq(self.N, d=1/self.fs)
+
+        # Widmo oryginału liczone raz; przy zmianie filtrów tylko widmo wyniku
+        self.widmo_orig = np.fft.rfft(self.signal)
+        self.fft_orig = np.abs(self.widmo_orig)
+
+        # LPF (60 Hz), potem HPF (5 Hz), oba zerofazowe w postaci SOS
+        self.filtered_final, self.fft_final, self.fft_diff_final = self.compute(60.0, 5.0, 4, True, True)
         self.diff_final = self.signal - self.filtered_final
-        self.fft_diff_final = np.abs(fft(self.diff_final))
+
+    def _z_etapu(self, pamiec, klucz, oblicz):
+        with self._blokada_etapow:
+            wynik = pamiec.get(klucz)
+            if wynik is not None:
+                pamiec.move_to_end(klucz)
+                return wynik
+        wynik = oblicz()
+        with self._blokada_etapow:
+            pamiec[klucz] = wynik
+            if len(pamiec) > POJEMNOSC_ETAPU:
+                pamiec.popitem(last=False)
+        return wynik
+
+    def compute(self, lpf, hpf, rzad, z_lpf=True, z_hpf=True):
+        """
+        Sygnał po filtrach i widma (wyniku i różnicy). Etapy liczone tylko, gdy
+        zmieniły się ich parametry: przy zmianie samego HPF wynik LPF brany jest z pamięci.
+        """
+        klucz_lpf = (lpf, rzad) if z_lpf else None
+        if z_lpf:
+            po_lpf = self._z_etapu(self._etap_lpf, klucz_lpf, lambda: filtruj_zerofazowo(
+                self.signal, projekt_sos('low', rzad, lpf, self.fs)))
+        else:
+            po_lpf = self.signal
+
+        if z_hpf:
+            wynik = self._z_etapu(self._etap_hpf, (klucz_lpf, hpf, rzad), lambda: filtruj_zerofazowo(
+                po_lpf, projekt_sos('high', rzad, hpf, self.fs)))
+        else:
+            wynik = po_lpf
+
+        widmo = np.fft.rfft(wynik)
+        return wynik, np.abs(widmo), np.abs(self.widmo_orig - widmo)
 
     def plot_all(self):
-        self.axs[0][0].plot(self.t, self.signal)
+        # Linie tworzone raz – przy zmianie parametrów aktualizowane są tylko dane
+        (self.line_orig,) = self.axs[0][0].plot(self.t, self.signal)
         self.axs[0][0].set_title("Oryginalny sygnał EKG")
 
-        self.axs[0][1].plot(self.freqs[:self.N // 2], self.fft_orig[:self.N // 2])
+        self.axs[0][1].plot(self.freqs, self.fft_orig)
         self.axs[0][1].set_title("Widmo oryginalnego sygnału")
 
-        self.axs[1][0].plot(self.t, self.filtered_final)
+        (self.line_final,) = self.axs[1][0].plot(self.t, self.filtered_final)
         self.axs[1][0].set_title("Po filtrach LPF + HPF")
 
-        self.axs[1][1].plot(self.freqs[:self.N // 2], self.fft_final[:self.N // 2])
+        (self.line_fft_final,) = self.axs[1][1].plot(self.freqs, self.fft_final)
         self.axs[1][1].set_title("Widmo po filtracji")
 
-        self.axs[2][0].plot(self.t, self.diff_final)
+        (self.line_diff,) = self.axs[2][0].plot(self.t, self.diff_final)
         self.axs[2][0].set_title("Różnica (oryginalny - końcowy)")
 
-        self.axs[2][1].plot(self.freqs[:self.N // 2], self.fft_diff_final[:self.N // 2])
+        (self.line_fft_diff,) = self.axs[2][1].plot(self.freqs, self.fft_diff_final)
         self.axs[2][1].set_title("Widmo różnicy")
 
         for ax in self.axs.flat:
@@ -71,6 +123,92 @@ class EKGFilterApp(tk.Tk):
         self.fig.tight_layout()
         self.canvas.draw()
 
+    def _zbuduj_suwaki(self):
+        nyquist = self.fs / 2
+        self.lpf_var = tk.DoubleVar(value=60.0)
+        self.hpf_var = tk.DoubleVar(value=5.0)
+        self.order_var = tk.IntVar(value=4)
+        self.lpf_on = tk.BooleanVar(value=True)
+        self.hpf_on = tk.BooleanVar(value=True)
+
+        tk.Checkbutton(self.controls, text="LPF [Hz]", variable=self.lpf_on,
+                       command=self.on_parameters_changed).pack(side=tk.LEFT)
+        tk.Scale(self.controls, variable=self.lpf_var, from_=1.0, to=nyquist - 1, resolution=0.5,
+                 orient=tk.HORIZONTAL, length=250, command=self.on_parameters_changed).pack(side=tk.LEFT)
+
+        tk.Checkbutton(self.controls, text="HPF [Hz]", variable=self.hpf_on,
+                       command=self.on_parameters_changed).pack(side=tk.LEFT, padx=(15, 0))
+        tk.Scale(self.controls, variable=self.hpf_var, from_=0.1, to=40.0, resolution=0.1,
+                 orient=tk.HORIZONTAL, length=250, command=self.on_parameters_changed).pack(side=tk.LEFT)
+
+        tk.Label(self.controls, text="Rząd").pack(side=tk.LEFT, padx=(15, 0))
+        tk.Scale(self.controls, variable=self.order_var, from_=1, to=10, orient=tk.HORIZONTAL,
+                 length=120, command=self.on_parameters_changed).pack(side=tk.LEFT)
+
+        self.status_label = tk.Label(self.controls, text="")
+        self.status_label.pack(side=tk.LEFT, padx=15)
+
+    def on_parameters_changed(self, *_):
+        """Odkłada przeliczenie do chwili, gdy suwak przestanie się ruszać."""
+        if self._id_opoznienia is not None:
+            self.after_cancel(self._id_opoznienia)
+        self._id_opoznienia = self.after(OPOZNIENIE_MS, self._zlec_przeliczenie)
+
+    def _zlec_przeliczenie(self):
+        self._id_opoznienia = None
+        lpf, hpf = self.lpf_var.get(), self.hpf_var.get()
+        z_lpf, z_hpf = self.lpf_on.get(), self.hpf_on.get()
+        rzad = self.order_var.get()
+        if z_lpf and z_hpf and hpf >= lpf:
+            self.status_label.config(text="HPF musi być niższy niż LPF")
+            return
+
+        self._numer_zlecenia += 1
+        numer = self._numer_zlecenia
+        self.status_label.config(text="Przeliczanie...")
+
+        def praca():
+            try:
+                wynik = self.compute(lpf, hpf, rzad, z_lpf, z_hpf)
+            except Exception as e:
+                wynik = e
+            self._wyniki.put((numer, wynik))
+
+        threading.Thread(target=praca, daemon=True).start()
+        if self._id_sprawdzania is None:
+            self._id_sprawdzania = self.after(SPRAWDZANIE_MS, self._sprawdz_wyniki)
+
+    def _sprawdz_wyniki(self):
+        """Odbiera wyniki wątku w wątku tkinter; starsze niż ostatnie zlecenie są pomijane."""
+        self._id_sprawdzania = None
+        najnowszy = None
+        while not self._wyniki.empty():
+            numer, wynik = self._wyniki.get_nowait()
+            if numer == self._numer_zlecenia:
+                najnowszy = wynik
+        if najnowszy is None:
+            self._id_sprawdzania = self.after(SPRAWDZANIE_MS, self._sprawdz_wyniki)
+            return
+        if isinstance(najnowszy, Exception):
+            self.status_label.config(text=f"Błąd filtracji: {najnowszy}")
+            return
+
+        self.filtered_final, self.fft_final, self.fft_diff_final = najnowszy
+        self.diff_final = self.signal - self.filtered_final
+        self.update_lines()
+        self.status_label.config(text="")
+
+    def update_lines(self):
+        """Podmienia dane istniejących linii i przeskalowuje osie Y (bez przebudowy wykresów)."""
+        for linia, dane in ((self.line_final, self.filtered_final), (self.line_fft_final, self.fft_final),
+                            (self.line_diff, self.diff_final), (self.line_fft_diff, self.fft_diff_final)):
+            linia.set_ydata(dane)
+            ax = linia.axes
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+        self.canvas.draw_idle()
+
+
 if __name__ == "__main__":
     app = EKGFilterApp()
     app.mainloop()
@@ -3,15 +3,15 @@ import matplotlib.pyplot as plt
 from PIL import Image
 import os
 
+from lut import point_transform
+
 def multiply_constant(img_array, c):
     """
     Mnożenie obrazu przez stałą:
     T(r) = c * r
+    Wynik obcięty do zakresu 0..255 (0..65535 dla uint16) – przez tablicę LUT (lut.py).
     """
-    out = c * img_array
-    # Obcinamy do zakresu 0..255 i konwertujemy do typu uint8
-    out = np.clip(out, 0, 255)
-    return out.astype(np.uint8)
+    return point_transform(img_array, ("multiply", c))
 
 def logarithmic_transform(img_array):
     """
@@ -19,10 +19,7 @@ def logarithmic_transform(img_array):
     T(r) = c * log(1 + r)
     gdzie c = 255 / log(256), aby wynik mieścił się w 0..255
     """
-    c = 255.0 / np.log(256.0)
-    out = c * np.log(1.0 + img_array.astype(np.float64))
-    out = np.clip(out, 0, 255)
-    return out.astype(np.uint8)
+    return point_transform(img_array, ("log",))
 
 def contrast_transform(img_array, m=0.45, e=8):
     """
@@ -30,15 +27,7 @@ def contrast_transform(img_array, m=0.45, e=8):
     T(r) = 1 / [1 + (m/r)^e ]
     Przykładowe parametry: m=0.45, e=8
     """
-    epsilon = 1e-10
-    arr_float = img_array.astype(np.float64)
-    # Unikamy dzielenia przez zero
-    arr_float[arr_float == 0] = epsilon
-    nr = arr_float / 255.0
-    out = 1.0 / (1.0 + (m / nr)**e)
-    out = out * 255.0
-    out = np.clip(out, 0, 255)
-    return out.astype(np.uint8)
+    return point_transform(img_array, ("contrast", m, e))
 
 def gamma_correction(img_array, c, gamma):
     """
@@ -46,11 +35,7 @@ def gamma_correction(img_array, c, gamma):
     s = c * r^gamma
     Zwykle r jest unormowane do [0..1].
     """
-    nr = img_array.astype(np.float64) / 255.0
-    out = c * (nr ** gamma)
-    out = out * 255.0
-    out = np.clip(out, 0, 255)
-    return out.astype(np.uint8)
+    return point_transform(img_array, ("gamma", c, gamma))
 
 def plot_transform_function(m=0.45, e=8):
     """
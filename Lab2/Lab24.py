@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 from PIL import Image
 import os
 
+from local_stats import cached_statistics, local_statistics_stack
+
 def ensure_output_dir(folder="transformed"):
     if not os.path.exists(folder):
         os.makedirs(folder)
@@ -31,22 +33,10 @@ def local_statistics_enhancement(img_array, window_size=15, k=0.5):
     """
     Poprawa jakości na podstawie lokalnych statystyk.
     Wzór: s(x,y) = m(x,y) + k * (r(x,y) - m(x,y)) / std(x,y)
+    Średnia i odchylenie z tablic sum x i x^2 (local_stats.py), obliczenia w float32;
+    tablice obrazu tylko do odczytu budowane raz dla kolejnych rozmiarów okna.
     """
-    # Zamiana na float do dokładnych obliczeń
-    img = img_array.astype(np.float64)
-    kernel = (window_size, window_size)
-
-    # lokalna średnia
-    local_mean = cv2.blur(img, kernel)
-
-    # lokalne odchylenie standardowe
-    local_sqr = cv2.blur(img**2, kernel)
-    local_std = np.sqrt(local_sqr - local_mean**2 + 1e-8)
-
-    # wzór poprawy jakości
-    enhanced = local_mean + k * (img - local_mean) / (local_std + 1e-8)
-    enhanced = np.clip(enhanced, 0, 255)
-    return enhanced.astype(np.uint8)
+    return cached_statistics(img_array, window_size).enhance(window_size, k)
 
 if __name__ == "__main__":
     files_dir = "files"
@@ -66,8 +56,10 @@ if __name__ == "__main__":
         Image.fromarray(result).save(os.path.join(output_dir, out_name))
 
     ### B) POPRAWA NA PODSTAWIE LOKALNYCH STATYSTYK ###
-    for size in [15, 31, 61]:
-        result = local_statistics_enhancement(arr, window_size=size, k=0.8)
+    # Wszystkie rozmiary okna z jednych tablic sum
+    sizes = [15, 31, 61]
+    results = local_statistics_stack(arr, sizes, k=0.8)
+    for size, result in zip(sizes, results):
         title = f"Lokalna statystyka {size}x{size}"
         show_image_comparison(arr, result, title)
         out_name = filename.replace(".tif", f"_localstats_{size}x{size}.tif")
@@ -23,10 +23,28 @@ def show_comparison(original, filtered, title):
     plt.tight_layout()
     plt.show()
 
+def mean_filter(image_array, k):
+    """Filtr uśredniający k x k."""
+    return cv2.blur(image_array, (k, k))
+
+def median_filter(image_array, k):
+    """Filtr medianowy k x k (medianBlur wymaga nieparzystego rozmiaru)."""
+    if k % 2 == 0:
+        raise ValueError(f"Filtr medianowy wymaga nieparzystego rozmiaru maski, otrzymano {k}")
+    return cv2.medianBlur(image_array, k)
+
+def min_filter(image_array, k):
+    """Filtr minimum (erozja) k x k."""
+    return cv2.erode(image_array, np.ones((k, k), np.uint8))
+
+def max_filter(image_array, k):
+    """Filtr maksimum (dylatacja) k x k."""
+    return cv2.dilate(image_array, np.ones((k, k), np.uint8))
+
 def apply_all_filters(image_array, mask_sizes, filename, output_dir):
     for k in mask_sizes:
         ### (a) Filtr uśredniający
-        avg = cv2.blur(image_array, (k, k))
+        avg = mean_filter(image_array, k)
         title = f"Średnia {k}x{k}"
         show_comparison(image_array, avg, title)
         out = filename.replace(".tif", f"_avg_{k}x{k}.tif")
@@ -34,21 +52,21 @@ def apply_all_filters(image_array, mask_sizes, filename, output_dir):
 
         ### (b) Filtr medianowy
         if k % 2 == 1:  # medianBlur wymaga nieparzystego rozmiaru
-            med = cv2.medianBlur(image_array, k)
+            med = median_filter(image_array, k)
             title = f"Mediana {k}x{k}"
             show_comparison(image_array, med, title)
             out = filename.replace(".tif", f"_median_{k}x{k}.tif")
             Image.fromarray(med).save(os.path.join(output_dir, out))
 
         ### (c1) Filtr minimum (erode)
-        minf = cv2.erode(image_array, np.ones((k, k), np.uint8))
+        minf = min_filter(image_array, k)
         title = f"Minimum {k}x{k}"
         show_comparison(image_array, minf, title)
         out = filename.replace(".tif", f"_min_{k}x{k}.tif")
         Image.fromarray(minf).save(os.path.join(output_dir, out))
 
         ### (c2) Filtr maksimum (dilate)
-        maxf = cv2.dilate(image_array, np.ones((k, k), np.uint8))
+        maxf = max_filter(image_array, k)
         title = f"Maksimum {k}x{k}"
         show_comparison(image_array, maxf, title)
         out = filename.replace(".tif", f"_max_{k}x{k}.tif")
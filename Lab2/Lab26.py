@@ -23,6 +23,10 @@ def show_comparison(original, filtered, title):
     plt.tight_layout()
     plt.show()
 
+def gaussian_filter(image_array, k, sigma=0):
+    """Filtr Gaussowski k x k (sigma=0 – dobierana automatycznie z rozmiaru maski)."""
+    return cv2.GaussianBlur(image_array, (k, k), sigma)
+
 def apply_lowpass_filters(image_array, mask_sizes, filename, output_dir):
     for k in mask_sizes:
         # a) filtr uśredniający (mean)
@@ -33,8 +37,7 @@ def apply_lowpass_filters(image_array, mask_sizes, filename, output_dir):
         Image.fromarray(avg).save(os.path.join(output_dir, outname))
 
         # b) filtr Gaussowski
-        sigma = 0  # automatyczne dopasowanie
-        gauss = cv2.GaussianBlur(image_array, (k, k), sigma)
+        gauss = gaussian_filter(image_array, k)
         title = f"Gaussowski {k}x{k}"
         show_comparison(image_array, gauss, title)
         outname = filename.replace(".tif", f"_gauss_{k}x{k}.tif")
@@ -25,33 +25,28 @@ def show(title, image1, image2):
     plt.show()
 
 
-def sobel_filters(image_array, filename, output_dir):
+def sobel_edges(image_array):
+    """
+    Krawędzie Sobela 3x3: (|Gx|, |Gy|, |G|) jako uint8.
+    |Gx| i |Gy| rzutowane bez obcinania (jak w zapisywanych wcześniej plikach), |G| obcięte do 0..255.
+    """
     # Krawędzie poziome i pionowe
     sobelx = cv2.Sobel(image_array, cv2.CV_64F, 1, 0, ksize=3)
     sobely = cv2.Sobel(image_array, cv2.CV_64F, 0, 1, ksize=3)
     sobel_combined = np.hypot(sobelx, sobely)
     sobel_combined = np.clip(sobel_combined, 0, 255).astype(np.uint8)
-
-    # Zapisy
-    Image.fromarray(np.abs(sobelx).astype(np.uint8)).save(os.path.join(output_dir, filename.replace(".", "_sobelx.")))
-    Image.fromarray(np.abs(sobely).astype(np.uint8)).save(os.path.join(output_dir, filename.replace(".", "_sobely.")))
-    Image.fromarray(sobel_combined).save(os.path.join(output_dir, filename.replace(".", "_sobel_combined.")))
-
-    show("Sobel X + Y (ukośne)", image_array, sobel_combined)
+    return np.abs(sobelx).astype(np.uint8), np.abs(sobely).astype(np.uint8), sobel_combined
 
 
-def laplacian_sharpening(image_array, filename, output_dir):
+def laplacian_edges(image_array):
+    """(|Laplasjan| obcięty do 0..255, obraz wyostrzony = oryginał + |Laplasjan|)."""
     lap = cv2.Laplacian(image_array, cv2.CV_64F)
     lap_abs = np.clip(np.abs(lap), 0, 255).astype(np.uint8)
-    sharpened = cv2.add(image_array, lap_abs)
-
-    Image.fromarray(lap_abs).save(os.path.join(output_dir, filename.replace(".", "_laplacian.")))
-    Image.fromarray(sharpened).save(os.path.join(output_dir, filename.replace(".", "_laplacian_sharpened.")))
-
-    show("Wyostrzanie Laplasjanem", image_array, sharpened)
+    return lap_abs, cv2.add(image_array, lap_abs)
 
 
-def unsharp_and_highboost(image_array, filename, output_dir, k=1.5):
+def unsharp_highboost(image_array, k=1.5):
+    """(unsharp masking, high-boost z wagą k) – jedno rozmycie Gaussa 5x5 dla obu wyników."""
     # Zamieniamy na float, żeby uniknąć ujemnych/za dużych pikseli
     img = image_array.astype(np.float32)
     blurred = cv2.GaussianBlur(img, (5, 5), 0)
@@ -64,6 +59,31 @@ def unsharp_and_highboost(image_array, filename, output_dir, k=1.5):
     # High-boost = oryginał + k * (oryg - rozmycie)
     highboost = img + k * (img - blurred)
     highboost = np.clip(highboost, 0, 255).astype(np.uint8)
+    return unsharp, highboost
+
+
+def sobel_filters(image_array, filename, output_dir):
+    sobelx, sobely, sobel_combined = sobel_edges(image_array)
+
+    # Zapisy
+    Image.fromarray(sobelx).save(os.path.join(output_dir, filename.replace(".", "_sobelx.")))
+    Image.fromarray(sobely).save(os.path.join(output_dir, filename.replace(".", "_sobely.")))
+    Image.fromarray(sobel_combined).save(os.path.join(output_dir, filename.replace(".", "_sobel_combined.")))
+
+    show("Sobel X + Y (ukośne)", image_array, sobel_combined)
+
+
+def laplacian_sharpening(image_array, filename, output_dir):
+    lap_abs, sharpened = laplacian_edges(image_array)
+
+    Image.fromarray(lap_abs).save(os.path.join(output_dir, filename.replace(".", "_laplacian.")))
+    Image.fromarray(sharpened).save(os.path.join(output_dir, filename.replace(".", "_laplacian_sharpened.")))
+
+    show("Wyostrzanie Laplasjanem", image_array, sharpened)
+
+
+def unsharp_and_highboost(image_array, filename, output_dir, k=1.5):
+    unsharp, highboost = unsharp_highboost(image_array, k)
 
     # Zapis i podgląd
     Image.fromarray(unsharp).save(os.path.join(output_dir, filename.replace(".", "_unsharp.")))
@@ -0,0 +1,201 @@
+"""
+Lokalne statystyki (średnia, wariancja) z tablic sum skumulowanych (summed-area tables).
+
+Tablice sum x i x^2 budowane są raz na obraz (cv2.integral2 na obrazie z brzegami
+BORDER_REFLECT_101, jak w cv2.blur), a suma w dowolnym oknie to 4 odczyty tablicy –
+koszt na piksel nie zależy od rozmiaru okna, więc kilka okien kosztuje prawie tyle co jedno.
+
+- sumy całkowite są dokładne (int32 dla x, float64 dla x^2), wariancja liczona jako
+  (n*S2 - S1^2) / n^2 – bez ujemnych wartości z utraty precyzji,
+- wyniki (średnia, wariancja, obraz poprawiony) w float32 / uint8 w buforach
+  przygotowanych z góry; obliczenia pośrednie pasami wierszy (bufory wielkości pasa),
+  więc brak tymczasowych tablic float64 wielkości obrazu,
+- cached_statistics: tablice ostatnich obrazów tylko do odczytu są zachowywane, więc
+  kolejne wywołania dla tego samego obrazu z różnymi oknami (np. sweep w pipeline.py)
+  budują je raz.
+
+Uruchomienie modułu: porównanie z cv2.blur w float64 (dawne Lab24) – czas i szczyt pamięci.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+# Liczba pikseli pasa wierszy przetwarzanego naraz (rozmiar buforów roboczych)
+STRIP_PIXELS = 1 << 16
+EPSILON = 1e-8
+# Domyślny największy rozmiar okna tablic i liczba zachowywanych obrazów (cached_statistics)
+DEFAULT_MAX_WINDOW = 61
+CACHED_IMAGES = 2
+
+# Ostatnio używane tablice (najnowsze na końcu)
+_cached = []
+
+
+class LocalStatistics:
+    """Tablice sum x i x^2 obrazu uint8 dla okien do max_window x max_window."""
+
+    def __init__(self, img_array, max_window=DEFAULT_MAX_WINDOW):
+        if img_array.dtype != np.uint8 or img_array.ndim != 2:
+            raise ValueError("Lokalne statystyki obsługują tylko obrazy uint8 w skali szarości")
+        self.img = img_array
+        self.shape = img_array.shape
+        self.max_window = int(max_window)
+        self.pad = self.max_window // 2
+        padded = cv2.copyMakeBorder(img_array, self.pad, self.pad, self.pad, self.pad, cv2.BORDER_REFLECT_101)
+        # Suma x w int32 wystarcza, dopóki 255 * liczba pikseli < 2^31
+        sdepth = cv2.CV_32S if padded.size * 255 < 2**31 else cv2.CV_64F
+        self.sat, self.sqsat = cv2.integral2(padded, sdepth=sdepth, sqdepth=cv2.CV_64F)
+        rows = max(1, min(self.shape[0], STRIP_PIXELS // max(self.shape[1], 1)))
+        self._s1 = np.empty((rows, self.shape[1]))
+        self._s2 = np.empty((rows, self.shape[1]))
+        self._m = np.empty((rows, self.shape[1]), np.float32)
+        self._v = np.empty_like(self._m)
+        self._r = np.empty_like(self._m)
+
+    def _offsets(self, window):
+        window = int(window)
+        if not 1 <= window <= self.max_window:
+            raise ValueError(f"Rozmiar okna {window} poza zakresem 1..{self.max_window}")
+        # Okno jak w cv2.blur: kotwica w window // 2
+        return self.pad - window // 2, self.pad - window // 2 + window
+
+    def _box_sum(self, table, a, b, r0, r1, out):
+        w = self.shape[1]
+        np.subtract(table[r0 + b:r1 + b, b:b + w], table[r0 + a:r1 + a, b:b + w], out=out, dtype=np.float64)
+        out -= table[r0 + b:r1 + b, a:a + w]
+        out += table[r0 + a:r1 + a, a:a + w]
+        return out
+
+    def _strips(self):
+        rows = len(self._s1)
+        for r0 in range(0, self.shape[0], rows):
+            yield r0, min(r0 + rows, self.shape[0])
+
+    def _strip_mean_var(self, a, b, n, r0, r1, mean, var):
+        s1 = self._box_sum(self.sat, a, b, r0, r1, self._s1[:r1 - r0])
+        s2 = self._box_sum(self.sqsat, a, b, r0, r1, self._s2[:r1 - r0])
+        np.divide(s1, n, out=mean)
+        # n*S2 - S1^2: dokładne w float64 (liczby całkowite < 2^53)
+        s2 *= n
+        s1 *= s1
+        s2 -= s1
+        np.divide(s2, n * n, out=var)
+
+    def mean_var(self, window, mean_out=None, var_out=None):
+        """Lokalna średnia i wariancja w oknie window x window (float32, do podanych buforów)."""
+        a, b = self._offsets(window)
+        mean_out = np.empty(self.shape, np.float32) if mean_out is None else mean_out
+        var_out = np.empty(self.shape, np.float32) if var_out is None else var_out
+        for r0, r1 in self._strips():
+            self._strip_mean_var(a, b, float(window * window), r0, r1, mean_out[r0:r1], var_out[r0:r1])
+        return mean_out, var_out
+
+    def stack(self, window_sizes):
+        """Średnie i wariancje dla kilku okien: dwie tablice (len(window_sizes), H, W) float32."""
+        means = np.empty((len(window_sizes),) + self.shape, np.float32)
+        variances = np.empty_like(means)
+        for i, window in enumerate(window_sizes):
+            self.mean_var(window, means[i], variances[i])
+        return means, variances
+
+    def enhance(self, window, k=0.5, out=None):
+        """
+        s = m + k * (r - m) / std w oknie window x window (jak Lab24.local_statistics_enhancement);
+        wynik uint8 zapisywany do out. Średnia i std tylko w buforach pasa (float32).
+        """
+        a, b = self._offsets(window)
+        out = np.empty(self.shape, np.uint8) if out is None else out
+        for r0, r1 in self._strips():
+            rows = r1 - r0
+            mean, std, result = self._m[:rows], self._v[:rows], self._r[:rows]
+            self._strip_mean_var(a, b, float(window * window), r0, r1, mean, std)
+            # std + eps jak w Lab24: sqrt(var + eps) + eps
+            std += EPSILON
+            np.sqrt(std, out=std)
+            std += EPSILON
+            np.subtract(self.img[r0:r1], mean, out=result)
+            result *= k
+            result /= std
+            result += mean
+            np.clip(result, 0, 255, out=result)
+            out[r0:r1] = result
+        return out
+
+    def enhance_stack(self, window_sizes, k=0.5, out=None):
+        """Obrazy poprawione dla kilku okien naraz: (len(window_sizes), H, W) uint8."""
+        out = np.empty((len(window_sizes),) + self.shape, np.uint8) if out is None else out
+        for i, window in enumerate(window_sizes):
+            self.enhance(window, k, out[i])
+        return out
+
+
+def cached_statistics(img_array, window, max_window=DEFAULT_MAX_WINDOW):
+    """
+    LocalStatistics obejmujące okno window. Dla obrazu tylko do odczytu tablice są
+    zachowywane (ostatnie CACHED_IMAGES obrazów, rozpoznawane po tożsamości tablicy)
+    i używane ponownie dla kolejnych okien; obraz zapisywalny – zawsze nowe tablice.
+    """
+    max_window = max(int(window), max_window)
+    if img_array.flags.writeable:
+        return LocalStatistics(img_array, max_window)
+    for i, stats in enumerate(_cached):
+        if stats.img is img_array and stats.max_window >= window:
+            _cached.append(_cached.pop(i))
+            return stats
+    stats = LocalStatistics(img_array, max_window)
+    _cached[:] = [s for s in _cached if s.img is not img_array] + [stats]
+    del _cached[:-CACHED_IMAGES]
+    return stats
+
+
+def local_statistics_stack(img_array, window_sizes, k=0.5):
+    """Poprawa na podstawie lokalnych statystyk dla kilku okien – tablice sum budowane raz."""
+    return LocalStatistics(img_array, max(window_sizes)).enhance_stack(window_sizes, k)
+
+
+if __name__ == "__main__":
+    import os
+    import tracemalloc
+    from PIL import Image
+
+    def blur_enhancement(img_array, window_size, k):
+        # Dawna wersja Lab24.local_statistics_enhancement (float64, cv2.blur dla każdego okna)
+        img = img_array.astype(np.float64)
+        kernel = (window_size, window_size)
+        local_mean = cv2.blur(img, kernel)
+        local_sqr = cv2.blur(img**2, kernel)
+        local_std = np.sqrt(local_sqr - local_mean**2 + EPSILON)
+        enhanced = local_mean + k * (img - local_mean) / (local_std + EPSILON)
+        return np.clip(enhanced, 0, 255).astype(np.uint8)
+
+    def measure(function, repeats=5):
+        """(wynik, najlepszy czas [s], szczyt pamięci [B]) – pamięć mierzona w osobnym przebiegu."""
+        best = np.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        tracemalloc.start()
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result, best, peak
+
+    files_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "files")
+    windows = [15, 31, 61]
+    for filename in ("hidden-symbols.tif", "bonescan.tif"):
+        img = np.array(Image.open(os.path.join(files_dir, filename)).convert("L"))
+        reference, t_ref, peak_ref = measure(lambda: [blur_enhancement(img, w, 0.8) for w in windows])
+        _, t_one_ref, _ = measure(lambda: blur_enhancement(img, windows[0], 0.8))
+        result, t_sat, peak_sat = measure(lambda: local_statistics_stack(img, windows, k=0.8))
+        _, t_one, _ = measure(lambda: local_statistics_stack(img, windows[:1], k=0.8))
+
+        print(f"{filename} {img.shape}, okna {windows}")
+        print(f"  cv2.blur float64: {t_ref * 1000:7.1f} ms (jedno okno {t_one_ref * 1000:6.1f} ms), "
+              f"szczyt pamięci {peak_ref / 2**20:6.1f} MB")
+        print(f"  tablice sum:      {t_sat * 1000:7.1f} ms (jedno okno {t_one * 1000:6.1f} ms), "
+              f"szczyt pamięci {peak_sat / 2**20:6.1f} MB")
+        diff = np.abs(result.astype(np.int16) - np.stack(reference))
+        print(f"  różnica: max {diff.max()}, pikseli różnych {np.count_nonzero(diff) / diff.size:.4%}")
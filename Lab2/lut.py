@@ -0,0 +1,227 @@
+"""
+Silnik przekształceń punktowych oparty na tablicach LUT.
+
+Dla obrazu uint8 każde przekształcenie punktowe T(r) to funkcja 256 wartości,
+a dla uint16 – 65536 wartości. Przekształcenie (lub łańcuch przekształceń)
+liczone jest raz na tablicy wszystkich możliwych poziomów, a obraz przetwarzany
+jednym odczytem lut[img] – bez tymczasowych tablic float64 wielkości obrazu.
+Uruchomienie modułu: porównanie czasu z drogą float64 (jak w Lab22) na bonescan.tif.
+
+Łańcuch to krotka kroków (nazwa, parametry...), np.:
+    (("multiply", 1.5), ("gamma", 1.0, 2.2))
+Każdy krok dostaje poziomy w typie obrazu, liczy wzór w tej samej kolejności działań
+co dawne funkcje Lab22, a wynik jest obcinany do zakresu i rzutowany na typ całkowity
+(jak przy kolejnym wywołaniu funkcji z Lab22) – wynik LUT jest identyczny z drogą float.
+Uruchomienie modułu sprawdza to względem dawnych wzorów Lab22 na wszystkich 256
+poziomach i na obrazach z files/.
+"""
+
+import time
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:  # cv2 opcjonalne – wtedy np.take
+    cv2 = None
+
+
+def _multiply(r, max_value, c):
+    """T(r) = c * r (całkowite c – arytmetyka w typie obrazu, z przepełnieniem, jak w Lab22)"""
+    return c * r
+
+
+def _log(r, max_value):
+    """T(r) = c * log(1 + r), c = max / log(max + 1)"""
+    c = float(max_value) / np.log(max_value + 1.0)
+    return c * np.log(1.0 + r.astype(np.float64))
+
+
+def _contrast(r, max_value, m=0.45, e=8):
+    """T(r) = 1 / [1 + (m/r)^e ] (r unormowane do 0..1)"""
+    arr_float = r.astype(np.float64)
+    arr_float[arr_float == 0] = 1e-10
+    nr = arr_float / float(max_value)
+    out = 1.0 / (1.0 + (m / nr) ** e)
+    return out * float(max_value)
+
+
+def _gamma(r, max_value, c, gamma):
+    """s = c * r^gamma (r unormowane do 0..1)"""
+    nr = r.astype(np.float64) / float(max_value)
+    out = c * (nr ** gamma)
+    return out * float(max_value)
+
+
+TRANSFORMS = {
+    "multiply": _multiply,
+    "log": _log,
+    "contrast": _contrast,
+    "gamma": _gamma,
+}
+
+LUT_DTYPES = {8: np.uint8, 16: np.uint16}
+
+
+def _bits_for(img_array):
+    if img_array.dtype == np.uint8:
+        return 8
+    if img_array.dtype == np.uint16:
+        return 16
+    raise ValueError(f"LUT obsługuje tylko obrazy uint8 i uint16, otrzymano {img_array.dtype}")
+
+
+def _apply_step(r, step, max_value, dtype):
+    name, *params = step
+    if name not in TRANSFORMS:
+        raise ValueError(f"Nieznane przekształcenie: {name}")
+    out = TRANSFORMS[name](r, max_value, *params)
+    return np.clip(out, 0, max_value).astype(dtype)
+
+
+def _typed_steps(steps):
+    """
+    Kroki z typami parametrów: ("multiply", 2) i ("multiply", 2.0) są równe jako krotki,
+    ale dają różne LUT (całkowite c liczone w typie obrazu), więc typ jest częścią klucza.
+    """
+    return tuple((name, *((type(p).__name__, p) for p in params)) for name, *params in steps)
+
+
+@lru_cache(maxsize=128)
+def _build_lut(typed_steps, bits):
+    dtype = LUT_DTYPES[bits]
+    max_value = (1 << bits) - 1
+    lut = np.arange(max_value + 1, dtype=dtype)
+    for name, *params in typed_steps:
+        lut = _apply_step(lut, (name, *(p for _, p in params)), max_value, dtype)
+    lut.flags.writeable = False
+    return lut
+
+
+def build_lut(steps, bits=8):
+    """
+    Tablica LUT (2**bits wartości) dla łańcucha kroków – z pamięci podręcznej
+    (klucz: kroki z typami parametrów i liczba bitów). Zwracana tablica jest tylko do odczytu.
+    """
+    return _build_lut(_typed_steps(tuple(tuple(step) for step in steps)), bits)
+
+
+def apply_lut(img_array, lut, out=None):
+    """
+    Jedno pobranie lut[img]; dla uint8 przez cv2.LUT (kilka razy szybsze od np.take),
+    dla uint16 – np.take. out – opcjonalny bufor wyjściowy.
+    """
+    if cv2 is not None and img_array.dtype == np.uint8 and len(lut) == 256:
+        if out is None:
+            return cv2.LUT(img_array, lut)
+        return cv2.LUT(img_array, lut, dst=out)
+    return np.take(lut, img_array, out=out)
+
+
+def point_transform(img_array, *steps, out=None):
+    """
+    Łańcuch przekształceń punktowych na obrazie uint8/uint16 przez LUT, np.
+    point_transform(img, ("multiply", 1.5), ("gamma", 1.0, 2.2)).
+    """
+    steps = tuple(tuple(step) for step in steps)
+    return apply_lut(img_array, build_lut(steps, _bits_for(img_array)), out=out)
+
+
+def point_transform_float(img_array, *steps):
+    """Ta sama operacja liczona na każdym pikselu (bez LUT)."""
+    dtype = img_array.dtype
+    max_value = np.iinfo(dtype).max
+    out = img_array
+    for step in steps:
+        out = _apply_step(out, tuple(step), max_value, dtype)
+    return out
+
+
+if __name__ == "__main__":
+    import os
+    from PIL import Image
+
+    # Dawne funkcje Lab22 (przed LUT) – odniesienie dla obrazów uint8
+    def baseline_multiply(img_array, c):
+        out = c * img_array
+        out = np.clip(out, 0, 255)
+        return out.astype(np.uint8)
+
+    def baseline_log(img_array):
+        c = 255.0 / np.log(256.0)
+        out = c * np.log(1.0 + img_array.astype(np.float64))
+        out = np.clip(out, 0, 255)
+        return out.astype(np.uint8)
+
+    def baseline_contrast(img_array, m=0.45, e=8):
+        arr_float = img_array.astype(np.float64)
+        arr_float[arr_float == 0] = 1e-10
+        nr = arr_float / 255.0
+        out = 1.0 / (1.0 + (m / nr)**e)
+        out = out * 255.0
+        out = np.clip(out, 0, 255)
+        return out.astype(np.uint8)
+
+    def baseline_gamma(img_array, c, gamma):
+        nr = img_array.astype(np.float64) / 255.0
+        out = c * (nr ** gamma)
+        out = out * 255.0
+        out = np.clip(out, 0, 255)
+        return out.astype(np.uint8)
+
+    BASELINE = {"multiply": baseline_multiply, "log": baseline_log,
+                "contrast": baseline_contrast, "gamma": baseline_gamma}
+
+    def baseline(img_array, *steps):
+        for name, *params in steps:
+            img_array = BASELINE[name](img_array, *params)
+        return img_array
+
+    files_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "files")
+    img = np.array(Image.open(os.path.join(files_dir, "bonescan.tif")).convert("L"))
+    img16 = img.astype(np.uint16) * 257
+
+    chains = {
+        "multiply 1.5": (("multiply", 1.5),),
+        "multiply 2 (całkowite)": (("multiply", 2),),
+        "log": (("log",),),
+        "contrast m=0.45 e=8": (("contrast", 0.45, 8),),
+        "gamma 2.2": (("gamma", 1.0, 2.2),),
+        "gamma c=1.2 g=1.0": (("gamma", 1.2, 1.0),),
+        "multiply+gamma+contrast": (("multiply", 1.2), ("gamma", 1.0, 0.8), ("contrast", 0.45, 8)),
+    }
+
+    # Zgodność z dawnym Lab22: wszystkie poziomy 0..255 i wszystkie obrazy z files/
+    levels = np.arange(256, dtype=np.uint8).reshape(1, -1)
+    images = [np.array(Image.open(os.path.join(files_dir, name)).convert("L"))
+              for name in sorted(os.listdir(files_dir)) if name.endswith((".tif", ".png"))]
+    for name, steps in chains.items():
+        for image in [levels] + images:
+            assert np.array_equal(point_transform(image, *steps), baseline(image, *steps)), name
+    print(f"Zgodne z Lab22: {len(chains)} łańcuchów, 256 poziomów i {len(images)} obrazów")
+
+    # Całkowite i zmiennoprzecinkowe c nie mogą dzielić LUT z pamięci podręcznej – w obu kolejnościach
+    for order in ((2, 2.0), (2.0, 2)):
+        _build_lut.cache_clear()
+        for c in order:
+            expected = baseline_multiply(levels, c)
+            assert np.array_equal(point_transform(levels, ("multiply", c)), expected), (order, c)
+    print("multiply 2 i 2.0: osobne LUT niezależnie od kolejności wywołań")
+
+    def best_time(function, repeats=5):
+        best = np.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    print(f"Obraz {img.shape}, uint8 i uint16")
+    for name, steps in chains.items():
+        for image in (img, img16):
+            assert np.array_equal(point_transform(image, *steps), point_transform_float(image, *steps))
+            t_float = best_time(lambda: point_transform_float(image, *steps))
+            t_lut = best_time(lambda: point_transform(image, *steps))
+            print(f"{name:26s} {image.dtype.name:6s} float: {t_float * 1000:7.2f} ms  "
+                  f"LUT: {t_lut * 1000:6.2f} ms  x{t_float / t_lut:5.1f}")
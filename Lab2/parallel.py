@@ -0,0 +1,143 @@
+"""
+Równoległe wykonanie zadań pipeline.py w puli procesów.
+
+- Każdy plik wejściowy dekodowany jest raz (w procesie głównym) i umieszczany
+  w multiprocessing.shared_memory; procesy robocze dostają tylko opis bloku
+  (nazwa, kształt, typ), a obraz czytają bez kopiowania i bez pickle (tylko do odczytu).
+- Zadanie = obraz + łańcuchy zaczynające się tą samą operacją (np. trzy wyniki Sobela
+  albo wszystkie rozmiary maski mediany), więc wspólne wyniki pośrednie nadal liczone
+  są raz, a narzut komunikacji rozkłada się na kilka wyników. Wyniki zapisuje proces roboczy.
+- Zadania zlecane są od największego (piksele x liczba wyników) – najdłuższe nie
+  zostają na koniec, gdy pozostałe procesy już czekają.
+- Dla każdego zadania wypisywany jest czas i proces, a na końcu suma czasów
+  zadań względem czasu rzeczywistego (przyspieszenie).
+- Z pamięcią podręczną (result_cache.py) każdy proces otwiera ten sam katalog;
+  skrót pikseli liczony jest raz w procesie głównym, a statystyki są sumowane.
+
+Uruchomienie: python pipeline.py --processes 0   (0 – liczba rdzeni)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pipeline import compute_and_save, group_by_input, load_image
+from result_cache import ResultCache, format_stats, image_digest
+
+# Bloki pamięci współdzielonej otwarte w procesie roboczym (nazwa -> (blok, obraz))
+_ATTACHED = {}
+# Pamięć podręczna wyników procesu roboczego (ustawienia -> ResultCache)
+_CACHES = {}
+
+
+def to_shared_memory(arr):
+    """Kopiuje obraz do nowego bloku SharedMemory; zwraca (blok, opis)."""
+    block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)[...] = arr
+    return block, (block.name, arr.shape, arr.dtype.str)
+
+
+def from_shared_memory(descriptor):
+    """Obraz z bloku SharedMemory bez kopiowania (tylko do odczytu); blok otwierany raz na proces."""
+    name, shape, dtype = descriptor
+    if name not in _ATTACHED:
+        block = shared_memory.SharedMemory(name=name)
+        arr = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        arr.flags.writeable = False
+        _ATTACHED[name] = (block, arr)
+    return _ATTACHED[name][1]
+
+
+def make_jobs(tasks):
+    """Zadania (plik, łańcuchy) – łańcuchy jednego pliku grupowane po operacji pierwszego kroku."""
+    jobs = []
+    for path, chains in group_by_input(tasks).items():
+        by_operation = {}
+        for steps, output in chains:
+            by_operation.setdefault(steps[0][0] if steps else None, []).append((steps, output))
+        jobs += [(path, group) for group in by_operation.values()]
+    return jobs
+
+
+def _worker_cache(settings):
+    if settings is None:
+        return None
+    if settings not in _CACHES:
+        directory, max_bytes, compress = settings
+        _CACHES[settings] = ResultCache(directory, max_bytes, compress)
+    return _CACHES[settings]
+
+
+def _run_job(descriptor, digest, chains, cache_settings):
+    """
+    Wykonuje łańcuchy jednego zadania w procesie roboczym.
+    Zwraca (czas [s], pid, liczba policzonych łańcuchów, zmiana statystyk cache).
+    """
+    start = time.perf_counter()
+    image = from_shared_memory(descriptor)
+    cache = _worker_cache(cache_settings)
+    before = cache.stats() if cache is not None else None
+    memo = {}
+    computed = sum(compute_and_save(image, digest, steps, output, memo, cache) for steps, output in chains)
+    delta = None
+    if cache is not None:
+        after = cache.stats()
+        delta = {k: after[k] - before[k] for k in ("hits", "misses", "stores", "evictions")}
+    return time.perf_counter() - start, os.getpid(), computed, delta
+
+
+def run_parallel(tasks, processes=None, cache=None):
+    """
+    Wykonuje zadania w puli processes procesów (domyślnie liczba rdzeni);
+    cache – ResultCache, którego katalog i ustawienia dostają procesy robocze.
+    Zwraca listę (plik, pierwszy krok, liczba wyników, czas [s], pid) w kolejności ukończenia.
+    """
+    processes = processes or os.cpu_count() or 1
+    cache_settings = None if cache is None else (cache.directory, cache.max_bytes, cache.compress)
+    totals = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+    start = time.perf_counter()
+    blocks = []
+    timings = []
+    try:
+        descriptors, digests, pixels = {}, {}, {}
+        for path in group_by_input(tasks):
+            image = load_image(path)
+            block, descriptors[path] = to_shared_memory(image)
+            blocks.append(block)
+            digests[path] = image_digest(image) if cache is not None else None
+            pixels[path] = image.size
+        decode_time = time.perf_counter() - start
+
+        jobs = make_jobs(tasks)
+        jobs.sort(key=lambda job: pixels[job[0]] * len(job[1]), reverse=True)
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {pool.submit(_run_job, descriptors[path], digests[path], chains, cache_settings): (path, chains)
+                       for path, chains in jobs}
+            for future in as_completed(futures):
+                path, chains = futures[future]
+                seconds, pid, computed, delta = future.result()
+                if delta is not None:
+                    for k in totals:
+                        totals[k] += delta[k]
+                first_step = chains[0][0][0][0] if chains[0][0] else "-"
+                timings.append((path, first_step, len(chains), seconds, pid))
+                print(f"{os.path.basename(path):32s} {first_step:18s} wyniki: {len(chains):3d}  "
+                      f"policzone: {computed:3d}  {seconds * 1000:8.1f} ms  [pid {pid}]")
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    wall = time.perf_counter() - start
+    busy = sum(t[3] for t in timings)
+    print(f"Razem: {len(tasks)} wyników, {len(timings)} zadań, {processes} procesów: {wall:.2f} s "
+          f"(dekodowanie {decode_time:.2f} s, suma czasów zadań {busy:.2f} s, x{busy / wall:.2f})")
+    if cache is not None:
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = totals["hits"] / lookups if lookups else 0.0
+        totals["size_bytes"] = cache.disk_size()
+        print(format_stats(totals))
+    return timings
@@ -0,0 +1,283 @@
+"""
+Wsadowe przetwarzanie obrazów z Lab22-Lab27 według pliku konfiguracyjnego (JSON lub YAML).
+
+Konfiguracja opisuje katalogi oraz listę zadań; każde zadanie to pliki wejściowe,
+łańcuch kroków (operacji z OPERATIONS) i wzorzec nazwy pliku wyjściowego, np.:
+
+    {"input_dir": "files", "output_dir": "transformed",
+     "jobs": [{"name": "clahe", "inputs": ["hidden-symbols.tif"],
+               "sweep": {"size": [8, 16, 32]},
+               "steps": [["clahe", {"tile_grid_size": ["$size", "$size"]}]],
+               "output": "{stem}_clahe_{size}x{size}{ext}"}]}
+
+- krok: "nazwa" albo ["nazwa", {parametry}]; "$x" w parametrach to wartość x z sweep,
+- sweep: iloczyn kartezjański wartości – po jednym wyniku na kombinację,
+- inputs: nazwy plików lub wzorce glob (względem input_dir),
+- output: wzorzec str.format ze {stem}, {ext} i zmiennymi sweep.
+
+Każdy plik wejściowy dekodowany jest raz, a wyniki pośrednie są wspólne dla
+wszystkich łańcuchów tego pliku (wspólny początek łańcucha liczony raz, np. "sobel"
+dla trzech wyników Lab27). Bez okien matplotlib – wyniki są tylko zapisywane.
+Z cache_dir w konfiguracji wyniki trafiają do pamięci podręcznej (result_cache.py):
+ponowne uruchomienie liczy tylko nowe kombinacje obrazu, kroków i parametrów.
+
+Uruchomienie (cały katalog files/ według pipeline.json):
+    python pipeline.py
+    python pipeline.py inna_konfiguracja.yaml --output-dir wyniki --job lab24_clahe
+    python pipeline.py --list
+    python pipeline.py sweep.json --processes 0   (pula procesów, patrz parallel.py)
+"""
+
+import os
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import argparse
+import glob
+import itertools
+import json
+import time
+
+import numpy as np
+from PIL import Image
+
+from Lab22 import multiply_constant, logarithmic_transform, contrast_transform, gamma_correction
+from Lab23 import equalize_histogram
+from Lab24 import local_histogram_equalization, local_statistics_enhancement
+from Lab25 import mean_filter, median_filter, min_filter, max_filter
+from Lab26 import gaussian_filter
+from Lab27 import sobel_edges, laplacian_edges, unsharp_highboost
+from result_cache import ResultCache, format_stats, image_digest
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipeline.json")
+
+
+def select(result, index):
+    """Jeden element wyniku operacji zwracającej kilka obrazów (np. sobel, laplacian)."""
+    return result[index]
+
+
+OPERATIONS = {
+    "multiply": multiply_constant,
+    "log": logarithmic_transform,
+    "contrast": contrast_transform,
+    "gamma": gamma_correction,
+    "equalize": equalize_histogram,
+    "clahe": local_histogram_equalization,
+    "local_stats": local_statistics_enhancement,
+    "mean": mean_filter,
+    "median": median_filter,
+    "min": min_filter,
+    "max": max_filter,
+    "gauss": gaussian_filter,
+    "sobel": sobel_edges,
+    "laplacian": laplacian_edges,
+    "unsharp_highboost": unsharp_highboost,
+    "select": select,
+}
+
+
+def load_config(path):
+    """Wczytuje konfigurację z pliku .json albo .yaml/.yml (YAML wymaga pakietu PyYAML)."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Konfiguracja YAML wymaga pakietu PyYAML (pip install pyyaml)") from None
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _substitute(value, variables):
+    """Zamienia napisy "$x" na wartości zmiennych sweep (także w listach i słownikach)."""
+    if isinstance(value, str) and value.startswith("$"):
+        name = value[1:]
+        if name not in variables:
+            raise ValueError(f"Nieznana zmienna w parametrach kroku: {value}")
+        return variables[name]
+    if isinstance(value, (list, tuple)):
+        return tuple(_substitute(v, variables) for v in value)
+    if isinstance(value, dict):
+        return {k: _substitute(v, variables) for k, v in value.items()}
+    return value
+
+
+def parse_step(step, variables=None):
+    """Krok konfiguracji -> (nazwa, ((parametr, wartość), ...)) – postać haszowalna."""
+    if isinstance(step, str):
+        name, params = step, {}
+    else:
+        name, params = step[0], (step[1] if len(step) > 1 else {})
+    if name not in OPERATIONS:
+        raise ValueError(f"Nieznana operacja: {name}")
+    params = _substitute(params, variables or {})
+    return name, tuple(sorted(params.items()))
+
+
+def expand_jobs(config, input_dir=None, output_dir=None, only=None):
+    """
+    Rozwija zadania konfiguracji w listę (plik_wejściowy, kroki, plik_wyjściowy, nazwa_zadania).
+    Ścieżki względne liczone od config["base_dir"] (domyślnie bieżący katalog).
+    """
+    base_dir = config.get("base_dir", ".")
+    input_dir = input_dir or os.path.join(base_dir, config.get("input_dir", "files"))
+    output_dir = output_dir or os.path.join(base_dir, config.get("output_dir", "transformed"))
+
+    tasks = []
+    for number, job in enumerate(config["jobs"]):
+        name = job.get("name", f"job{number}")
+        if only and name not in only:
+            continue
+        paths = []
+        for pattern in job["inputs"]:
+            matched = sorted(glob.glob(os.path.join(input_dir, pattern)))
+            if not matched:
+                raise ValueError(f"Zadanie {name}: brak plików dla {pattern} w {input_dir}")
+            paths += [p for p in matched if p not in paths]
+
+        sweep = job.get("sweep", {})
+        for values in itertools.product(*sweep.values()):
+            variables = dict(zip(sweep.keys(), values))
+            steps = tuple(parse_step(step, variables) for step in job["steps"])
+            for path in paths:
+                stem, ext = os.path.splitext(os.path.basename(path))
+                output = job["output"].format(stem=stem, ext=ext, **variables)
+                tasks.append((path, steps, os.path.join(output_dir, output), name))
+    return tasks
+
+
+def load_image(path):
+    """Dekoduje obraz do tablicy uint8 w skali szarości (tylko do odczytu)."""
+    arr = np.array(Image.open(path).convert("L"))
+    arr.flags.writeable = False
+    return arr
+
+
+def _freeze(result):
+    for arr in (result if isinstance(result, tuple) else (result,)):
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+    return result
+
+
+def run_steps(image, steps, memo):
+    """
+    Wynik łańcucha kroków dla obrazu. memo (prefiks łańcucha -> wynik) jest wspólne
+    dla łańcuchów tego samego obrazu – liczone są tylko kroki bez zapamiętanego prefiksu.
+    Wyniki pośrednie są tylko do odczytu, więc żadna operacja nie zmieni ich dla innych.
+    """
+    done = len(steps)
+    while done and steps[:done] not in memo:
+        done -= 1
+    result = memo[steps[:done]] if done else image
+    for i in range(done, len(steps)):
+        name, params = steps[i]
+        result = _freeze(OPERATIONS[name](result, **dict(params)))
+        memo[steps[:i + 1]] = result
+    return result
+
+
+def save_image(result, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    Image.fromarray(result).save(path)
+
+
+def group_by_input(tasks):
+    """{plik_wejściowy: [(kroki, plik_wyjściowy), ...]} z zachowaniem kolejności zadań."""
+    groups = {}
+    for path, steps, output, _ in tasks:
+        groups.setdefault(path, []).append((steps, output))
+    return groups
+
+
+def compute_and_save(image, digest, steps, output, memo, cache=None):
+    """
+    Wynik łańcucha zapisany do output. Z cache: trafienie nie liczy niczego, a plik
+    wyjściowy zapisany już z tego samego wpisu (i niezmieniony) nie jest zapisywany ponownie.
+    Zwraca True, gdy wynik był liczony.
+    """
+    if cache is None:
+        save_image(run_steps(image, steps, memo), output)
+        return True
+    key = cache.key(digest, steps, [OPERATIONS[name] for name, _ in steps])
+    result = cache.get(key)
+    computed = result is None
+    if computed:
+        result = run_steps(image, steps, memo)
+        cache.put(key, result)
+    elif cache.output_current(output, key):
+        return False
+    save_image(result, output)
+    cache.record_output(output, key)
+    return computed
+
+
+def process_input(path, chains, cache=None):
+    """
+    Jeden plik: dekodowanie raz, wszystkie łańcuchy ze wspólnym memo, zapis wyników.
+    Zwraca (liczba wyników, liczba policzonych łańcuchów).
+    """
+    image = load_image(path)
+    digest = image_digest(image) if cache is not None else None
+    memo = {}
+    computed = sum(compute_and_save(image, digest, steps, output, memo, cache) for steps, output in chains)
+    return len(chains), computed
+
+
+def open_cache(config, cache_dir=None):
+    """ResultCache z config["cache_dir"] / config["cache_max_mb"] (lub cache_dir); None – bez cache."""
+    cache_dir = cache_dir or config.get("cache_dir")
+    if not cache_dir:
+        return None
+    return ResultCache(os.path.join(config.get("base_dir", "."), cache_dir),
+                       max_bytes=int(config.get("cache_max_mb", 512) * 2**20),
+                       compress=config.get("cache_compress", False))
+
+
+def run(tasks, cache=None):
+    """Wykonuje zadania kolejno plik po pliku; wypisuje czas każdego pliku."""
+    start = time.perf_counter()
+    for path, chains in group_by_input(tasks).items():
+        t0 = time.perf_counter()
+        outputs, computed = process_input(path, chains, cache)
+        print(f"{os.path.basename(path):32s} wyniki: {outputs:3d}  policzone: {computed:3d}  "
+              f"{(time.perf_counter() - t0) * 1000:8.1f} ms")
+    print(f"Razem: {len(tasks)} wyników w {time.perf_counter() - start:.2f} s")
+    if cache is not None:
+        print(format_stats(cache.stats()))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Wsadowe przetwarzanie obrazów Lab2 według konfiguracji.")
+    parser.add_argument("config", nargs="?", default=DEFAULT_CONFIG, help="plik .json lub .yaml (domyślnie pipeline.json)")
+    parser.add_argument("--input-dir", default=None, help="katalog wejściowy (zamiast input_dir z konfiguracji)")
+    parser.add_argument("--output-dir", default=None, help="katalog wyjściowy (zamiast output_dir z konfiguracji)")
+    parser.add_argument("--job", action="append", default=None, help="tylko zadania o tej nazwie (można powtarzać)")
+    parser.add_argument("--list", action="store_true", help="tylko wypisz wyniki do policzenia")
+    parser.add_argument("--cache-dir", default=None, help="katalog pamięci podręcznej (zamiast cache_dir z konfiguracji)")
+    parser.add_argument("--no-cache", action="store_true", help="licz wszystko od nowa, bez pamięci podręcznej")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="liczba procesów (1 – kolejno w tym procesie, 0 – liczba rdzeni)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config(args.config)
+    config.setdefault("base_dir", os.path.dirname(os.path.abspath(args.config)))
+    tasks = expand_jobs(config, args.input_dir, args.output_dir, args.job)
+    if args.list:
+        for path, steps, output, name in tasks:
+            print(f"[{name}] {os.path.basename(path)} -> {os.path.basename(output)}  {steps}")
+        return
+    cache = None if args.no_cache else open_cache(config, args.cache_dir and os.path.abspath(args.cache_dir))
+    if args.processes == 1:
+        run(tasks, cache)
+    else:
+        from parallel import run_parallel
+        run_parallel(tasks, args.processes or None, cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Pamięć podręczna wyników operacji na obrazach, adresowana treścią (na dysku).
+
+Klucz = sha256 z: pikseli wejścia (z kształtem i typem), nazw i parametrów kroków
+łańcucha oraz wersji kodu (skrót plików źródłowych, w których zdefiniowano
+operacje, razem z lokalnymi modułami, które importują – przechodnio, np. lut.py
+dla Lab22 – i CACHE_VERSION). Zmiana obrazu, parametru albo kodu operacji daje nowy
+klucz – stare wpisy nie są nigdy zwracane, tylko z czasem usuwane.
+
+- wynik: tablica -> plik .npy, krotka tablic (np. sobel) -> .npz; compress=True – .npz
+  kompresowane dla obu przypadków,
+- zapis atomowy (plik tymczasowy + os.replace), więc wiele procesów może dzielić katalog,
+- rozmiar ograniczony max_bytes: po przekroczeniu usuwane są najdawniej używane wpisy
+  (czas dostępu ustawiany przy każdym trafieniu; czas modyfikacji = chwila zapisu),
+- pliki wyjściowe: dla każdego zapisanego pliku wyjściowego pamiętany jest klucz wpisu
+  (oraz rozmiar i czas modyfikacji pliku), więc plik jest pomijany tylko wtedy, gdy
+  powstał z tego samego wpisu i nie został od tego czasu zmieniony,
+- statystyki: trafienia, chybienia, zapisy, usunięcia (stats()).
+"""
+
+import ast
+import hashlib
+import inspect
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+# Zmienić przy zmianie formatu wpisów albo znaczenia parametrów
+CACHE_VERSION = 1
+EXTENSIONS = (".npy", ".npz")
+
+
+def image_digest(arr):
+    """sha256 pikseli obrazu (z kształtem i typem) – liczony raz na plik wejściowy."""
+    h = hashlib.sha256(f"{arr.shape}|{arr.dtype.str}|".encode())
+    h.update(np.ascontiguousarray(arr).data)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _local_imports(path):
+    """Pliki .py z katalogu path importowane w path (także wewnątrz funkcji)."""
+    directory = os.path.dirname(path)
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+    candidates = (os.path.join(directory, name.split(".")[0] + ".py") for name in names)
+    return tuple(sorted(p for p in candidates if os.path.isfile(p)))
+
+
+@lru_cache(maxsize=None)
+def _sources_digest(path):
+    """Skrót pliku path i wszystkich lokalnych modułów, które importuje (przechodnio)."""
+    path = os.path.abspath(path)
+    files, pending = set(), [path]
+    while pending:
+        current = pending.pop()
+        if current not in files:
+            files.add(current)
+            pending += _local_imports(current)
+    h = hashlib.sha256()
+    for name in sorted(files):
+        h.update(f"{os.path.basename(name)}|{_file_digest(name)}|".encode())
+    return h.hexdigest()
+
+
+def code_version(function):
+    """
+    Skrót pliku źródłowego funkcji i lokalnych modułów, których używa – zmiana kodu
+    modułu albo jego zależności (np. lut.py dla Lab22) unieważnia jego wyniki.
+    """
+    return _sources_digest(inspect.getsourcefile(function))
+
+
+class ResultCache:
+    """Katalog wpisów klucz -> wynik z limitem rozmiaru (LRU) i licznikami trafień."""
+
+    def __init__(self, directory, max_bytes=512 * 2**20, compress=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.size = self.disk_size()
+
+    def key(self, digest, steps, functions):
+        """Klucz wpisu: skrót obrazu, kroki (nazwa, parametry) i wersje kodu ich funkcji."""
+        versions = sorted({code_version(f) for f in functions})
+        text = f"{CACHE_VERSION}|{digest}|{steps!r}|{versions}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _path(self, key, ext):
+        # Podkatalogi po dwóch znakach klucza – bez tysięcy plików w jednym katalogu
+        return os.path.join(self.directory, key[:2], key + ext)
+
+    def _output_record(self, output):
+        name = hashlib.sha256(os.path.abspath(output).encode()).hexdigest()
+        return os.path.join(self.directory, "outputs", name[:2], name)
+
+    def output_current(self, output, key):
+        """Czy plik output został zapisany z wpisu key (record_output) i od tego czasu nie zmieniony."""
+        try:
+            st = os.stat(output)
+            with open(self._output_record(output)) as f:
+                record = f.read()
+        except FileNotFoundError:
+            return False
+        return record == f"{key} {st.st_size} {st.st_mtime_ns}"
+
+    def record_output(self, output, key):
+        """Zapamiętuje, że plik output (już zapisany) powstał z wpisu key."""
+        st = os.stat(output)
+        path = self._output_record(output)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(f"{key} {st.st_size} {st.st_mtime_ns}")
+        os.replace(tmp, path)
+
+    def _entries(self):
+        """(ścieżka, rozmiar, czas ostatniego użycia) wszystkich wpisów."""
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(EXTENSIONS):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:  # usunięty przez inny proces
+                        continue
+                    entries.append((path, st.st_size, st.st_atime))
+        return entries
+
+    def disk_size(self):
+        """Rozmiar wszystkich wpisów w katalogu (także zapisanych przez inne procesy)."""
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, key):
+        """Wynik wpisu albo None, gdy brak wpisu."""
+        for ext in EXTENSIONS:
+            path = self._path(key, ext)
+            try:
+                st = os.stat(path)
+                if ext == ".npy":
+                    result = np.load(path)
+                else:
+                    with np.load(path) as data:
+                        arrays = [data[f"arr_{i}"] for i in range(len(data.files) - 1)]
+                        result = tuple(arrays) if data["is_tuple"] else arrays[0]
+            except FileNotFoundError:
+                continue
+            # Czas dostępu = ostatnie użycie (kolejność usuwania), czas modyfikacji bez zmian
+            os.utime(path, (time.time(), st.st_mtime))
+            self.hits += 1
+            return result
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        """Zapisuje wynik (tablica lub krotka tablic)."""
+        is_tuple = isinstance(result, tuple)
+        ext = ".npz" if is_tuple or self.compress else ".npy"
+        path = self._path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            if ext == ".npy":
+                np.save(f, result)
+            else:
+                arrays = result if is_tuple else (result,)
+                save = np.savez_compressed if self.compress else np.savez
+                save(f, *arrays, is_tuple=is_tuple)
+        os.replace(tmp, path)
+        self.stores += 1
+        self.size += os.path.getsize(path)
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Usuwa najdawniej używane wpisy, aż rozmiar nie przekracza max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        self.size = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "size_bytes": self.size,
+        }
+
+
+def format_stats(stats):
+    return (f"pamięć podręczna: trafienia {stats['hits']}, chybienia {stats['misses']} "
+            f"({stats['hit_rate']:.0%} trafień), zapisy {stats['stores']}, usunięte {stats['evictions']}, "
+            f"rozmiar {stats['size_bytes'] / 2**20:.1f} MB")